@@ -10,12 +10,13 @@ the database directly.
 import logging
 import requests
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 from flask import Flask, render_template, jsonify
 from flask_cors import CORS
 
 from config_manager import ConfigManager
 from routes.database_proxy import create_database_proxy_blueprint
+from utils.compression import init_compression
 
 # Import CommonConfigManager with fallback
 try:
@@ -36,6 +37,7 @@ database_service_config = config_manager.get_database_service_config()
 api_config = config_manager.get_api_config()
 frontend_config = config_manager.get_frontend_config()
 logging_config = config_manager.get_logging_config()
+performance_config = config_manager.get_performance_config()
 
 
 # Configure logging
@@ -122,6 +124,13 @@ def add_security_headers(response):
     return response
 
 
+init_compression(app, performance_config.get("compression", {}))
+
+
+# Response headers forwarded from the database service: HTTP cache validators and paging headers
+VALIDATOR_HEADERS = ("ETag", "Cache-Control", "X-Total-Count", "X-Next-Cursor")
+
+
 # API client for database service
 class DatabaseAPIClient:
     """Client for communicating with the database service."""
@@ -131,6 +140,71 @@ class DatabaseAPIClient:
         self.session = requests.Session()
         self.session.timeout = database_service_config.get("timeout", 30)
 
+    def get_json(self, path: str, params: Dict[str, Any] = None, validators: Dict[str, Any] = None) -> Any:
+        """GET ``path`` from the database service, revalidating with HTTP cache validators.
+
+        ``validators`` is shared with the caller: an ``If-None-Match`` entry is sent
+        upstream, and the upstream headers listed in VALIDATOR_HEADERS (ETag,
+        Cache-Control and the paging headers) are written back into it. When
+        the upstream answers 304, ``not_modified`` is set and None is returned.
+        """
+        kwargs = {}
+        if params is not None:
+            kwargs["params"] = params
+        if validators and validators.get("If-None-Match"):
+            kwargs["headers"] = {"If-None-Match": validators["If-None-Match"]}
+
+        response = self.session.get(f"{self.base_url}{path}", **kwargs)
+        if validators is not None and response.status_code == 304:
+            validators["not_modified"] = True
+            self._record_validators(response, validators)
+            return None
+        response.raise_for_status()
+        if validators is not None:
+            self._record_validators(response, validators)
+        return response.json()
+
+    def get_passthrough(self, path: str, params: Dict[str, Any] = None, validators: Dict[str, Any] = None) -> Any:
+        """GET ``path`` and return the raw, still-encoded response body.
+
+        Works like :meth:`get_json`, but ``validators`` may also carry the
+        browser's ``Accept-Encoding``. The database service then compresses for
+        the browser directly, and the bytes are returned undecoded with the
+        upstream ``Content-Encoding`` recorded in ``validators``.
+        """
+        validators = validators if validators is not None else {}
+        headers = {name: validators[name] for name in ("If-None-Match", "Accept-Encoding") if validators.get(name)}
+        headers.setdefault("Accept-Encoding", "identity")
+
+        kwargs = {"headers": headers, "stream": True}
+        if params is not None:
+            kwargs["params"] = params
+        response = self.session.get(f"{self.base_url}{path}", **kwargs)
+        try:
+            if response.status_code == 304:
+                validators["not_modified"] = True
+                self._record_validators(response, validators)
+                return None
+            response.raise_for_status()
+            self._record_validators(response, validators)
+            encoding = response.headers.get("Content-Encoding")
+            if isinstance(encoding, str):
+                validators["Content-Encoding"] = encoding
+            return response.raw.read(decode_content=False)
+        finally:
+            response.close()
+
+    def open_stream(self, path: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None):
+        """GET ``path`` without reading the body; the caller iterates ``response.raw`` and must close it."""
+        return self.session.get(f"{self.base_url}{path}", params=params, headers=headers or {}, stream=True)
+
+    @staticmethod
+    def _record_validators(response, validators: Dict[str, Any]) -> None:
+        for name in VALIDATOR_HEADERS:
+            value = response.headers.get(name)
+            if isinstance(value, str):
+                validators[name] = value
+
     def health_check(self) -> Dict[str, Any]:
         """Check database service health."""
         try:
@@ -141,65 +215,81 @@ class DatabaseAPIClient:
             logger.error(f"Database service health check failed: {e}")
             return {"status": "unhealthy", "error": str(e)}
 
-    def get_risks(self, limit: int = 100, offset: int = 0, category: str = None) -> Dict[str, Any]:
+    def get_risks(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        category: str = None,
+        cursor: str = None,
+        validators: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
         """Get risks from database service."""
         try:
             params = {"limit": limit, "offset": offset}
             if category:
                 params["category"] = category
+            if cursor:
+                params["cursor"] = cursor
 
-            response = self.session.get(f"{self.base_url}/api/risks", params=params)
-            response.raise_for_status()
-            return response.json()
+            return self.get_json("/api/risks", params=params, validators=validators)
         except Exception as e:
             logger.error(f"Failed to fetch risks: {e}")
             return []
 
-    def get_risks_summary(self) -> Dict[str, Any]:
+    def get_risks_summary(self, validators: Dict[str, Any] = None) -> Dict[str, Any]:
         """Get risks summary with counts for dashboard tables."""
         try:
-            response = self.session.get(f"{self.base_url}/api/risks/summary")
-            response.raise_for_status()
-            return response.json()
+            return self.get_json("/api/risks/summary", validators=validators)
         except Exception as e:
             logger.error(f"Failed to fetch risks summary: {e}")
             return {"details": []}
 
-    def get_controls(self, limit: int = 100, offset: int = 0, domain: str = None) -> Dict[str, Any]:
+    def get_controls(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        domain: str = None,
+        cursor: str = None,
+        validators: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
         """Get controls from database service."""
         try:
             params = {"limit": limit, "offset": offset}
             if domain:
                 params["domain"] = domain
+            if cursor:
+                params["cursor"] = cursor
 
-            response = self.session.get(f"{self.base_url}/api/controls", params=params)
-            response.raise_for_status()
-            return response.json()
+            return self.get_json("/api/controls", params=params, validators=validators)
         except Exception as e:
             logger.error(f"Failed to fetch controls: {e}")
             return []
 
-    def get_controls_summary(self) -> Dict[str, Any]:
+    def get_controls_summary(self, validators: Dict[str, Any] = None) -> Dict[str, Any]:
         """Get controls summary with counts for dashboard tables."""
         try:
-            response = self.session.get(f"{self.base_url}/api/controls/summary")
-            response.raise_for_status()
-            return response.json()
+            return self.get_json("/api/controls/summary", validators=validators)
         except Exception as e:
             logger.error(f"Failed to fetch controls summary: {e}")
             return {"details": []}
 
-
-    def get_definitions(self, limit: int = 100, offset: int = 0, category: str = None) -> Dict[str, Any]:
+    def get_definitions(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        category: str = None,
+        cursor: str = None,
+        validators: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
         """Get definitions from database service."""
         try:
             params = {"limit": limit, "offset": offset}
             if category:
                 params["category"] = category
+            if cursor:
+                params["cursor"] = cursor
 
-            response = self.session.get(f"{self.base_url}/api/definitions", params=params)
-            response.raise_for_status()
-            return response.json()
+            return self.get_json("/api/definitions", params=params, validators=validators)
         except Exception as e:
             logger.error(f"Failed to fetch definitions: {e}")
             return []
@@ -218,10 +308,26 @@ class DatabaseAPIClient:
             logger.error(f"Failed to fetch relationships: {e}")
             return []
 
-    def search(self, query: str, limit: int = 50) -> Dict[str, Any]:
-        """Search across all entities."""
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        offset: int = 0,
+        types: str = None,
+        fuzzy: bool = False,
+        threshold: float = None,
+    ) -> Dict[str, Any]:
+        """Search across all entities, optionally tolerating misspelled words."""
         try:
             params = {"q": query, "limit": limit}
+            if offset:
+                params["offset"] = offset
+            if types:
+                params["types"] = types
+            if fuzzy:
+                params["fuzzy"] = "true"
+                if threshold is not None:
+                    params["threshold"] = threshold
             response = self.session.get(f"{self.base_url}/api/search", params=params)
             response.raise_for_status()
             return response.json()
@@ -269,7 +375,31 @@ class DatabaseAPIClient:
             logger.error(f"Failed to fetch control detail: {e}")
             return {"error": str(e)}
 
+    def post_json(self, path: str, payload: Dict[str, Any]) -> Any:
+        """POST ``payload`` as JSON to ``path``; raises ``requests.HTTPError`` on an error status."""
+        response = self.session.post(f"{self.base_url}{path}", json=payload)
+        response.raise_for_status()
+        return response.json()
 
+    def get_risks_batch(self, risk_ids: List[str]) -> Dict[str, Any]:
+        """Get detailed information for several risks in one request, keyed by risk id."""
+        return self.post_json("/api/risks/batch", {"ids": list(risk_ids)})
+
+    def get_controls_batch(self, control_ids: List[str]) -> Dict[str, Any]:
+        """Get detailed information for several controls in one request, keyed by control id."""
+        return self.post_json("/api/controls/batch", {"ids": list(control_ids)})
+
+    def get_graph_subgraph(self, node_ids: List[str]) -> Dict[str, Any]:
+        """Get the subgraph induced by several risk and control ids: the nodes and the mappings among them."""
+        return self.post_json("/api/graph/subgraph", {"ids": list(node_ids)})
+
+    def optimize_cover(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Find a near-minimal control set covering ``payload["risk_ids"]`` (with optional ``costs``/``exclude``)."""
+        return self.post_json("/api/optimize/cover", payload)
+
+    def simulate_coverage(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Run ``payload["scenarios"]`` (implemented/removed/planned controls) and return their coverage changes."""
+        return self.post_json("/api/scenarios/coverage", payload)
 
 
 # Initialize API client
@@ -281,7 +411,6 @@ database_proxy_bp = create_database_proxy_blueprint(DATABASE_URL, api_client, ap
 app.register_blueprint(database_proxy_bp)
 
 
-
 # Routes
 @app.route("/")
 def index():
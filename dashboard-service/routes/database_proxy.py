@@ -1,11 +1,121 @@
 """Database service proxy routes."""
 
 import logging
-from flask import Blueprint, jsonify, request
+import requests
+from flask import Blueprint, Response, jsonify, request
 
 logger = logging.getLogger(__name__)
 
 
+# Request headers sent upstream through the validators dict rather than returned to the browser
+_UPSTREAM_REQUEST_HEADERS = ("If-None-Match", "Accept-Encoding", "not_modified")
+
+
+def _request_validators(accept_encoding=False):
+    """Start a validators dict carrying the browser's If-None-Match (and Accept-Encoding), if any."""
+    validators = {}
+    names = ("If-None-Match", "Accept-Encoding") if accept_encoding else ("If-None-Match",)
+    for name in names:
+        value = request.headers.get(name)
+        if value:
+            validators[name] = value
+    return validators
+
+
+def _conditional_response(data, validators):
+    """Build the proxy response, forwarding upstream validators and paging headers (or its 304).
+
+    ``data`` may be raw bytes from ``get_passthrough``; they are sent unchanged,
+    with the upstream Content-Encoding.
+    """
+    if validators.get("not_modified"):
+        response = Response(status=304)
+    elif isinstance(data, bytes):
+        response = Response(data, content_type="application/json")
+    else:
+        response = jsonify(data)
+    for name, value in validators.items():
+        if name not in _UPSTREAM_REQUEST_HEADERS:
+            response.headers[name] = value
+    return response
+
+
+def _passthrough(api_client, path, params=None):
+    """Proxy a GET whose body is forwarded as the upstream bytes, compressed for the browser upstream."""
+    validators = _request_validators(accept_encoding=True)
+    body = api_client.get_passthrough(path, params=params, validators=validators)
+    return _conditional_response(body, validators)
+
+
+def _analysis_response(api_client, path):
+    """Proxy a graph or analysis query with the browser's parameters, passing upstream 4xx (unknown id) through."""
+    try:
+        return _passthrough(api_client, path, params=request.args.to_dict())
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else 502
+        logger.error(f"Analysis request rejected by database service: {e}")
+        return jsonify({"error": str(e)}), status if 400 <= status < 500 else 502
+    except Exception as e:
+        logger.error(f"Failed to fetch analysis data: {e}")
+        return jsonify({"error": str(e)}), 502
+
+
+def _batch_response(fetch_batch):
+    """Proxy a batch detail request, passing upstream validation errors (e.g. too many ids) through."""
+    ids = (request.get_json(silent=True) or {}).get("ids")
+    if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+        return jsonify({"error": "Request body must be a JSON object with an 'ids' list of strings"}), 400
+    return _post_response(fetch_batch, ids)
+
+
+def _post_response(post, payload):
+    """Call ``post(payload)`` upstream, passing its 4xx validation errors through and mapping failures to 502."""
+    try:
+        return jsonify(post(payload))
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else 502
+        logger.error(f"Request rejected by database service: {e}")
+        return jsonify({"error": str(e)}), status if 400 <= status < 500 else 502
+    except Exception as e:
+        logger.error(f"Failed to reach database service: {e}")
+        return jsonify({"error": str(e)}), 502
+
+
+# Bytes relayed per chunk when streaming exports through
+EXPORT_CHUNK_SIZE = 64 * 1024
+# Upstream headers describing a streamed export body
+EXPORT_HEADERS = ("Content-Type", "Content-Disposition", "Content-Encoding", "ETag", "Vary")
+
+
+def _stream_export(api_client, entity):
+    """Relay an export from the database service chunk by chunk, still encoded, without buffering it."""
+    headers = {"Accept-Encoding": request.headers.get("Accept-Encoding") or "identity"}
+    try:
+        upstream = api_client.open_stream(f"/api/export/{entity}", params=request.args.to_dict(), headers=headers)
+    except Exception as e:
+        logger.error(f"Failed to start export of {entity}: {e}")
+        return jsonify({"error": str(e)}), 502
+
+    if upstream.status_code != 200:
+        try:
+            return Response(upstream.content, status=upstream.status_code, content_type="application/json")
+        finally:
+            upstream.close()
+
+    def relay():
+        try:
+            yield from upstream.raw.stream(EXPORT_CHUNK_SIZE, decode_content=False)
+        finally:
+            upstream.close()
+
+    response = Response(relay(), status=200)
+    for name in EXPORT_HEADERS:
+        value = upstream.headers.get(name)
+        if isinstance(value, str):
+            response.headers[name] = value
+    return response
+
+
 def create_database_proxy_blueprint(database_url: str, api_client, api_config):  # noqa: C901
     """Create blueprint for database proxy routes.
 
@@ -25,9 +135,13 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
             limit = request.args.get("limit", default_limit, type=int)
             offset = request.args.get("offset", 0, type=int)
             category = request.args.get("category")
+            cursor = request.args.get("cursor")
 
-            risks = api_client.get_risks(limit=limit, offset=offset, category=category)
-            return jsonify(risks)
+            validators = _request_validators()
+            risks = api_client.get_risks(
+                limit=limit, offset=offset, category=category, cursor=cursor, validators=validators
+            )
+            return _conditional_response(risks, validators)
         except Exception as e:
             logger.error(f"Failed to fetch risks: {e}")
             return jsonify([])
@@ -35,8 +149,11 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
     @bp.route("/api/risks/summary")
     def proxy_risks_summary():
         """Proxy risks summary request to database service."""
-        risks_summary = api_client.get_risks_summary()
-        return jsonify(risks_summary)
+        try:
+            return _passthrough(api_client, "/api/risks/summary")
+        except Exception as e:
+            logger.error(f"Failed to fetch risks summary: {e}")
+            return jsonify({"details": []})
 
     @bp.route("/api/controls")
     def proxy_controls():
@@ -47,9 +164,13 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
             limit = request.args.get("limit", default_limit, type=int)
             offset = request.args.get("offset", 0, type=int)
             domain = request.args.get("domain")
+            cursor = request.args.get("cursor")
 
-            controls = api_client.get_controls(limit=limit, offset=offset, domain=domain)
-            return jsonify(controls)
+            validators = _request_validators()
+            controls = api_client.get_controls(
+                limit=limit, offset=offset, domain=domain, cursor=cursor, validators=validators
+            )
+            return _conditional_response(controls, validators)
         except Exception as e:
             logger.error(f"Failed to fetch controls: {e}")
             return jsonify([])
@@ -57,21 +178,23 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
     @bp.route("/api/controls/summary")
     def proxy_controls_summary():
         """Proxy controls summary request to database service."""
-        controls_summary = api_client.get_controls_summary()
-        return jsonify(controls_summary)
+        try:
+            return _passthrough(api_client, "/api/controls/summary")
+        except Exception as e:
+            logger.error(f"Failed to fetch controls summary: {e}")
+            return jsonify({"details": []})
 
     @bp.route("/api/controls/mapped")
     def proxy_mapped_control_ids():
         """Proxy mapped control IDs request to database service."""
         try:
-            response = api_client.session.get(f"{api_client.base_url}/api/controls/mapped")
-            response.raise_for_status()
-            return jsonify(response.json())
+            validators = _request_validators()
+            data = api_client.get_json("/api/controls/mapped", validators=validators)
+            return _conditional_response(data, validators)
         except Exception as e:
             logger.error(f"Failed to fetch mapped control IDs: {e}")
             return jsonify({"mapped_control_ids": []})
 
-
     @bp.route("/api/definitions")
     def proxy_definitions():
         """Proxy definitions request to database service."""
@@ -81,9 +204,13 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
             limit = request.args.get("limit", default_limit, type=int)
             offset = request.args.get("offset", 0, type=int)
             category = request.args.get("category")
+            cursor = request.args.get("cursor")
 
-            definitions = api_client.get_definitions(limit=limit, offset=offset, category=category)
-            return jsonify(definitions)
+            validators = _request_validators()
+            definitions = api_client.get_definitions(
+                limit=limit, offset=offset, category=category, cursor=cursor, validators=validators
+            )
+            return _conditional_response(definitions, validators)
         except Exception as e:
             logger.error(f"Failed to fetch definitions: {e}")
             return jsonify([])
@@ -111,16 +238,32 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
             # Use config defaults if not provided
             default_limit = api_config.get("limits", {}).get("search_limit", 50)
             limit = request.args.get("limit", default_limit, type=int)
+            offset = request.args.get("offset", 0, type=int)
+            types = request.args.get("types")
+            fuzzy = request.args.get("fuzzy", "false").lower() == "true"
+            threshold = request.args.get("threshold", type=float)
 
             if not query:
                 return jsonify({"query": "", "results": []})
 
-            results = api_client.search(query=query, limit=limit)
+            results = api_client.search(
+                query=query, limit=limit, offset=offset, types=types, fuzzy=fuzzy, threshold=threshold
+            )
             return jsonify(results)
         except Exception as e:
             logger.error(f"Failed to search: {e}")
             return jsonify({"query": query, "results": []})
 
+    @bp.route("/api/search/index")
+    def proxy_search_index():
+        """Proxy the prebuilt client-side search index to database service."""
+        return _analysis_response(api_client, "/api/search/index")
+
+    @bp.route("/api/autocomplete")
+    def proxy_autocomplete():
+        """Proxy a prefix autocomplete query to database service."""
+        return _analysis_response(api_client, "/api/autocomplete")
+
     @bp.route("/api/stats")
     def proxy_stats():
         """Proxy stats request to database service."""
@@ -135,9 +278,7 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
     def proxy_network():
         """Proxy network request to database service."""
         try:
-            response = api_client.session.get(f"{api_client.base_url}/api/network")
-            response.raise_for_status()
-            return jsonify(response.json())
+            return _passthrough(api_client, "/api/network")
         except Exception as e:
             logger.error(f"Failed to fetch network data: {e}")
             return jsonify(
@@ -148,13 +289,72 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
                 }
             )
 
+    @bp.route("/api/graph/neighbors")
+    def proxy_graph_neighbors():
+        """Proxy a k-hop neighbourhood query to database service."""
+        return _analysis_response(api_client, "/api/graph/neighbors")
+
+    @bp.route("/api/graph/components")
+    def proxy_graph_components():
+        """Proxy the connected components listing to database service."""
+        return _analysis_response(api_client, "/api/graph/components")
+
+    @bp.route("/api/graph/components/<int:component>")
+    def proxy_graph_component(component):
+        """Proxy one connected component's nodes and mappings to database service."""
+        return _analysis_response(api_client, f"/api/graph/components/{component}")
+
+    @bp.route("/api/graph/subgraph", methods=["POST"])
+    def proxy_graph_subgraph():
+        """Proxy an induced-subgraph query to database service."""
+        return _batch_response(api_client.get_graph_subgraph)
+
+    @bp.route("/api/analysis/single-points")
+    def proxy_single_points():
+        """Proxy the single-point-of-failure analysis to database service."""
+        return _analysis_response(api_client, "/api/analysis/single-points")
+
+    @bp.route("/api/control/<control_id>/impact")
+    def proxy_control_impact(control_id):
+        """Proxy a control's sole and shared risk coverage to database service."""
+        return _analysis_response(api_client, f"/api/control/{control_id}/impact")
+
+    @bp.route("/api/rankings/<entity_type>")
+    def proxy_rankings(entity_type):
+        """Proxy a centrality ranking of risks or controls to database service."""
+        return _analysis_response(api_client, f"/api/rankings/{entity_type}")
+
+    @bp.route("/api/optimize/cover", methods=["POST"])
+    def proxy_optimize_cover():
+        """Proxy a minimal control set search for a set of risks to database service."""
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict) or not isinstance(payload.get("risk_ids"), list):
+            return jsonify({"error": "Request body must be a JSON object with a 'risk_ids' list"}), 400
+        return _post_response(api_client.optimize_cover, payload)
+
+    @bp.route("/api/scenarios/coverage", methods=["POST"])
+    def proxy_scenario_coverage():
+        """Proxy a batch of what-if coverage scenarios to database service."""
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict) or not isinstance(payload.get("scenarios"), list):
+            return jsonify({"error": "Request body must be a JSON object with a 'scenarios' list"}), 400
+        return _post_response(api_client.simulate_coverage, payload)
+
+    @bp.route("/api/<entity_type>/<entity_id>/similar")
+    def proxy_similar_entities(entity_type, entity_id):
+        """Proxy a TF-IDF similar-entities lookup to database service."""
+        return _analysis_response(api_client, f"/api/{entity_type}/{entity_id}/similar")
+
+    @bp.route("/api/coverage/matrix")
+    def proxy_coverage_matrix():
+        """Proxy the control domain x risk coverage matrix to database service."""
+        return _analysis_response(api_client, "/api/coverage/matrix")
+
     @bp.route("/api/gaps")
     def proxy_gaps():
         """Proxy gaps request to database service."""
         try:
-            response = api_client.session.get(f"{api_client.base_url}/api/gaps")
-            response.raise_for_status()
-            return jsonify(response.json())
+            return _passthrough(api_client, "/api/gaps")
         except Exception as e:
             logger.error(f"Failed to fetch gaps data: {e}")
             return jsonify(
@@ -172,9 +372,9 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
     def proxy_last_updated():
         """Proxy last-updated request to database service."""
         try:
-            response = api_client.session.get(f"{api_client.base_url}/api/last-updated")
-            response.raise_for_status()
-            return jsonify(response.json())
+            validators = _request_validators()
+            data = api_client.get_json("/api/last-updated", validators=validators)
+            return _conditional_response(data, validators)
         except Exception as e:
             logger.error(f"Failed to fetch last updated data: {e}")
             return jsonify(
@@ -215,6 +415,19 @@ def create_database_proxy_blueprint(database_url: str, api_client, api_config):
             logger.error(f"Failed to fetch control detail: {e}")
             return jsonify({"control": {}, "associated_risks": [], "associated_questions": []})
 
+    @bp.route("/api/export/<entity>")
+    def proxy_export(entity):
+        """Stream a bulk export (NDJSON, CSV or XLSX) from the database service."""
+        return _stream_export(api_client, entity)
+
+    @bp.route("/api/risks/batch", methods=["POST"])
+    def proxy_risks_batch():
+        """Proxy a batch of risk detail lookups to database service."""
+        return _batch_response(api_client.get_risks_batch)
 
+    @bp.route("/api/controls/batch", methods=["POST"])
+    def proxy_controls_batch():
+        """Proxy a batch of control detail lookups to database service."""
+        return _batch_response(api_client.get_controls_batch)
 
     return bp
@@ -17,9 +17,21 @@ class DashboardControls extends DashboardNetwork {
             `;
             row.addEventListener('click', () => this.showDetailModal('control', control));
             tbody.appendChild(row);
+
+            if (this.definitionHoverManager && Array.isArray(control.terms)) {
+                const cells = row.querySelectorAll('td');
+                this.definitionHoverManager.applyOccurrences(
+                    { title: cells[2], description: cells[3] },
+                    { title: control.control_title, description: control.control_description },
+                    control.terms,
+                    'controls'
+                );
+            }
         });
 
-        if (this.definitionHoverManager) {
+        // Databases built without term offsets fall back to scanning the rendered text
+        const hasTermOffsets = this.data.controls.details.some(control => Array.isArray(control.terms));
+        if (this.definitionHoverManager && !hasTermOffsets) {
             this.definitionHoverManager.enhanceContent(tbody, 'controls');
         }
     }
@@ -140,9 +152,20 @@ class DashboardControls extends DashboardNetwork {
             `;
             row.addEventListener('click', () => this.showDetailModal('risk', risk));
             tbody.appendChild(row);
+
+            if (this.definitionHoverManager && Array.isArray(risk.terms)) {
+                this.definitionHoverManager.applyOccurrences(
+                    { title: row.querySelector('.risk-title') },
+                    { title: risk.risk_title },
+                    risk.terms,
+                    'risks'
+                );
+            }
         });
 
-        if (this.definitionHoverManager) {
+        // Databases built without term offsets fall back to scanning the rendered text
+        const hasTermOffsets = this.data.risks.details.some(risk => Array.isArray(risk.terms));
+        if (this.definitionHoverManager && !hasTermOffsets) {
             this.definitionHoverManager.enhanceContent(tbody, 'risks');
         }
     }
@@ -6,14 +6,49 @@ class DashboardSearch extends DashboardCore {
         }
 
         try {
+            // Plain keywords are answered from the in-browser index; the server handles
+            // query syntax, and stemmed matches the index (unstemmed prefixes) misses
+            const index = SearchIndex.isSimpleQuery(query) ? await this.loadSearchIndex() : null;
+            const local = index ? index.search(query, window.getConfig('search.max_results', 50)) : null;
+            if (local && local.total > 0) {
+                this.displaySearchResults(local.results);
+                return;
+            }
+
             const response = await fetch(`/api/search?q=${encodeURIComponent(query)}`);
-            const data = await response.json();
-            this.displaySearchResults(data.results);
+            let data = await response.json();
+            if (!data.results || data.results.length === 0) {
+                // Nothing matched as typed: retry tolerating misspellings ("adverserial")
+                const fuzzyResponse = await fetch(`/api/search?q=${encodeURIComponent(query)}&fuzzy=true`);
+                data = await fuzzyResponse.json();
+            }
+            this.displaySearchResults(data.results || []);
         } catch (error) {
             console.error('Search error:', error);
         }
     }
 
+    /**
+     * Fetch the prebuilt search index once per page load (revalidated by ETag).
+     * Resolves to null when it is unavailable, so searches go to the server.
+     * @returns {Promise<SearchIndex|null>}
+     */
+    loadSearchIndex() {
+        if (!this.searchIndexPromise) {
+            this.searchIndexPromise = fetch('/api/search/index')
+                .then(response => {
+                    if (!response.ok) throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+                    return response.json();
+                })
+                .then(artifact => new SearchIndex(artifact))
+                .catch(error => {
+                    console.warn('Search index unavailable, searching on the server:', error);
+                    return null;
+                });
+        }
+        return this.searchIndexPromise;
+    }
+
     displaySearchResults(results) {
         const container = document.getElementById('searchResults');
 
@@ -44,11 +44,7 @@ class DataManager extends BaseModule {
      * @returns {Promise<Object>} Risks data
      */
     async fetchRisks() {
-        const response = await fetch('/api/risks');
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-        }
-        return await response.json();
+        return await this.fetchAllPages('/api/risks');
     }
 
     /**
@@ -56,11 +52,31 @@ class DataManager extends BaseModule {
      * @returns {Promise<Object>} Controls data
      */
     async fetchControls() {
-        const response = await fetch('/api/controls');
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-        }
-        return await response.json();
+        return await this.fetchAllPages('/api/controls');
+    }
+
+    /**
+     * Fetch every page of a list endpoint by following X-Next-Cursor
+     * @param {string} url - List endpoint URL
+     * @param {number} pageSize - Items per page
+     * @returns {Promise<Array>} All items
+     */
+    async fetchAllPages(url, pageSize = 1000) {
+        const items = [];
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ limit: pageSize });
+            if (cursor) {
+                params.set('cursor', cursor);
+            }
+            const response = await fetch(`${url}?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            items.push(...await response.json());
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
+        return items;
     }
 
     /**
@@ -135,6 +151,106 @@ class DataManager extends BaseModule {
         }, `Failed to load ${type} details`);
     }
 
+    /**
+     * Get detailed information for many entities in one request
+     * @param {string} type - Entity type (risk, control)
+     * @param {Array<string>} ids - Entity IDs
+     * @returns {Promise<Object>} Details keyed by ID, plus the IDs that were not found
+     */
+    async getEntityDetails(type, ids) {
+        return await this.safeAsync(async () => {
+            const response = await fetch(`/api/${type}s/batch`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ ids })
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            return await response.json();
+        }, `Failed to load ${type} details`);
+    }
+
+    /**
+     * Get the risks and controls within a few mappings of one node, instead of the whole network
+     * @param {string} id - Risk or control ID
+     * @param {number} hops - Neighbourhood depth
+     * @returns {Promise<Object>} Nodes (with their distance) and the mappings between them
+     */
+    async getGraphNeighborhood(id, hops = 1) {
+        return await this.safeAsync(async () => {
+            const params = new URLSearchParams({ id, hops: String(hops) });
+            const response = await fetch(`/api/graph/neighbors?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            return await response.json();
+        }, `Failed to load graph neighbourhood of ${id}`);
+    }
+
+    /**
+     * Get the risks, controls and definitions whose text reads most like an entity
+     * @param {string} type - 'risk', 'control' or 'definition'
+     * @param {string} id - Entity ID
+     * @param {string|null} similarType - Only return entities of this type
+     * @returns {Promise<Object>} Similar entities with their titles and cosine scores, best first
+     */
+    async getSimilarEntities(type, id, similarType = null) {
+        return await this.safeAsync(async () => {
+            const params = new URLSearchParams();
+            if (similarType) {
+                params.set('type', similarType);
+            }
+            const response = await fetch(`/api/${type}/${encodeURIComponent(id)}/similar?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            return await response.json();
+        }, `Failed to load entities similar to ${id}`);
+    }
+
+    /**
+     * Complete a typed prefix to entity ids, titles and definition terms
+     * @param {string} prefix - Text typed so far
+     * @param {Array<string>|null} types - Only complete these entity types (risk, control, definition)
+     * @param {number} limit - Maximum completions
+     * @returns {Promise<Array>} Completions, most connected entities first
+     */
+    async getCompletions(prefix, types = null, limit = 10) {
+        if (!prefix.trim()) {
+            return [];
+        }
+
+        return await this.safeAsync(async () => {
+            const params = new URLSearchParams({ prefix, limit: String(limit) });
+            if (types && types.length) {
+                params.set('types', types.join(','));
+            }
+            const response = await fetch(`/api/autocomplete?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            const data = await response.json();
+            return data.completions || [];
+        }, `Failed to complete "${prefix}"`);
+    }
+
+    /**
+     * Get mapping counts per control domain and risk, aggregated server-side for heatmaps
+     * @param {number} groupSize - Consecutive risks summed into each column
+     * @returns {Promise<Object>} Row and column labels, shape, and counts flattened row by row
+     */
+    async getCoverageMatrix(groupSize = 1) {
+        return await this.safeAsync(async () => {
+            const params = new URLSearchParams({ group_size: String(groupSize) });
+            const response = await fetch(`/api/coverage/matrix?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            return await response.json();
+        }, 'Failed to load coverage matrix');
+    }
+
     /**
      * Get last updated times
      * @returns {Promise<Object>} Last updated information
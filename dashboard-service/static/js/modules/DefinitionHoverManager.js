@@ -277,6 +277,65 @@ class DefinitionHoverManager {
         textNode.parentNode.replaceChild(fragment, textNode);
     }
 
+    /**
+     * Wrap defined terms in table cells using offsets precomputed by data processing
+     * 
+     * The database service returns each risk's and control's term occurrences
+     * (field, start, end, term), so no pattern matching runs in the browser.
+     * 
+     * @param {Object<string, HTMLElement>} cells - Cell showing each field ('title', 'description')
+     * @param {Object<string, string>} texts - Text of each field, which the offsets index
+     * @param {Array<Object>} occurrences - The entity's term occurrences, in field and offset order
+     * @param {string} tabName - The name of the current tab
+     * @returns {void}
+     * 
+     * @example
+     * hoverManager.applyOccurrences({ title: titleCell }, { title: risk.risk_title }, risk.terms, 'risks');
+     */
+    applyOccurrences(cells, texts, occurrences, tabName) {
+        if (!this.isEnabledForTab(tabName) || !occurrences || occurrences.length === 0) {
+            return;
+        }
+
+        Object.entries(cells).forEach(([field, cell]) => {
+            const fieldOccurrences = occurrences.filter(occurrence => occurrence.field === field);
+            if (cell && texts[field] && fieldOccurrences.length > 0) {
+                this.wrapOccurrences(cell, texts[field], fieldOccurrences);
+            }
+        });
+    }
+
+    /**
+     * Replace an element's content with text whose occurrences are wrapped in hover spans
+     */
+    wrapOccurrences(element, text, occurrences) {
+        const fragment = document.createDocumentFragment();
+        let lastIndex = 0;
+
+        occurrences.forEach(({ start, end, term }) => {
+            if (start < lastIndex || end > text.length) return;
+
+            // Add text before the occurrence
+            if (start > lastIndex) {
+                fragment.appendChild(document.createTextNode(text.slice(lastIndex, start)));
+            }
+
+            const span = document.createElement('span');
+            span.className = 'has-definition';
+            span.setAttribute('data-term', term);
+            span.textContent = text.slice(start, end);
+            fragment.appendChild(span);
+            lastIndex = end;
+        });
+
+        // Add remaining text
+        if (lastIndex < text.length) {
+            fragment.appendChild(document.createTextNode(text.slice(lastIndex)));
+        }
+
+        element.replaceChildren(fragment);
+    }
+
     /**
      * Create the hover card element
      */
@@ -0,0 +1,144 @@
+/**
+ * Search Index
+ *
+ * Answers search-as-you-type in the browser from the prebuilt inverted index
+ * served by /api/search/index, so plain keyword queries never leave the page.
+ * Results have the same shape as /api/search results.
+ *
+ * @class SearchIndex
+ * @example
+ * const index = new SearchIndex(await (await fetch('/api/search/index')).json());
+ * index.search('data poison', 50);
+ */
+
+class SearchIndex {
+    /** Artifact layout this module understands (the artifact's `format`) */
+    static FORMAT = 1;
+
+    /**
+     * @param {Object} artifact - Parsed /api/search/index response
+     */
+    constructor(artifact) {
+        if (!artifact || artifact.format !== SearchIndex.FORMAT) {
+            throw new Error(`Unsupported search index format: ${artifact && artifact.format}`);
+        }
+        this.version = artifact.version;
+        this.types = artifact.types;
+        this.documents = artifact.documents;
+        this.tokens = artifact.tokens;
+        this.postings = artifact.postings;
+        this.prefixes = artifact.prefixes;
+        // Score weight of every 4-bit field mask: the sum of the weights of its fields
+        this.maskWeights = Array.from({ length: 16 }, (_, mask) =>
+            artifact.field_weights.reduce((sum, weight, bit) => (mask & (1 << bit) ? sum + weight : sum), 0)
+        );
+        this.decoded = new Map();
+    }
+
+    /**
+     * Split text into lowercase word tokens, as the server splits queries
+     * @param {string} text - Text to tokenize
+     * @returns {Array<string>} Tokens
+     */
+    static tokenize(text) {
+        return (text || '').toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+    }
+
+    /**
+     * Whether a query is plain keywords the index can answer; anything with
+     * quotes, operators or other syntax goes to the server
+     * @param {string} query - Search query
+     * @returns {boolean}
+     */
+    static isSimpleQuery(query) {
+        return /^[\p{L}\p{N}_\s.\-]*$/u.test(query) && !/\b(AND|OR|NOT|NEAR)\b/.test(query);
+    }
+
+    /**
+     * Range [start, end) of vocabulary tokens starting with prefix
+     * @param {string} prefix - Lowercase token prefix
+     * @returns {Array<number>} Start and end positions in this.tokens
+     */
+    tokenRange(prefix) {
+        let [low, high] = [0, this.tokens.length];
+        if (prefix.length >= 2) {
+            const span = this.prefixes[prefix.slice(0, 2)];
+            if (!span) return [0, 0];
+            [low, high] = span;
+        }
+        const lowerBound = (value, lo, hi) => {
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (this.tokens[mid] < value) lo = mid + 1;
+                else hi = mid;
+            }
+            return lo;
+        };
+        const start = lowerBound(prefix, low, high);
+        let end = start;
+        while (end < high && this.tokens[end].startsWith(prefix)) end++;
+        return [start, end];
+    }
+
+    /**
+     * Decoded postings of one token: parallel arrays of document numbers and field masks
+     * @param {number} position - Token position in this.tokens
+     * @returns {{documents: Array<number>, masks: Array<number>}}
+     */
+    postingsFor(position) {
+        let entry = this.decoded.get(position);
+        if (!entry) {
+            entry = { documents: [], masks: [] };
+            let value = 0;
+            for (const delta of this.postings[position]) {
+                value += delta;
+                entry.documents.push(Math.floor(value / 16));
+                entry.masks.push(value % 16);
+            }
+            this.decoded.set(position, entry);
+        }
+        return entry;
+    }
+
+    /**
+     * Rank documents matching every query token as a prefix, best first
+     *
+     * A document's score sums, per query token, the best field-weighted IDF
+     * among the vocabulary tokens it matches.
+     *
+     * @param {string} query - Plain keyword query
+     * @param {number} limit - Maximum results
+     * @returns {{results: Array<Object>, total: number}} Results shaped like /api/search results
+     */
+    search(query, limit = 50) {
+        const queryTokens = [...new Set(SearchIndex.tokenize(query))];
+        if (queryTokens.length === 0) return { results: [], total: 0 };
+
+        let scores = null;
+        for (const queryToken of queryTokens) {
+            const tokenScores = new Map();
+            const [start, end] = this.tokenRange(queryToken);
+            for (let position = start; position < end; position++) {
+                const { documents, masks } = this.postingsFor(position);
+                const idf = Math.log(1 + this.documents.length / documents.length);
+                documents.forEach((document, i) => {
+                    if (scores && !scores.has(document)) return;
+                    const score = idf * this.maskWeights[masks[i]];
+                    if (score > (tokenScores.get(document) || 0)) tokenScores.set(document, score);
+                });
+            }
+            if (scores) {
+                for (const [document, score] of tokenScores) tokenScores.set(document, score + scores.get(document));
+            }
+            scores = tokenScores;
+            if (scores.size === 0) break;
+        }
+
+        const ranked = [...scores.entries()].sort((a, b) => b[1] - a[1] || a[0] - b[0]);
+        const results = ranked.slice(0, limit).map(([document, score]) => {
+            const [type, id, title, description] = this.documents[document];
+            return { type: this.types[type], id, title, description, score: Math.round(score * 1e4) / 1e4 };
+        });
+        return { results, total: ranked.length };
+    }
+}
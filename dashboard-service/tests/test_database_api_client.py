@@ -256,6 +256,22 @@ class TestDatabaseAPIClient:
                 "results": [{"type": "risk", "id": "AIR.001", "title": "Test Risk"}],
             }
 
+    def test_search_fuzzy(self):
+        """Test fuzzy search passes the flag and threshold upstream."""
+        client = DatabaseAPIClient(self.BASE_URL)
+
+        mock_response = Mock()
+        mock_response.json.return_value = {"query": "encription", "results": [], "corrections": {}}
+        mock_response.raise_for_status.return_value = None
+
+        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
+            client.search(query="encription", limit=10, fuzzy=True, threshold=0.4)
+
+            mock_get.assert_called_once_with(
+                f"{self.BASE_URL}/api/search",
+                params={"q": "encription", "limit": 10, "fuzzy": "true", "threshold": 0.4},
+            )
+
     def test_search_failure(self):
         """Test search with API failure."""
         client = DatabaseAPIClient(self.BASE_URL)
@@ -407,7 +423,81 @@ class TestDatabaseAPIClient:
 
             assert result == {"error": "API Error"}
 
+    def test_get_json_forwards_validators(self):
+        """Test conditional GET sends If-None-Match and records the upstream validators."""
+        client = DatabaseAPIClient(self.BASE_URL)
 
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"ETag": '"abc-123"', "Cache-Control": "no-cache"}
+        mock_response.json.return_value = {"risk_control_links": []}
+        mock_response.raise_for_status.return_value = None
+
+        validators = {"If-None-Match": '"old"'}
+        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
+            result = client.get_json("/api/network", validators=validators)
+
+            mock_get.assert_called_once_with(
+                f"{self.BASE_URL}/api/network", headers={"If-None-Match": '"old"'}
+            )
+            assert result == {"risk_control_links": []}
+            assert validators["ETag"] == '"abc-123"'
+            assert validators["Cache-Control"] == "no-cache"
+            assert "not_modified" not in validators
+
+    def test_get_json_not_modified(self):
+        """Test a 304 from the database service is reported instead of decoded."""
+        client = DatabaseAPIClient(self.BASE_URL)
+
+        mock_response = Mock()
+        mock_response.status_code = 304
+        mock_response.headers = {"ETag": '"abc-123"'}
+
+        validators = {"If-None-Match": '"abc-123"'}
+        with patch.object(client.session, "get", return_value=mock_response):
+            result = client.get_risks_summary(validators=validators)
+
+            assert result is None
+            assert validators["not_modified"] is True
+            mock_response.json.assert_not_called()
+
+    def test_get_controls_batch(self):
+        """Test batch control details are fetched with a single POST."""
+        client = DatabaseAPIClient(self.BASE_URL)
+
+        mock_response = Mock()
+        mock_response.json.return_value = {"controls": {}, "not_found": ["AIGPC.9"]}
+        mock_response.raise_for_status.return_value = None
+
+        with patch.object(client.session, "post", return_value=mock_response) as mock_post:
+            result = client.get_controls_batch(("AIGPC.9",))
+
+            mock_post.assert_called_once_with(
+                f"{self.BASE_URL}/api/controls/batch", json={"ids": ["AIGPC.9"]}
+            )
+            assert result == {"controls": {}, "not_found": ["AIGPC.9"]}
+
+    def test_get_passthrough_returns_encoded_body(self):
+        """Test passthrough GET forwards Accept-Encoding and returns the undecoded bytes."""
+        client = DatabaseAPIClient(self.BASE_URL)
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"ETag": 'W/"abc"', "Content-Encoding": "gzip"}
+        mock_response.raw.read.return_value = b"compressed"
+        mock_response.raise_for_status.return_value = None
+
+        validators = {"Accept-Encoding": "gzip, br"}
+        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
+            result = client.get_passthrough("/api/gaps", validators=validators)
+
+            mock_get.assert_called_once_with(
+                f"{self.BASE_URL}/api/gaps", headers={"Accept-Encoding": "gzip, br"}, stream=True
+            )
+            assert result == b"compressed"
+            assert validators["Content-Encoding"] == "gzip"
+            assert validators["ETag"] == 'W/"abc"'
+            mock_response.close.assert_called_once()
 
     def test_custom_timeout_configuration(self):
         """Test custom timeout configuration."""
@@ -5,7 +5,9 @@ Tests for the definitions API endpoints.
 import pytest
 from unittest.mock import patch, MagicMock
 from flask import Flask
+import gzip
 import json
+import requests
 
 
 @pytest.mark.unit
@@ -222,6 +224,17 @@ class TestDefinitionsAPI:
         data = response.get_json()
         assert len(data["results"]) == 2
 
+    def test_api_search_fuzzy_forwarded(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test the fuzzy flag and threshold reach the database client."""
+        mock_database_api_client.search.return_value = {"results": [], "total": 0, "corrections": {}}
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/search?q=encription&fuzzy=true&threshold=0.5")
+        assert response.status_code == 200
+        kwargs = mock_database_api_client.search.call_args.kwargs
+        assert kwargs["fuzzy"] is True
+        assert kwargs["threshold"] == 0.5
+
     def test_api_definitions_last_updated_integration(self, client, mock_database_api_client, patch_api_client_methods):
         """Test that definitions are included in last updated endpoint."""
         # Mock the session.get call that's used in the last_updated endpoint
@@ -255,3 +268,353 @@ class TestDefinitionsAPI:
         data = response.get_json()
         assert "total_definitions" in data
         assert data["total_definitions"] == 50
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestConditionalProxy:
+    """Test ETag / 304 forwarding through the database proxy."""
+
+    def _upstream(self, status_code, body=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = {"ETag": '"fp-1"', "Cache-Control": "no-cache"}
+        response.json.return_value = body
+        response.raw.read.return_value = json.dumps(body).encode() if body is not None else b""
+        response.raise_for_status.return_value = None
+        return response
+
+    def test_proxy_forwards_etag(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test upstream validators are passed back to the browser."""
+        mock_database_api_client.session.get.return_value = self._upstream(200, {"risk_control_links": []})
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/network")
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"fp-1"'
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert response.get_json() == {"risk_control_links": []}
+
+    def test_proxy_revalidates_upstream(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test the browser's If-None-Match is sent upstream and a 304 is passed through."""
+        mock_database_api_client.session.get.return_value = self._upstream(304)
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/gaps", headers={"If-None-Match": '"fp-1"'})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"fp-1"'
+        assert response.data == b""
+
+        _, kwargs = mock_database_api_client.session.get.call_args
+        assert kwargs["headers"]["If-None-Match"] == '"fp-1"'
+
+    def test_proxy_passes_compressed_body_through(
+        self, client, mock_database_api_client, patch_api_client_methods
+    ):
+        """Test a compressed upstream body reaches the browser without being decoded and re-encoded."""
+        payload = json.dumps({"details": [{"risk_id": "AIR.001"}] * 100}).encode()
+        upstream = self._upstream(200)
+        upstream.headers = {"ETag": 'W/"fp-1"', "Content-Encoding": "gzip"}
+        upstream.raw.read.return_value = gzip.compress(payload)
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/risks/summary", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"] == 'W/"fp-1"'
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert gzip.decompress(response.data) == payload
+
+        _, kwargs = mock_database_api_client.session.get.call_args
+        assert kwargs["headers"]["Accept-Encoding"] == "gzip"
+        upstream.raw.read.assert_called_once_with(decode_content=False)
+
+    def test_large_responses_are_compressed(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test JSON built by the dashboard itself is compressed for clients that accept it."""
+        definitions = [{"definition_id": f"D{i}", "term": f"Term {i}", "definition": "x" * 40} for i in range(50)]
+        mock_database_api_client.get_definitions.return_value = definitions
+
+        with patch_api_client_methods(mock_database_api_client):
+            compressed = client.get("/api/definitions", headers={"Accept-Encoding": "gzip"})
+            plain = client.get("/api/definitions")
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+        assert "Content-Encoding" not in plain.headers
+
+    def test_proxy_forwards_paging(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test the cursor goes upstream and the paging headers come back."""
+        def get_controls(limit=None, offset=None, domain=None, cursor=None, validators=None):
+            assert cursor == "abc"
+            validators.update({"X-Total-Count": "4", "X-Next-Cursor": "next"})
+            return [{"id": "AIGPC.4"}]
+
+        mock_database_api_client.get_controls.side_effect = get_controls
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/controls?limit=1&cursor=abc")
+        assert response.status_code == 200
+        assert response.get_json() == [{"id": "AIGPC.4"}]
+        assert response.headers["X-Total-Count"] == "4"
+        assert response.headers["X-Next-Cursor"] == "next"
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestBatchProxy:
+    """Test batch detail routes through the database proxy."""
+
+    def test_proxy_risks_batch(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test the ids are posted upstream and the keyed map is returned."""
+        upstream = MagicMock()
+        upstream.json.return_value = {"risks": {"AIR.001": {"risk": {"id": "AIR.001"}}}, "not_found": ["X"]}
+        upstream.raise_for_status.return_value = None
+        mock_database_api_client.session.post.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.post("/api/risks/batch", json={"ids": ["AIR.001", "X"]})
+        assert response.status_code == 200
+        assert response.get_json()["not_found"] == ["X"]
+        args, kwargs = mock_database_api_client.session.post.call_args
+        assert args[0].endswith("/api/risks/batch")
+        assert kwargs["json"] == {"ids": ["AIR.001", "X"]}
+
+    def test_proxy_batch_rejects_bad_body(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test a body without an ids list is rejected before reaching the database service."""
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.post("/api/controls/batch", json={"ids": "AIGPC.1"})
+        assert response.status_code == 400
+        mock_database_api_client.session.post.assert_not_called()
+
+    def test_proxy_batch_forwards_upstream_rejection(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test an oversized batch rejected upstream keeps its 400 status."""
+        upstream = MagicMock()
+        upstream.status_code = 400
+        upstream.raise_for_status.side_effect = requests.HTTPError("400 Client Error", response=upstream)
+        mock_database_api_client.session.post.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.post("/api/controls/batch", json={"ids": ["AIGPC.1"] * 1000})
+        assert response.status_code == 400
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestExportProxy:
+    """Test bulk exports stream through the database proxy."""
+
+    def test_export_streams_upstream_bytes(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test export chunks are relayed as-is with their download headers."""
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {
+            "Content-Type": "text/csv; charset=utf-8",
+            "Content-Disposition": 'attachment; filename="risks.csv"',
+            "Content-Encoding": "gzip",
+        }
+        upstream.raw.stream.return_value = iter([b"chunk-1", b"chunk-2"])
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/export/risks?format=csv", headers={"Accept-Encoding": "gzip"})
+            assert response.is_streamed
+            assert response.data == b"chunk-1chunk-2"
+        assert response.headers["Content-Disposition"] == 'attachment; filename="risks.csv"'
+        assert response.headers["Content-Encoding"] == "gzip"
+
+        args, kwargs = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/export/risks")
+        assert kwargs["params"] == {"format": "csv"}
+        assert kwargs["stream"] is True
+        upstream.raw.stream.assert_called_once_with(64 * 1024, decode_content=False)
+        upstream.close.assert_called_once()
+
+    def test_export_forwards_upstream_errors(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test an unknown export keeps the database service's status."""
+        upstream = MagicMock()
+        upstream.status_code = 404
+        upstream.content = b'{"detail": "Unknown export"}'
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/export/passwords")
+        assert response.status_code == 404
+        assert response.get_json() == {"detail": "Unknown export"}
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestGraphProxy:
+    """Test graph queries are proxied to the database service."""
+
+    def test_neighbors_forwards_query(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test the node id and depth reach the database service and its body is returned as-is."""
+        body = {"center": "AIR.001", "hops": 2, "nodes": [], "edges": [], "truncated": False}
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {"ETag": '"fp-1"'}
+        upstream.raw.read.return_value = json.dumps(body).encode()
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/graph/neighbors?id=AIR.001&hops=2")
+        assert response.status_code == 200
+        assert response.get_json() == body
+
+        args, kwargs = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/graph/neighbors")
+        assert kwargs["params"] == {"id": "AIR.001", "hops": "2"}
+
+    def test_unknown_node_keeps_status(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test an upstream 404 for an unknown node is not turned into an empty graph."""
+        upstream = MagicMock()
+        upstream.status_code = 404
+        upstream.raise_for_status.side_effect = requests.HTTPError("404 Not Found", response=upstream)
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/graph/neighbors?id=AIR.999")
+        assert response.status_code == 404
+
+    def test_subgraph(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test induced-subgraph queries are posted upstream with their ids."""
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.post("/api/graph/subgraph", json={"ids": ["AIR.001", "AIGPC.1"]})
+            invalid = client.post("/api/graph/subgraph", json={"ids": "AIR.001"})
+        assert response.status_code == 200
+        args, kwargs = mock_database_api_client.session.post.call_args
+        assert args[0].endswith("/api/graph/subgraph")
+        assert kwargs["json"] == {"ids": ["AIR.001", "AIGPC.1"]}
+        assert invalid.status_code == 400
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestOptimizeProxy:
+    """Test control set optimization is proxied to the database service."""
+
+    def test_cover_forwards_payload(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test risk ids, costs and exclusions are posted upstream unchanged."""
+        payload = {"risk_ids": ["AIR.001"], "costs": {"AIGPC.1": 2.0}, "exclude": ["AIGPC.2"]}
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.post("/api/optimize/cover", json=payload)
+            invalid = client.post("/api/optimize/cover", json={"costs": {}})
+        assert response.status_code == 200
+        args, kwargs = mock_database_api_client.session.post.call_args
+        assert args[0].endswith("/api/optimize/cover")
+        assert kwargs["json"] == payload
+        assert invalid.status_code == 400
+
+    def test_scenarios_forward_payload(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test what-if scenarios are posted upstream unchanged."""
+        payload = {"scenarios": [{"removed": ["AIGPC.1"]}, {"implemented": ["AIGPC.2"], "planned": ["AIGPC.3"]}]}
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.post("/api/scenarios/coverage", json=payload)
+            invalid = client.post("/api/scenarios/coverage", json={"removed": []})
+        assert response.status_code == 200
+        args, kwargs = mock_database_api_client.session.post.call_args
+        assert args[0].endswith("/api/scenarios/coverage")
+        assert kwargs["json"] == payload
+        assert invalid.status_code == 400
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestImpactProxy:
+    """Test coverage impact analysis is proxied to the database service."""
+
+    def test_control_impact(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test a control's impact is fetched from its database service path."""
+        body = {"control_id": "AIGPC.1", "sole_risk_count": 1, "sole_risks": [], "shared_risks": []}
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {}
+        upstream.raw.read.return_value = json.dumps(body).encode()
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/control/AIGPC.1/impact")
+        assert response.status_code == 200
+        assert response.get_json() == body
+        args, _ = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/control/AIGPC.1/impact")
+
+    def test_rankings_forward_query(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test ranking query parameters reach the database service unchanged."""
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {"X-Total-Count": "4"}
+        upstream.raw.read.return_value = json.dumps({"rankings": []}).encode()
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/rankings/risks?metric=betweenness&limit=5")
+        assert response.status_code == 200
+        args, kwargs = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/rankings/risks")
+        assert kwargs["params"] == {"metric": "betweenness", "limit": "5"}
+
+    def test_autocomplete_forward_query(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test autocomplete parameters reach the database service unchanged."""
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {}
+        upstream.raw.read.return_value = json.dumps({"prefix": "dat", "completions": []}).encode()
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/autocomplete?prefix=dat&types=risk,control&limit=5")
+        assert response.status_code == 200
+        assert response.get_json()["prefix"] == "dat"
+        args, kwargs = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/autocomplete")
+        assert kwargs["params"] == {"prefix": "dat", "types": "risk,control", "limit": "5"}
+
+    def test_search_index_passthrough(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test the client search index is relayed from the database service with its ETag."""
+        body = {"format": 1, "version": "abc", "tokens": ["data"], "postings": [[2]], "documents": []}
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {"ETag": '"abc-1"'}
+        upstream.raw.read.return_value = json.dumps(body).encode()
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/search/index")
+        assert response.status_code == 200
+        assert response.get_json()["tokens"] == ["data"]
+        assert response.headers.get("ETag") == '"abc-1"'
+        args, _ = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/search/index")
+
+    def test_coverage_matrix(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test the coverage matrix is fetched with its grouping parameter."""
+        body = {"rows": ["Protect"], "columns": ["AIR.001"], "shape": [1, 1], "counts": [1]}
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {}
+        upstream.raw.read.return_value = json.dumps(body).encode()
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/coverage/matrix?group_size=10")
+        assert response.get_json() == body
+        args, kwargs = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/coverage/matrix")
+        assert kwargs["params"] == {"group_size": "10"}
+
+    def test_similar_entities(self, client, mock_database_api_client, patch_api_client_methods):
+        """Test similar-entity lookups keep their path and type filter."""
+        body = {"entity_type": "risk", "entity_id": "AIR.001", "similar": []}
+        upstream = MagicMock()
+        upstream.status_code = 200
+        upstream.headers = {}
+        upstream.raw.read.return_value = json.dumps(body).encode()
+        mock_database_api_client.session.get.return_value = upstream
+
+        with patch_api_client_methods(mock_database_api_client):
+            response = client.get("/api/risk/AIR.001/similar?type=control")
+        assert response.get_json() == body
+        args, kwargs = mock_database_api_client.session.get.call_args
+        assert args[0].endswith("/api/risk/AIR.001/similar")
+        assert kwargs["params"] == {"type": "control"}
@@ -212,7 +212,7 @@ class TestLetterFilteringAPI:
         ]
 
         # Mock the API client to filter by category
-        def mock_get_definitions(limit=None, offset=None, category=None):
+        def mock_get_definitions(limit=None, offset=None, category=None, cursor=None, validators=None):
             if category:
                 return [d for d in mock_definitions if d.get("category") == category]
             return mock_definitions
@@ -458,7 +458,7 @@ class TestLetterFilteringIntegration:
         ]
 
         # Mock the API client to filter by category
-        def mock_get_definitions(limit=None, offset=None, category=None):
+        def mock_get_definitions(limit=None, offset=None, category=None, cursor=None, validators=None):
             if category:
                 return [d for d in mock_definitions if d.get("category") == category]
             return mock_definitions
@@ -0,0 +1,50 @@
+"""Negotiated gzip/brotli compression of dashboard responses."""
+
+from typing import Any, Dict
+
+from flask import request
+
+# Negotiation and encoding are shared with the database service (shared-services/http_compression.py)
+from http_compression import compress, negotiate_encoding, weaken_etag
+
+# Content types worth compressing; everything else is passed through untouched
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "text/")
+
+
+def init_compression(app, compression_config: Dict[str, Any]) -> None:
+    """Compress JSON, script and text responses of at least ``minimum_size`` bytes after each request.
+
+    Responses that already carry a Content-Encoding (bodies passed through
+    compressed from the database service) are left as they are.
+    """
+    if str(compression_config.get("enabled", True)).lower() != "true":
+        return
+    minimum_size = int(compression_config.get("minimum_size", 1024))
+    gzip_level = int(compression_config.get("gzip_level", 6))
+    brotli_quality = int(compression_config.get("brotli_quality", 5))
+
+    @app.after_request
+    def compress_response(response):
+        content_type = response.headers.get("Content-Type", "")
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if "Content-Encoding" in response.headers:
+            return response
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+        if encoding is None or response.content_length is None or response.content_length < minimum_size:
+            return response
+
+        response.set_data(compress(response.get_data(), encoding, gzip_level, brotli_quality))
+        response.headers["Content-Encoding"] = encoding
+        etag = response.headers.get("ETag")
+        if etag:
+            # Compressed bytes differ from the upstream representation the strong ETag names
+            response.headers["ETag"] = weaken_etag(etag)
+        return response
@@ -0,0 +1 @@
+"""Performance benchmarks for the data processing service (run manually, not part of the test suite)."""
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark MinHash/LSH near-duplicate detection on a synthetic corpus.
+
+Generates ``--entries`` random control descriptions and rewrites
+``--duplicates`` of them with a few word substitutions, so each injected pair
+has a known Jaccard similarity. Reports the time per stage, the number of LSH
+candidate pairs (versus all n(n-1)/2 pairs), recall on injected pairs at or
+above the threshold, and clusters that were not injected.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [--entries 100000] [--duplicates 2000] [--edits 1]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.near_duplicates import (  # noqa: E402
+    BANDS,
+    NUM_PERM,
+    THRESHOLD,
+    candidate_pairs,
+    find_near_duplicates,
+    jaccard,
+    minhash_signatures,
+    shingles,
+)
+
+
+def synthetic_corpus(entries, duplicates, edits, seed=7):
+    """Random texts plus ``(original, copy)`` index pairs for the injected near duplicates."""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(20000)]
+    texts = [" ".join(rng.choices(vocabulary, k=rng.randint(20, 40))) for _ in range(entries - duplicates)]
+    injected = []
+    for original in rng.sample(range(len(texts)), duplicates):
+        words = texts[original].split()
+        for position in rng.sample(range(len(words)), edits):
+            words[position] = rng.choice(vocabulary)
+        injected.append((original, len(texts)))
+        texts.append(" ".join(words))
+    return texts, injected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--duplicates", type=int, default=2000)
+    parser.add_argument("--edits", type=int, default=1, help="Words replaced in each injected copy")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--num-perm", type=int, default=NUM_PERM)
+    parser.add_argument("--bands", type=int, default=BANDS)
+    args = parser.parse_args()
+
+    texts, injected = synthetic_corpus(args.entries, args.duplicates, args.edits)
+    ids = [f"C{i:06d}" for i in range(len(texts))]
+    print(f"entries: {len(texts):,}  injected pairs: {len(injected):,}  edits per copy: {args.edits}")
+
+    started = time.perf_counter()
+    shingle_sets = [shingles(text) for text in texts]
+    shingled = time.perf_counter()
+    signatures = minhash_signatures(shingle_sets, args.num_perm)
+    signed = time.perf_counter()
+    candidates = candidate_pairs(signatures, args.bands)
+    bucketed = time.perf_counter()
+    print(f"shingles:   {shingled - started:8.2f} s")
+    print(f"signatures: {signed - shingled:8.2f} s")
+    print(f"LSH:        {bucketed - signed:8.2f} s")
+    all_pairs = len(texts) * (len(texts) - 1) // 2
+    print(f"candidate pairs: {len(candidates):,} of {all_pairs:,} ({len(candidates) / all_pairs:.2e})")
+
+    started = time.perf_counter()
+    clusters = find_near_duplicates(ids, texts, args.threshold, args.num_perm, args.bands)
+    print(f"end to end: {time.perf_counter() - started:8.2f} s  clusters: {len(clusters):,}")
+
+    cluster_of = {entity_id: number for number, cluster in enumerate(clusters) for entity_id, _ in cluster}
+    expected = [(x, y) for x, y in injected if jaccard(shingle_sets[x], shingle_sets[y]) >= args.threshold]
+    found = sum(1 for x, y in expected if ids[x] in cluster_of and cluster_of.get(ids[x]) == cluster_of.get(ids[y]))
+    injected_ids = {ids[index] for pair in injected for index in pair}
+    unexpected = sum(1 for cluster in clusters if not all(entity_id in injected_ids for entity_id, _ in cluster))
+    print(f"recall: {found}/{len(expected)} injected pairs at or above {args.threshold}")
+    print(f"clusters with non-injected entries: {unexpected}")
+
+
+if __name__ == "__main__":
+    main()
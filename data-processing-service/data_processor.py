@@ -20,6 +20,11 @@ from extractors.control_extractor import ControlExtractor
 from extractors.definitions_extractor import DefinitionsExtractor
 from extractors.mapping_extractor import MappingExtractor
 from extractors.risk_extractor import RiskExtractor
+from processors.graph_metrics import compute_entity_metrics
+from processors.near_duplicates import compute_near_duplicates, generate_near_duplicate_report
+from processors.similarity import compute_similar_entities
+from processors.term_index import compute_term_occurrences
+from processors.trigram_index import compute_trigram_index
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +77,12 @@ class DataProcessor:
         self.controls_df: Optional[pd.DataFrame] = None
         self.definitions_df: Optional[pd.DataFrame] = None
         self.risk_control_mapping_df: Optional[pd.DataFrame] = None
+        self.entity_metrics_df: Optional[pd.DataFrame] = None
+        self.term_occurrences_df: Optional[pd.DataFrame] = None
+        self.similar_entities_df: Optional[pd.DataFrame] = None
+        self.near_duplicates_df: Optional[pd.DataFrame] = None
+        self.search_terms_df: Optional[pd.DataFrame] = None
+        self.search_trigrams_df: Optional[pd.DataFrame] = None
 
     def find_file_recursively(self, filename: str) -> Optional[Path]:
         """
@@ -257,6 +268,32 @@ class DataProcessor:
                 self.risks_df, self.controls_df
             )
 
+        # Centrality rankings over the risk-control graph, served by the database service
+        self.entity_metrics_df = compute_entity_metrics(self.risks_df, self.controls_df, self.risk_control_mapping_df)
+
+        # Definition term offsets in risk and control text, so clients can highlight without regex scans
+        self.term_occurrences_df = compute_term_occurrences(self.definitions_df, self.risks_df, self.controls_df)
+
+        # TF-IDF nearest neighbours for "similar entities" lists
+        self.similar_entities_df = compute_similar_entities(self.risks_df, self.controls_df, self.definitions_df)
+
+        # Word vocabulary with trigram postings, for typo-tolerant search
+        self.search_terms_df, self.search_trigrams_df = compute_trigram_index(
+            self.risks_df, self.controls_df, self.definitions_df
+        )
+
+        # Controls and definitions repeated under different ids, reported for review rather than dropped
+        duplicate_config = self.config_manager.get_extraction_config().get("near_duplicates", {})
+        if duplicate_config.get("enabled", True):
+            self.near_duplicates_df = compute_near_duplicates(
+                self.controls_df,
+                self.definitions_df,
+                threshold=duplicate_config.get("threshold", 0.8),
+                num_perm=duplicate_config.get("num_perm", 128),
+                bands=duplicate_config.get("bands", 16),
+            )
+            logger.info("\n" + generate_near_duplicate_report(self.near_duplicates_df))
+
     def extract_data_adaptive(self, excel_path: Path, entity_type: str) -> pd.DataFrame:
         """
         Extract data using adaptive field detection.
@@ -319,6 +356,27 @@ class DataProcessor:
         if self.risk_control_mapping_df is not None:
             self.database_manager.insert_data("risk_control_mapping", self.risk_control_mapping_df)
 
+        # Derived tables are replaced, or dropped when this build has no data for them
+        self.database_manager.insert_entity_metrics(self.entity_metrics_df)
+
+        self.database_manager.insert_term_occurrences(self.term_occurrences_df)
+
+        self.database_manager.insert_similar_entities(self.similar_entities_df)
+
+        if self.near_duplicates_df is not None:
+            self.database_manager.insert_near_duplicates(self.near_duplicates_df)
+
+        # Index the populated entity tables (replacing them dropped any earlier indexes)
+        self.database_manager.create_entity_indexes()
+
+        # Build the full-text search index over the populated entity tables
+        self.database_manager.create_search_index()
+
+        self.database_manager.insert_trigram_index(self.search_terms_df, self.search_trigrams_df)
+
+        # Precompute coverage multiplicity and sole-coverage ("single point of failure") tables
+        self.database_manager.create_coverage_index()
+
         # Store file metadata if enabled
         output_config = self.config_manager.get_output_config()
         if output_config.get("collect_metadata", True):
@@ -451,6 +509,9 @@ class DataProcessor:
         if self.risk_control_mapping_df is not None:
             print(f"Risk-Control mappings: {len(self.risk_control_mapping_df)}")
 
+        if self.near_duplicates_df is not None:
+            print(f"Near-duplicate entries flagged: {len(self.near_duplicates_df)}")
+
         print(f"\nDatabase created at: {self.database_manager.db_path}")
         print("=" * 50)
 
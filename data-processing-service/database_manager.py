@@ -61,8 +61,7 @@ class DatabaseManager:
         cursor = conn.cursor()
 
         # Create risks table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS risks (
                 risk_id TEXT PRIMARY KEY,
                 risk_title TEXT NOT NULL,
@@ -70,12 +69,10 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        """
-        )
+        """)
 
         # Create controls table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS controls (
                 control_id TEXT PRIMARY KEY,
                 control_title TEXT NOT NULL,
@@ -87,12 +84,10 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        """
-        )
+        """)
 
         # Create questions table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS questions (
                 question_id TEXT PRIMARY KEY,
                 question_text TEXT NOT NULL,
@@ -102,12 +97,10 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        """
-        )
+        """)
 
         # Create definitions table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS definitions (
                 definition_id TEXT PRIMARY KEY,
                 term TEXT NOT NULL,
@@ -118,12 +111,10 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        """
-        )
+        """)
 
         # Create risk-control mapping table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS risk_control_mapping (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 risk_id TEXT NOT NULL,
@@ -133,12 +124,10 @@ class DatabaseManager:
                 FOREIGN KEY (control_id) REFERENCES controls (control_id),
                 UNIQUE(risk_id, control_id)
             )
-        """
-        )
+        """)
 
         # Create question-risk mapping table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS question_risk_mapping (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 question_id TEXT NOT NULL,
@@ -148,12 +137,10 @@ class DatabaseManager:
                 FOREIGN KEY (risk_id) REFERENCES risks (risk_id),
                 UNIQUE(question_id, risk_id)
             )
-        """
-        )
+        """)
 
         # Create question-control mapping table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS question_control_mapping (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 question_id TEXT NOT NULL,
@@ -163,12 +150,10 @@ class DatabaseManager:
                 FOREIGN KEY (control_id) REFERENCES controls (control_id),
                 UNIQUE(question_id, control_id)
             )
-        """
-        )
+        """)
 
         # Create file metadata table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS file_metadata (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 data_type TEXT NOT NULL,
@@ -179,12 +164,10 @@ class DatabaseManager:
                 version TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        """
-        )
+        """)
 
         # Create processing metadata table
-        cursor.execute(
-            """
+        cursor.execute("""
             CREATE TABLE IF NOT EXISTS processing_metadata (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 processing_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -197,8 +180,7 @@ class DatabaseManager:
                 total_question_control_mappings INTEGER,
                 processing_status TEXT DEFAULT 'completed'
             )
-        """
-        )
+        """)
 
         conn.commit()
         logger.info("Database tables created successfully")
@@ -268,6 +250,335 @@ class DatabaseManager:
             logger.error(f"Error inserting data into {table_name}: {e}")
             raise
 
+    def create_entity_indexes(self) -> None:
+        """
+        Index the entity tables for keyset pagination and filtered counts in the database service.
+
+        ``insert_data`` replaces each table, dropping any index on it, so this
+        must run after the entity tables are populated.
+        """
+        indexes = {
+            "controls": [
+                "CREATE INDEX IF NOT EXISTS idx_controls_function ON controls (security_function, control_id)",
+            ],
+            "definitions": [
+                "CREATE INDEX IF NOT EXISTS idx_definitions_term ON definitions (term, definition_id)",
+                "CREATE INDEX IF NOT EXISTS idx_definitions_category ON definitions (category, term, definition_id)",
+            ],
+        }
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            existing_tables = {row[0] for row in cursor.fetchall()}
+            for table_name, statements in indexes.items():
+                if table_name not in existing_tables:
+                    continue
+                for statement in statements:
+                    cursor.execute(statement)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error indexing entity tables: {e}")
+            raise
+
+    def create_search_index(self) -> None:
+        """
+        Build the FTS5 full-text search index over risks, controls and definitions.
+
+        The index is a single ``search_index`` virtual table so the database service
+        can rank matches across all entity types with one BM25 query. It must be
+        rebuilt after the entity tables are populated.
+        """
+        logger.info("Building full-text search index")
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("DROP TABLE IF EXISTS search_index")
+            cursor.execute("""
+                CREATE VIRTUAL TABLE search_index USING fts5(
+                    entity_type UNINDEXED,
+                    entity_id,
+                    title,
+                    description,
+                    extra,
+                    tokenize = 'porter unicode61',
+                    prefix = '2 3'
+                )
+            """)
+
+            sources = {
+                "risks": ("SELECT 'risk', risk_id, risk_title, COALESCE(risk_description, ''), '' FROM risks"),
+                "controls": (
+                    "SELECT 'control', control_id, control_title, COALESCE(control_description, ''), "
+                    "COALESCE(security_function, '') FROM controls"
+                ),
+                "definitions": (
+                    "SELECT 'definition', definition_id, term, COALESCE(description, ''), "
+                    "COALESCE(category, '') FROM definitions"
+                ),
+            }
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            existing_tables = {row[0] for row in cursor.fetchall()}
+
+            for table_name, select_sql in sources.items():
+                if table_name not in existing_tables:
+                    logger.warning(f"Table {table_name} not found, skipping in search index")
+                    continue
+                cursor.execute(
+                    "INSERT INTO search_index (entity_type, entity_id, title, description, extra) " + select_sql
+                )
+
+            cursor.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+            conn.commit()
+
+            cursor.execute("SELECT COUNT(*) FROM search_index")
+            logger.info(f"Search index built with {cursor.fetchone()[0]} entries")
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error building search index: {e}")
+            raise
+
+    def create_coverage_index(self) -> None:
+        """
+        Precompute risk coverage multiplicity and per-control sole coverage.
+
+        ``risk_coverage`` holds, for every risk, how many controls map to it and
+        (when exactly one does) that sole control. ``control_impact`` holds, for
+        every control, how many risks it maps and for how many of them it is the
+        only control. Both are indexed so the database service can answer
+        "single point of failure" questions without scanning the mapping table.
+        Must be rebuilt after the entity and mapping tables are populated.
+        """
+        logger.info("Building coverage index")
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("DROP TABLE IF EXISTS risk_coverage")
+            cursor.execute("DROP TABLE IF EXISTS control_impact")
+            cursor.execute("""
+                CREATE TABLE risk_coverage (
+                    risk_id TEXT PRIMARY KEY,
+                    control_count INTEGER NOT NULL,
+                    sole_control_id TEXT
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE control_impact (
+                    control_id TEXT PRIMARY KEY,
+                    risk_count INTEGER NOT NULL,
+                    sole_risk_count INTEGER NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO risk_coverage (risk_id, control_count, sole_control_id)
+                SELECT r.risk_id, COUNT(DISTINCT c.control_id),
+                       CASE WHEN COUNT(DISTINCT c.control_id) = 1 THEN MIN(c.control_id) END
+                FROM risks r
+                LEFT JOIN risk_control_mapping m ON m.risk_id = r.risk_id
+                LEFT JOIN controls c ON c.control_id = m.control_id
+                GROUP BY r.risk_id
+            """)
+            cursor.execute("""
+                INSERT INTO control_impact (control_id, risk_count, sole_risk_count)
+                SELECT c.control_id, COUNT(DISTINCT rc.risk_id),
+                       COUNT(DISTINCT CASE WHEN rc.control_count = 1 THEN rc.risk_id END)
+                FROM controls c
+                LEFT JOIN risk_control_mapping m ON m.control_id = c.control_id
+                LEFT JOIN risk_coverage rc ON rc.risk_id = m.risk_id
+                GROUP BY c.control_id
+            """)
+
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_risk_coverage_count ON risk_coverage (control_count, risk_id)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_control_impact_sole "
+                "ON control_impact (sole_risk_count DESC, control_id)"
+            )
+            # Control -> risks lookups for /api/control/{id}/impact
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_mapping_control ON risk_control_mapping (control_id, risk_id)"
+            )
+            conn.commit()
+
+            cursor.execute("SELECT COUNT(*) FROM risk_coverage WHERE control_count = 1")
+            logger.info(f"Coverage index built: {cursor.fetchone()[0]} risks covered by a single control")
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error building coverage index: {e}")
+            raise
+
+    def _drop_table(self, table_name: str) -> None:
+        """Drop a derived table, so a build without its data does not serve one left by a previous build."""
+        conn = self._get_connection()
+        try:
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+            conn.commit()
+            logger.info(f"No data for {table_name}; dropped any previous table")
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error dropping {table_name}: {e}")
+            raise
+
+    def insert_entity_metrics(self, metrics_df: Optional[pd.DataFrame]) -> None:
+        """
+        Store per-entity centrality scores in ``entity_metrics`` and index them for ranking.
+
+        Each ranked metric gets an (entity_type, metric DESC, entity_id) index so the
+        database service can serve sorted rankings without a full sort.
+
+        Args:
+            metrics_df: DataFrame from ``processors.graph_metrics.compute_entity_metrics``; when None or
+                empty, the table is dropped
+        """
+        if metrics_df is None or metrics_df.empty:
+            self._drop_table("entity_metrics")
+            return
+        self.insert_data("entity_metrics", metrics_df)
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_entity_metrics_id ON entity_metrics (entity_type, entity_id)"
+            )
+            for metric in ("degree", "degree_centrality", "pagerank", "eigenvector", "betweenness"):
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_entity_metrics_{metric} "
+                    f"ON entity_metrics (entity_type, {metric} DESC, entity_id)"
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error indexing entity metrics: {e}")
+            raise
+
+    def insert_term_occurrences(self, occurrences_df: Optional[pd.DataFrame]) -> None:
+        """
+        Store definition term offsets in ``term_occurrences``, indexed by entity.
+
+        Args:
+            occurrences_df: DataFrame from ``processors.term_index.compute_term_occurrences``; when None
+                or empty, the table is dropped
+        """
+        if occurrences_df is None or occurrences_df.empty:
+            self._drop_table("term_occurrences")
+            return
+        self.insert_data("term_occurrences", occurrences_df)
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_term_occurrences_entity "
+                "ON term_occurrences (entity_type, entity_id, field, start)"
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error indexing term occurrences: {e}")
+            raise
+
+    def insert_similar_entities(self, similar_df: Optional[pd.DataFrame]) -> None:
+        """
+        Store precomputed TF-IDF neighbours in ``similar_entities``, indexed for per-entity lookup.
+
+        Args:
+            similar_df: DataFrame from ``processors.similarity.compute_similar_entities``; when None or
+                empty, the table is dropped
+        """
+        if similar_df is None or similar_df.empty:
+            self._drop_table("similar_entities")
+            return
+        self.insert_data("similar_entities", similar_df)
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_similar_entities_entity "
+                "ON similar_entities (entity_type, entity_id, score DESC)"
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error indexing similar entities: {e}")
+            raise
+
+    def insert_trigram_index(self, terms_df: Optional[pd.DataFrame], trigrams_df: Optional[pd.DataFrame]) -> None:
+        """
+        Store the search vocabulary in ``search_terms`` and its trigram postings in ``search_trigrams``.
+
+        Args:
+            terms_df: Vocabulary from ``processors.trigram_index.compute_trigram_index``
+            trigrams_df: Trigram postings from the same call
+
+        Without a vocabulary both tables are dropped, so fuzzy search is reported
+        as unavailable rather than served from a previous build's words.
+        """
+        if terms_df is None or terms_df.empty or trigrams_df is None or trigrams_df.empty:
+            self._drop_table("search_terms")
+            self._drop_table("search_trigrams")
+            return
+        self.insert_data("search_terms", terms_df)
+        self.insert_data("search_trigrams", trigrams_df)
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_search_terms_id ON search_terms (term_id)")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_trigrams_trigram ON search_trigrams (trigram, term_id)"
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error indexing search trigrams: {e}")
+            raise
+
+    def insert_near_duplicates(self, duplicates_df: Optional[pd.DataFrame]) -> None:
+        """
+        Store near-duplicate clusters in ``near_duplicates``, indexed by entity and cluster.
+
+        The table is created even when there are no clusters, so an empty result
+        can be told apart from a build that did not run the check.
+
+        Args:
+            duplicates_df: DataFrame from ``processors.near_duplicates.compute_near_duplicates``
+        """
+        self.insert_data("near_duplicates", duplicates_df)
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            if duplicates_df is None or duplicates_df.empty:
+                # Clear clusters left by a previous build into the same file
+                cursor.execute("DROP TABLE IF EXISTS near_duplicates")
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS near_duplicates ("
+                "entity_type TEXT, entity_id TEXT, cluster_id TEXT, canonical_id TEXT, "
+                "similarity REAL, cluster_size INTEGER)"
+            )
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_near_duplicates_entity "
+                "ON near_duplicates (entity_type, entity_id)"
+            )
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_near_duplicates_cluster ON near_duplicates (cluster_id)")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error indexing near duplicates: {e}")
+            raise
+
     def insert_file_metadata(
         self,
         data_type: str,
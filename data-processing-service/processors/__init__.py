@@ -11,4 +11,9 @@ __all__ = [
     "StandardExtractor",
     "DataValidator",
     "MetadataCollector",
+    "compute_entity_metrics",
+    "compute_near_duplicates",
+    "compute_similar_entities",
+    "compute_term_occurrences",
+    "compute_trigram_index",
 ]
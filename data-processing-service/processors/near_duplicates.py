@@ -0,0 +1,265 @@
+"""
+Near Duplicates
+
+MinHash signatures and locality-sensitive hashing to find controls and
+definitions whose text is nearly identical under different ids, e.g. a
+control copied across framework sheets or a reworded definition. Clusters
+are stored in ``near_duplicates`` and summarized in the build report.
+"""
+
+import logging
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 16
+# Minimum word-shingle Jaccard similarity for two entries to count as near duplicates
+THRESHOLD = 0.8
+SHINGLE_SIZE = 2
+# Buckets larger than this are verified against their first member only, keeping candidate pairs linear
+MAX_BUCKET_PAIRS = 50
+# Hash values computed per chunk (shingles x permutations)
+CHUNK_VALUES = 8_000_000
+RANDOM_SEED = 42
+
+DUPLICATE_COLUMNS = ["entity_type", "entity_id", "cluster_id", "canonical_id", "similarity", "cluster_size"]
+
+# entity_type -> (id column, text columns)
+ENTITY_TEXT = {
+    "control": ("control_id", ["control_title", "control_description"]),
+    "definition": ("definition_id", ["title", "description"]),
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed word ``size``-grams of ``text`` (its words, if it has fewer than ``size``)."""
+    words = TOKEN_PATTERN.findall(text.lower())
+    if len(words) < size:
+        grams = words
+    else:
+        grams = [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+    # crc32 rather than hash(): signatures must not depend on PYTHONHASHSEED
+    return {zlib.crc32(gram.encode()) for gram in grams}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash_signatures(
+    shingle_sets: Sequence[Set[int]], num_perm: int = NUM_PERM, seed: int = RANDOM_SEED
+) -> np.ndarray:
+    """
+    MinHash signature matrix, one row per set.
+
+    Permutation ``i`` is the multiply-shift hash ``(a_i * x + b_i) >> 32`` in
+    wrapping 64-bit arithmetic. Hashes for the whole corpus are computed a
+    chunk of sets at a time and reduced per set with ``np.minimum.reduceat``.
+    Empty sets get an all-ones row, which matches nothing else.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    n = len(shingle_sets)
+    signatures = np.full((n, num_perm), np.iinfo(np.uint32).max, dtype=np.uint64)
+    sizes = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+    values = np.fromiter((x for s in shingle_sets for x in s), dtype=np.uint64, count=int(sizes.sum()))
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+    # Chunks of whole sets, each holding at most CHUNK_VALUES hash values
+    per_chunk = max(1, CHUNK_VALUES // num_perm)
+    start = 0
+    while start < n:
+        end = int(np.searchsorted(offsets, offsets[start] + per_chunk, side="right")) - 1
+        end = min(n, max(end, start + 1))
+        members = np.flatnonzero(sizes[start:end]) + start
+        if len(members):
+            chunk = values[offsets[start] : offsets[end]]
+            with np.errstate(over="ignore"):
+                hashed = (chunk[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)
+            signatures[members] = np.minimum.reduceat(hashed, offsets[members] - offsets[start], axis=0)
+        start = end
+    return signatures
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int = BANDS) -> Set[Tuple[int, int]]:
+    """
+    Row pairs sharing at least one LSH band.
+
+    Each band of ``rows = num_perm // bands`` signature values is hashed to one
+    key; rows with equal keys share a bucket. Pairs with Jaccard similarity
+    ``s`` become candidates with probability ``1 - (1 - s**rows)**bands``.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    weights = np.random.default_rng(RANDOM_SEED + 1).integers(1, 2**63, size=rows, dtype=np.uint64) | np.uint64(1)
+    pairs: Set[Tuple[int, int]] = set()
+    for band in range(bands):
+        with np.errstate(over="ignore"):
+            keys = (signatures[:, band * rows : (band + 1) * rows] * weights).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) < 2:
+                continue
+            if len(bucket) * (len(bucket) - 1) // 2 <= MAX_BUCKET_PAIRS:
+                pairs.update((int(x), int(y)) for i, x in enumerate(bucket) for y in bucket[i + 1 :])
+            else:
+                first = int(bucket[0])
+                pairs.update((first, int(y)) for y in bucket[1:])
+    return {(min(x, y), max(x, y)) for x, y in pairs}
+
+
+def _find(parent: List[int], node: int) -> int:
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+def find_near_duplicates(
+    ids: Sequence[str],
+    texts: Sequence[str],
+    threshold: float = THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+) -> List[List[Tuple[str, float]]]:
+    """
+    Cluster ``texts`` whose word-shingle Jaccard similarity reaches ``threshold``.
+
+    LSH candidates are verified with the exact Jaccard similarity, and verified
+    pairs are joined with union-find, so clusters are connected components.
+    Work grows with the number of texts plus candidate pairs, not with all pairs.
+
+    Returns:
+        Clusters of two or more ``(id, similarity to the cluster's canonical id)``
+        pairs; the canonical id (smallest) comes first with similarity 1.0
+    """
+    if len(ids) < 2:
+        return []
+    shingle_sets = [shingles(text) for text in texts]
+    signatures = minhash_signatures(shingle_sets, num_perm)
+
+    parent = list(range(len(ids)))
+    for x, y in candidate_pairs(signatures, bands):
+        if shingle_sets[x] and jaccard(shingle_sets[x], shingle_sets[y]) >= threshold:
+            parent[_find(parent, x)] = _find(parent, y)
+
+    members: Dict[int, List[int]] = {}
+    for node in range(len(ids)):
+        members.setdefault(_find(parent, node), []).append(node)
+
+    clusters = []
+    for nodes in members.values():
+        if len(nodes) < 2:
+            continue
+        nodes.sort(key=lambda node: ids[node])
+        canonical = shingle_sets[nodes[0]]
+        clusters.append([(ids[node], round(jaccard(canonical, shingle_sets[node]), 4)) for node in nodes])
+    clusters.sort(key=lambda cluster: cluster[0][0])
+    return clusters
+
+
+def _entity_texts(df: pd.DataFrame, entity_type: str) -> Tuple[List[str], List[str]]:
+    id_column, text_columns = ENTITY_TEXT[entity_type]
+    columns = [column for column in text_columns if column in df.columns]
+    ids, texts = [], []
+    for record in df.drop_duplicates(subset=[id_column]).to_dict("records"):
+        if pd.isna(record[id_column]):
+            continue
+        ids.append(str(record[id_column]))
+        texts.append(" ".join(str(record[column]) for column in columns if isinstance(record[column], str)))
+    return ids, texts
+
+
+def compute_near_duplicates(
+    controls_df: Optional[pd.DataFrame],
+    definitions_df: Optional[pd.DataFrame],
+    threshold: float = THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+) -> pd.DataFrame:
+    """
+    Near-duplicate clusters among controls and among definitions.
+
+    Columns:
+        entity_type, entity_id: ``control`` or ``definition`` and its id
+        cluster_id: ``<entity_type>-<n>``, shared by every member of a cluster
+        canonical_id: The cluster's smallest id, which the others duplicate
+        similarity: Word-shingle Jaccard similarity to the canonical entry
+        cluster_size: Number of entries in the cluster
+
+    Args:
+        controls_df: Controls with ``control_id``, ``control_title`` and ``control_description`` columns
+        definitions_df: Definitions with ``definition_id``, ``title`` and ``description`` columns
+        threshold: Minimum Jaccard similarity
+        num_perm: MinHash permutations
+        bands: LSH bands (``num_perm`` must be divisible by it)
+
+    Returns:
+        DataFrame with one row per entity in a cluster
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+    rows = []
+    for entity_type, df in (("control", controls_df), ("definition", definitions_df)):
+        if df is None or df.empty or ENTITY_TEXT[entity_type][0] not in df.columns:
+            continue
+        ids, texts = _entity_texts(df, entity_type)
+        clusters = find_near_duplicates(ids, texts, threshold, num_perm, bands)
+        logger.info(f"Found {len(clusters)} near-duplicate {entity_type} clusters")
+        for number, cluster in enumerate(clusters, start=1):
+            canonical_id = cluster[0][0]
+            for entity_id, similarity in cluster:
+                rows.append((entity_type, entity_id, f"{entity_type}-{number}", canonical_id, similarity, len(cluster)))
+    return pd.DataFrame(rows, columns=DUPLICATE_COLUMNS)
+
+
+def generate_near_duplicate_report(duplicates_df: Optional[pd.DataFrame], max_clusters: int = 10) -> str:
+    """
+    Human-readable summary of near-duplicate clusters for the build report.
+
+    Args:
+        duplicates_df: DataFrame from :func:`compute_near_duplicates`
+        max_clusters: Largest clusters listed per entity type
+
+    Returns:
+        Formatted report string
+    """
+    report = ["=" * 60, "NEAR-DUPLICATE REPORT", "=" * 60]
+    if duplicates_df is None or duplicates_df.empty:
+        report.append("No near-duplicate controls or definitions found")
+        return "\n".join(report)
+
+    for entity_type, group in duplicates_df.groupby("entity_type", sort=True):
+        clusters = group.groupby("cluster_id")
+        report.append(f"{entity_type.upper()}S: {clusters.ngroups} clusters, {len(group)} entries")
+        largest = group.drop_duplicates("cluster_id").sort_values(
+            ["cluster_size", "cluster_id"], ascending=[False, True]
+        )
+        for cluster_id in largest["cluster_id"].head(max_clusters):
+            members = clusters.get_group(cluster_id)
+            duplicates = [
+                f"{row.entity_id} ({row.similarity:.2f})"
+                for row in members.itertuples()
+                if row.entity_id != row.canonical_id
+            ]
+            report.append(f"  {members['canonical_id'].iloc[0]} ~ {', '.join(duplicates)}")
+        if clusters.ngroups > max_clusters:
+            report.append(f"  ... and {clusters.ngroups - max_clusters} more clusters")
+
+    report.append("=" * 60)
+    return "\n".join(report)
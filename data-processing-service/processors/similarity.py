@@ -0,0 +1,214 @@
+"""
+Similarity
+
+TF-IDF "related entities" for risks, controls and definitions: for every
+entity, its most textually similar entities of each type, computed once per
+build and stored in ``similar_entities``.
+"""
+
+import logging
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Neighbours kept per entity and neighbour type
+TOP_K = 10
+# Upper bound on the partial products summed per batch of query rows
+BATCH_PRODUCTS = 4_000_000
+# Terms in more than this fraction of entities carry little signal and are dropped
+MAX_DOCUMENT_FREQUENCY = 0.5
+MIN_SCORE = 0.05
+
+SIMILAR_COLUMNS = ["entity_type", "entity_id", "similar_type", "similar_id", "score", "rank"]
+
+# entity_type -> (id column, text columns)
+ENTITY_TEXT = {
+    "risk": ("risk_id", ["risk_title", "risk_description"]),
+    "control": ("control_id", ["control_title", "control_description"]),
+    "definition": ("definition_id", ["title", "description"]),
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset("""
+    a an and are as at be by can for from has have in into is it its may of on or such that the their
+    this to was were which will with within without not than then there these those any all each other
+    """.split())
+
+
+def _tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and token not in STOP_WORDS]
+
+
+def _documents(
+    risks_df: Optional[pd.DataFrame], controls_df: Optional[pd.DataFrame], definitions_df: Optional[pd.DataFrame]
+) -> Tuple[List[str], List[str], List[List[str]]]:
+    """Entity types, ids and token lists, in input order."""
+    types, ids, tokens = [], [], []
+    for entity_type, df in (("risk", risks_df), ("control", controls_df), ("definition", definitions_df)):
+        id_column, text_columns = ENTITY_TEXT[entity_type]
+        if df is None or df.empty or id_column not in df.columns:
+            continue
+        columns = [column for column in text_columns if column in df.columns]
+        for record in df.drop_duplicates(subset=[id_column]).to_dict("records"):
+            if pd.isna(record[id_column]):
+                continue
+            text = " ".join(str(record[column]) for column in columns if isinstance(record[column], str))
+            types.append(entity_type)
+            ids.append(str(record[id_column]))
+            tokens.append(_tokenize(text))
+    return types, ids, tokens
+
+
+def tfidf_matrix(tokens: List[List[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    L2-normalized TF-IDF rows in CSR form.
+
+    Term frequency is sublinear (``1 + log tf``) and IDF is smoothed. Terms in a
+    single document cannot make two documents similar, and terms in most
+    documents barely separate them, so both are left out of the vocabulary.
+
+    Returns:
+        ``(indptr, indices, data, vocabulary size)``
+    """
+    n = len(tokens)
+    doc_ids = np.repeat(np.arange(n), [len(doc) for doc in tokens])
+    words = [word for doc in tokens for word in doc]
+    if not words:
+        return np.zeros(n + 1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), 0
+
+    vocabulary, term_ids = np.unique(np.array(words, dtype=object), return_inverse=True)
+    # Term counts per (document, term) pair
+    pairs, counts = np.unique(doc_ids * len(vocabulary) + term_ids, return_counts=True)
+    rows, terms = pairs // len(vocabulary), pairs % len(vocabulary)
+
+    document_frequency = np.bincount(terms, minlength=len(vocabulary))
+    keep = (document_frequency > 1) & (document_frequency <= max(2, MAX_DOCUMENT_FREQUENCY * n))
+    remap = np.cumsum(keep) - 1
+    in_vocabulary = keep[terms]
+    rows, terms, counts = rows[in_vocabulary], remap[terms[in_vocabulary]], counts[in_vocabulary]
+
+    idf = np.log((1 + n) / (1 + document_frequency[keep])) + 1
+    data = (1 + np.log(counts)) * idf[terms]
+    norms = np.sqrt(np.bincount(rows, weights=data**2, minlength=n))
+    data = data / norms[rows]
+
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+    return indptr, terms.astype(np.int64), data, int(keep.sum())
+
+
+def _transpose(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_columns: int):
+    """CSR -> CSC: posting lists of (document, weight) per term."""
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    order = np.argsort(indices, kind="stable")
+    column_ptr = np.concatenate([[0], np.cumsum(np.bincount(indices, minlength=n_columns))])
+    return column_ptr, rows[order], data[order]
+
+
+def _batches(indptr: np.ndarray, indices: np.ndarray, posting_lengths: np.ndarray):
+    """
+    Split the rows into consecutive batches of at most ``BATCH_PRODUCTS`` partial products.
+
+    The dense score block of a batch is also kept within ``BATCH_PRODUCTS`` cells.
+    """
+    n_rows = len(indptr) - 1
+    row_ids = np.repeat(np.arange(n_rows), np.diff(indptr))
+    work = np.bincount(row_ids, weights=posting_lengths[indices], minlength=n_rows)
+    max_rows = max(1, BATCH_PRODUCTS // n_rows)
+    start, total = 0, 0.0
+    for row, row_work in enumerate(work):
+        if row > start and (total + row_work > BATCH_PRODUCTS or row - start >= max_rows):
+            yield start, row
+            start, total = row, 0.0
+        total += row_work
+    if start < n_rows:
+        yield start, n_rows
+
+
+def compute_similar_entities(
+    risks_df: Optional[pd.DataFrame],
+    controls_df: Optional[pd.DataFrame],
+    definitions_df: Optional[pd.DataFrame],
+    top_k: int = TOP_K,
+) -> pd.DataFrame:
+    """
+    Top-k cosine neighbours of every risk, control and definition, per neighbour type.
+
+    Titles and descriptions are vectorized into one sparse TF-IDF matrix ``X``.
+    ``X @ X.T`` is evaluated a batch of rows at a time from the term posting
+    lists: each (row term, posting) pair is one partial product, summed with
+    ``np.bincount``. Only the batch's dense score block is ever materialized.
+
+    Columns:
+        entity_type, entity_id: The entity
+        similar_type, similar_id: A similar entity (never the entity itself)
+        score: Cosine similarity of the two TF-IDF vectors
+        rank: 1 for the most similar entity of ``similar_type``
+
+    Args:
+        risks_df: Risks with ``risk_id``, ``risk_title`` and ``risk_description`` columns
+        controls_df: Controls with ``control_id``, ``control_title`` and ``control_description`` columns
+        definitions_df: Definitions with ``definition_id``, ``title`` and ``description`` columns
+        top_k: Neighbours kept per entity and neighbour type
+
+    Returns:
+        DataFrame with up to ``top_k`` rows per entity and neighbour type
+    """
+    types, ids, tokens = _documents(risks_df, controls_df, definitions_df)
+    n = len(ids)
+    if n < 2:
+        return pd.DataFrame(columns=SIMILAR_COLUMNS)
+
+    indptr, indices, data, n_terms = tfidf_matrix(tokens)
+    logger.info(f"Computing similar entities for {n} entities over {n_terms} terms")
+    column_ptr, postings, posting_weights = _transpose(indptr, indices, data, n_terms)
+    posting_lengths = np.diff(column_ptr)
+
+    type_codes = np.array([list(ENTITY_TEXT).index(entity_type) for entity_type in types])
+    type_columns = [np.flatnonzero(type_codes == code) for code in range(len(ENTITY_TEXT))]
+
+    rows = []
+    for start, end in _batches(indptr, indices, posting_lengths):
+        batch = end - start
+        # One partial product per (row term, document containing that term)
+        entries = np.arange(indptr[start], indptr[end])
+        entry_rows = np.repeat(np.arange(batch), np.diff(indptr[start : end + 1]))
+        lengths = posting_lengths[indices[entries]]
+        total = int(lengths.sum())
+        if total == 0:
+            continue
+        offsets = np.repeat(column_ptr[indices[entries]] - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        scores = np.bincount(
+            np.repeat(entry_rows, lengths) * n + postings[offsets],
+            weights=np.repeat(data[entries], lengths) * posting_weights[offsets],
+            minlength=batch * n,
+        ).reshape(batch, n)
+        scores[np.arange(batch), np.arange(start, end)] = 0
+
+        for code, columns in enumerate(type_columns):
+            if len(columns) == 0:
+                continue
+            block = scores[:, columns]
+            k = min(top_k, len(columns))
+            if k < len(columns):
+                top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            else:
+                top = np.tile(np.arange(k), (batch, 1))
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.lexsort((columns[top], -top_scores), axis=1)
+            top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+            similar_type = list(ENTITY_TEXT)[code]
+            for offset in range(batch):
+                entity_type, entity_id = types[start + offset], ids[start + offset]
+                rank = 0
+                for column, score in zip(columns[top[offset]], top_scores[offset]):
+                    if score < MIN_SCORE:
+                        break
+                    rank += 1
+                    rows.append((entity_type, entity_id, similar_type, ids[column], float(score), rank))
+
+    logger.info(f"Stored {len(rows)} similar entity pairs")
+    return pd.DataFrame(rows, columns=SIMILAR_COLUMNS)
@@ -0,0 +1,201 @@
+"""
+Term Index
+
+Finds which definition terms occur in each risk and control title and
+description, with character offsets, so clients can highlight terms
+without pattern matching. Stored in ``term_occurrences``.
+"""
+
+import logging
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OCCURRENCE_COLUMNS = ["entity_type", "entity_id", "field", "start", "end", "term", "definition_id"]
+
+# entity_type -> (DataFrame id column, {field: text column})
+ENTITY_FIELDS = {
+    "risk": ("risk_id", {"title": "risk_title", "description": "risk_description"}),
+    "control": ("control_id", {"title": "control_title", "description": "control_description"}),
+}
+
+
+class TermAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
+
+    One pass over a text reports every pattern occurrence, however many
+    patterns there are.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, Any]]):
+        """
+        Args:
+            patterns: ``(pattern, payload)`` pairs; the payload is reported with each match
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (pattern length, payload) for every pattern ending at the state, including via fail links
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        for pattern, payload in patterns:
+            if pattern:
+                self._add(pattern, payload)
+        self._link()
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((len(pattern), payload))
+
+    def _link(self) -> None:
+        """Breadth-first construction of the failure links."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                # Depth-one states fail back to the root, not to themselves
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield ``(start, end, payload)`` for every pattern occurrence in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in out[state]:
+                yield position + 1 - length, position + 1, payload
+
+
+def _fold(text: str) -> str:
+    """Lowercase ``text`` without changing its length, so offsets still index the original."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def _variants(term: str) -> List[str]:
+    """The lowercase term plus its punctuation-free and dash-as-space spellings."""
+    lowered = term.lower().strip()
+    normalized = re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", lowered)).strip()
+    dashes = re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", lowered.replace("-", " "))).strip()
+    return [variant for variant in dict.fromkeys([lowered, normalized, dashes]) if len(variant) > 1]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def build_term_automaton(definitions_df: Optional[pd.DataFrame]) -> Optional[TermAutomaton]:
+    """
+    Build the automaton for every definition term and its spelling variants.
+
+    A variant shared by several definitions belongs to the first by definition id.
+    Returns None when there are no terms.
+    """
+    if definitions_df is None or definitions_df.empty or "term" not in definitions_df.columns:
+        return None
+    definitions = definitions_df.dropna(subset=["term"])
+    if "definition_id" in definitions.columns:
+        definitions = definitions.sort_values("definition_id")
+    patterns: Dict[str, Tuple[str, Optional[str]]] = {}
+    for row in definitions.itertuples(index=False):
+        term = str(row.term).strip()
+        definition_id = getattr(row, "definition_id", None)
+        for variant in _variants(term):
+            patterns.setdefault(variant, (term, None if pd.isna(definition_id) else str(definition_id)))
+    if not patterns:
+        return None
+    return TermAutomaton(list(patterns.items()))
+
+
+def find_terms(automaton: TermAutomaton, text: str) -> List[Tuple[int, int, str, Optional[str]]]:
+    """
+    Whole-word, case-insensitive term occurrences in ``text``.
+
+    Overlapping matches resolve leftmost-longest, so "machine learning model"
+    wins over "machine learning" starting at the same place.
+
+    Returns:
+        Non-overlapping ``(start, end, term, definition_id)`` tuples in text order
+    """
+    if not text:
+        return []
+    matches = []
+    for start, end, (term, definition_id) in automaton.find_all(_fold(text)):
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end < len(text) and _is_word_char(text[end]):
+            continue
+        matches.append((start, end, term, definition_id))
+
+    matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+    selected, covered_to = [], 0
+    for match in matches:
+        if match[0] >= covered_to:
+            selected.append(match)
+            covered_to = match[1]
+    return selected
+
+
+def compute_term_occurrences(
+    definitions_df: Optional[pd.DataFrame],
+    risks_df: Optional[pd.DataFrame],
+    controls_df: Optional[pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Locate definition terms in every risk and control title and description.
+
+    Columns:
+        entity_type, entity_id: ``risk`` or ``control`` and its id
+        field: ``title`` or ``description``
+        start, end: Character offsets of the occurrence in the field (end exclusive)
+        term, definition_id: The definition the occurrence refers to
+
+    Args:
+        definitions_df: Definitions with ``term`` and ``definition_id`` columns
+        risks_df: Risks with ``risk_id``, ``risk_title`` and ``risk_description`` columns
+        controls_df: Controls with ``control_id``, ``control_title`` and ``control_description`` columns
+
+    Returns:
+        DataFrame with one row per occurrence
+    """
+    automaton = build_term_automaton(definitions_df)
+    if automaton is None:
+        return pd.DataFrame(columns=OCCURRENCE_COLUMNS)
+
+    rows = []
+    for entity_type, df in (("risk", risks_df), ("control", controls_df)):
+        id_column, fields = ENTITY_FIELDS[entity_type]
+        if df is None or df.empty or id_column not in df.columns:
+            continue
+        for record in df.to_dict("records"):
+            for field, column in fields.items():
+                text = record.get(column)
+                if not isinstance(text, str):
+                    continue
+                for start, end, term, definition_id in find_terms(automaton, text):
+                    rows.append((entity_type, str(record[id_column]), field, start, end, term, definition_id))
+
+    logger.info(f"Found {len(rows)} definition term occurrences")
+    return pd.DataFrame(rows, columns=OCCURRENCE_COLUMNS)
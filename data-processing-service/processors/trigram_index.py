@@ -0,0 +1,78 @@
+"""
+Trigram Index
+
+Word vocabulary of risk, control and definition text with a trigram posting
+list per word, so the database service can map a misspelled query word to
+the vocabulary words that share most of its trigrams ("adverserial" ->
+"adversarial") without scanning the entity tables. Stored in
+``search_terms`` and ``search_trigrams``.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Words shorter than this have too few trigrams to match reliably and are left to prefix search
+MIN_WORD_LENGTH = 3
+
+TERM_COLUMNS = ["term_id", "term", "trigram_count", "frequency"]
+TRIGRAM_COLUMNS = ["trigram", "term_id"]
+
+ENTITY_TEXT = {
+    "risk": ["risk_title", "risk_description"],
+    "control": ["control_title", "control_description"],
+    "definition": ["term", "title", "description"],
+}
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def word_trigrams(word: str) -> Set[str]:
+    """
+    Trigrams of a lowercase word padded with two leading spaces and one trailing
+    space (as PostgreSQL's pg_trgm does), so word starts weigh more than endings.
+    """
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in WORD_PATTERN.findall(text.lower()) if len(word) >= MIN_WORD_LENGTH and not word.isdigit()]
+
+
+def compute_trigram_index(
+    risks_df: Optional[pd.DataFrame],
+    controls_df: Optional[pd.DataFrame],
+    definitions_df: Optional[pd.DataFrame],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Vocabulary and trigram postings over every title, description and definition term.
+
+    Returns:
+        ``(terms, trigrams)``: ``terms`` has one row per distinct word (``term_id``,
+        ``term``, ``trigram_count``, ``frequency`` across all texts) and ``trigrams``
+        one row per (``trigram``, ``term_id``) pair
+    """
+    frequency: Dict[str, int] = {}
+    for entity_type, df in (("risk", risks_df), ("control", controls_df), ("definition", definitions_df)):
+        if df is None or df.empty:
+            continue
+        columns = [column for column in ENTITY_TEXT[entity_type] if column in df.columns]
+        for column in columns:
+            for text in df[column]:
+                if isinstance(text, str):
+                    for word in _words(text):
+                        frequency[word] = frequency.get(word, 0) + 1
+
+    terms, trigrams = [], []
+    for term_id, term in enumerate(sorted(frequency), start=1):
+        grams = word_trigrams(term)
+        terms.append((term_id, term, len(grams), frequency[term]))
+        trigrams.extend((gram, term_id) for gram in sorted(grams))
+
+    logger.info(f"Indexed {len(terms)} search terms with {len(trigrams)} trigram postings")
+    return pd.DataFrame(terms, columns=TERM_COLUMNS), pd.DataFrame(trigrams, columns=TRIGRAM_COLUMNS)
@@ -12,6 +12,8 @@ from unittest.mock import patch
 import pytest
 
 from database_manager import DatabaseManager
+from processors.graph_metrics import compute_entity_metrics
+from processors.term_index import compute_term_occurrences
 
 
 class TestDatabaseManager:
@@ -325,3 +327,266 @@ class TestDatabaseManager:
         count = cursor.fetchone()[0]
 
         assert count == len(sample_risks_data)
+
+    def test_create_search_index(self, database_manager):
+        """Test FTS5 search index is built over all entity types."""
+        database_manager.create_tables()
+        database_manager.insert_data(
+            "risks",
+            pd.DataFrame(
+                {
+                    "risk_id": ["R.AIR.001"],
+                    "risk_title": ["Adversarial Attacks"],
+                    "risk_description": ["Inputs crafted to fool the model"],
+                }
+            ),
+        )
+        database_manager.insert_data(
+            "controls",
+            pd.DataFrame(
+                {
+                    "control_id": ["C.AIGPC.1"],
+                    "control_title": ["Adversarial Testing"],
+                    "control_description": ["Red-team models"],
+                    "security_function": ["Detect"],
+                }
+            ),
+        )
+
+        database_manager.create_search_index()
+
+        conn = database_manager._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT entity_type, entity_id FROM search_index WHERE search_index MATCH ? ORDER BY bm25(search_index)",
+            ('"advers"*',),
+        )
+        rows = [tuple(row) for row in cursor.fetchall()]
+
+        assert ("risk", "R.AIR.001") in rows
+        assert ("control", "C.AIGPC.1") in rows
+
+    def test_create_search_index_is_rebuilt(self, database_manager):
+        """Test rebuilding the search index replaces previous entries."""
+        database_manager.create_tables()
+        database_manager.create_search_index()
+        database_manager.create_search_index()
+
+        assert database_manager.get_table_count("search_index") == 0
+
+    def test_populate_database_indexes_entity_tables(self, data_processor):
+        """Test the keyset pagination indexes survive the entity tables being replaced."""
+        data_processor.risks_df = pd.DataFrame(
+            {"risk_id": ["R1"], "risk_title": ["One"], "risk_description": ["First risk"]}
+        )
+        data_processor.controls_df = pd.DataFrame(
+            {
+                "control_id": ["C1"],
+                "control_title": ["First"],
+                "control_description": ["First control"],
+                "security_function": ["Detect"],
+            }
+        )
+        data_processor.definitions_df = pd.DataFrame(
+            {"definition_id": ["D1"], "term": ["Bias"], "description": ["Skewed output"], "category": ["Fairness"]}
+        )
+
+        data_processor.populate_database()
+
+        cursor = data_processor.database_manager._get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+        assert {row[0] for row in cursor.fetchall()} >= {
+            "idx_controls_function",
+            "idx_definitions_term",
+            "idx_definitions_category",
+        }
+        cursor.execute("EXPLAIN QUERY PLAN SELECT control_id FROM controls WHERE security_function = 'Detect'")
+        assert "idx_controls_function" in " ".join(row[-1] for row in cursor.fetchall())
+
+    def test_create_coverage_index(self, database_manager):
+        """Test coverage multiplicity and sole-coverage tables are built from the mappings."""
+        database_manager.create_tables()
+        database_manager.insert_data(
+            "risks",
+            pd.DataFrame({"risk_id": ["R1", "R2", "R3"], "risk_title": ["One", "Two", "Three"]}),
+        )
+        database_manager.insert_data(
+            "controls",
+            pd.DataFrame({"control_id": ["C1", "C2"], "control_title": ["First", "Second"]}),
+        )
+        database_manager.insert_data(
+            "risk_control_mapping",
+            pd.DataFrame({"risk_id": ["R1", "R2", "R2"], "control_id": ["C1", "C1", "C2"]}),
+        )
+
+        database_manager.create_coverage_index()
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT risk_id, control_count, sole_control_id FROM risk_coverage ORDER BY risk_id")
+        assert [tuple(row) for row in cursor.fetchall()] == [("R1", 1, "C1"), ("R2", 2, None), ("R3", 0, None)]
+        cursor.execute("SELECT control_id, risk_count, sole_risk_count FROM control_impact ORDER BY control_id")
+        assert [tuple(row) for row in cursor.fetchall()] == [("C1", 2, 1), ("C2", 1, 0)]
+
+
+    def test_insert_entity_metrics(self, database_manager):
+        """Test centrality scores are stored with per-metric ranking indexes."""
+        metrics = compute_entity_metrics(
+            pd.DataFrame({"risk_id": ["R1", "R2"]}),
+            pd.DataFrame({"control_id": ["C1"]}),
+            pd.DataFrame({"risk_id": ["R1", "R2"], "control_id": ["C1", "C1"]}),
+        )
+
+        database_manager.insert_entity_metrics(metrics)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute(
+            "SELECT entity_id, degree FROM entity_metrics WHERE entity_type = 'control' ORDER BY pagerank DESC"
+        )
+        assert [tuple(row) for row in cursor.fetchall()] == [("C1", 2)]
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'entity_metrics'")
+        indexes = {row[0] for row in cursor.fetchall()}
+        # One ranking index per metric /api/rankings can order by
+        for metric in ("degree", "degree_centrality", "pagerank", "eigenvector", "betweenness"):
+            assert f"idx_entity_metrics_{metric}" in indexes
+        assert "idx_entity_metrics_id" in indexes
+
+    def test_insert_entity_metrics_clears_previous_build(self, database_manager):
+        """Test a build without metrics does not leave the previous build's rankings behind."""
+        database_manager.insert_entity_metrics(
+            compute_entity_metrics(
+                pd.DataFrame({"risk_id": ["R1"]}),
+                pd.DataFrame({"control_id": ["C1"]}),
+                pd.DataFrame({"risk_id": ["R1"], "control_id": ["C1"]}),
+            )
+        )
+
+        database_manager.insert_entity_metrics(None)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = 'entity_metrics'")
+        assert cursor.fetchone() is None
+
+    def test_insert_term_occurrences(self, database_manager):
+        """Test term offsets are stored and indexed by entity."""
+        occurrences = compute_term_occurrences(
+            pd.DataFrame({"definition_id": ["D1"], "term": ["Bias"]}),
+            pd.DataFrame({"risk_id": ["R1"], "risk_title": ["Model bias"], "risk_description": ["Bias in data"]}),
+            None,
+        )
+
+        database_manager.insert_term_occurrences(occurrences)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT field, start, end FROM term_occurrences WHERE entity_id = 'R1' ORDER BY field")
+        assert [tuple(row) for row in cursor.fetchall()] == [("description", 0, 4), ("title", 6, 10)]
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'term_occurrences'")
+        assert [row[0] for row in cursor.fetchall()] == ["idx_term_occurrences_entity"]
+
+    def test_insert_term_occurrences_clears_previous_build(self, database_manager):
+        """Test a build without term offsets does not leave the previous build's offsets behind."""
+        database_manager.insert_term_occurrences(
+            compute_term_occurrences(
+                pd.DataFrame({"definition_id": ["D1"], "term": ["Bias"]}),
+                pd.DataFrame({"risk_id": ["R1"], "risk_title": ["Model bias"], "risk_description": [""]}),
+                None,
+            )
+        )
+
+        database_manager.insert_term_occurrences(pd.DataFrame())
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = 'term_occurrences'")
+        assert cursor.fetchone() is None
+
+    def test_insert_similar_entities(self, database_manager):
+        """Test similar entity pairs are stored with a per-entity index."""
+        similar = pd.DataFrame(
+            {
+                "entity_type": ["risk", "risk"],
+                "entity_id": ["R1", "R1"],
+                "similar_type": ["risk", "control"],
+                "similar_id": ["R2", "C1"],
+                "score": [0.8, 0.4],
+                "rank": [1, 1],
+            }
+        )
+
+        database_manager.insert_similar_entities(similar)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT similar_id FROM similar_entities WHERE entity_id = 'R1' ORDER BY score DESC")
+        assert [row[0] for row in cursor.fetchall()] == ["R2", "C1"]
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'similar_entities'")
+        assert [row[0] for row in cursor.fetchall()] == ["idx_similar_entities_entity"]
+
+    def test_insert_similar_entities_clears_previous_build(self, database_manager):
+        """Test a build without neighbours does not leave the previous build's pairs behind."""
+        database_manager.insert_similar_entities(
+            pd.DataFrame(
+                {
+                    "entity_type": ["risk"],
+                    "entity_id": ["R1"],
+                    "similar_type": ["risk"],
+                    "similar_id": ["R2"],
+                    "score": [0.8],
+                    "rank": [1],
+                }
+            )
+        )
+
+        database_manager.insert_similar_entities(None)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = 'similar_entities'")
+        assert cursor.fetchone() is None
+
+    def test_insert_trigram_index(self, database_manager):
+        """Test the search vocabulary and its trigram postings are stored and indexed."""
+        terms = pd.DataFrame({"term_id": [1], "term": ["red"], "trigram_count": [4], "frequency": [1]})
+        trigrams = pd.DataFrame({"trigram": ["  r", " re", "red", "ed "], "term_id": [1, 1, 1, 1]})
+
+        database_manager.insert_trigram_index(terms, trigrams)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute(
+            "SELECT t.term FROM search_trigrams g JOIN search_terms t ON t.term_id = g.term_id WHERE g.trigram = 'red'"
+        )
+        assert [row[0] for row in cursor.fetchall()] == ["red"]
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'search_trigrams'")
+        assert [row[0] for row in cursor.fetchall()] == ["idx_search_trigrams_trigram"]
+
+    def test_insert_trigram_index_clears_previous_build(self, database_manager):
+        """Test a build without a vocabulary drops both fuzzy search tables."""
+        database_manager.insert_trigram_index(
+            pd.DataFrame({"term_id": [1], "term": ["red"], "trigram_count": [4], "frequency": [1]}),
+            pd.DataFrame({"trigram": ["red"], "term_id": [1]}),
+        )
+
+        database_manager.insert_trigram_index(None, None)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name IN ('search_terms', 'search_trigrams')")
+        assert cursor.fetchall() == []
+
+    def test_insert_near_duplicates(self, database_manager):
+        """Test near-duplicate clusters are stored, and an empty result leaves an empty table."""
+        duplicates = pd.DataFrame(
+            {
+                "entity_type": ["control", "control"],
+                "entity_id": ["C1", "C3"],
+                "cluster_id": ["control-1", "control-1"],
+                "canonical_id": ["C1", "C1"],
+                "similarity": [1.0, 0.9],
+                "cluster_size": [2, 2],
+            }
+        )
+
+        database_manager.insert_near_duplicates(duplicates)
+
+        cursor = database_manager._get_connection().cursor()
+        cursor.execute("SELECT entity_id FROM near_duplicates WHERE cluster_id = 'control-1' ORDER BY entity_id")
+        assert [row[0] for row in cursor.fetchall()] == ["C1", "C3"]
+
+        database_manager.insert_near_duplicates(duplicates.iloc[0:0])
+        cursor.execute("SELECT COUNT(*) FROM near_duplicates")
+        assert cursor.fetchone()[0] == 0
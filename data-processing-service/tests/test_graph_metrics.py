@@ -0,0 +1,60 @@
+"""
+Tests for centrality metrics over the risk-control graph.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processors.graph_metrics import compute_entity_metrics
+
+
+@pytest.fixture
+def path_graph():
+    """R1 - C1 - R2 - C2 - R3, plus the isolated R4 and C3; the R9 mapping has no risk and is ignored."""
+    risks = pd.DataFrame({"risk_id": ["R1", "R2", "R3", "R4"]})
+    controls = pd.DataFrame({"control_id": ["C1", "C2", "C3"]})
+    mappings = pd.DataFrame(
+        {"risk_id": ["R1", "R2", "R2", "R3", "R9", "R1"], "control_id": ["C1", "C1", "C2", "C2", "C1", "C1"]}
+    )
+    metrics = compute_entity_metrics(risks, controls, mappings)
+    return metrics.set_index("entity_id")
+
+
+class TestComputeEntityMetrics:
+    """Degree, PageRank, eigenvector and betweenness scores."""
+
+    def test_rows_and_degree(self, path_graph):
+        assert list(path_graph.index) == ["R1", "R2", "R3", "R4", "C1", "C2", "C3"]
+        assert path_graph.loc["R2", "degree"] == 2
+        assert path_graph.loc["R2", "degree_centrality"] == pytest.approx(2 / 3)
+        assert path_graph.loc["C1", "degree_centrality"] == pytest.approx(2 / 4)
+
+    def test_pagerank_is_a_distribution(self, path_graph):
+        assert path_graph["pagerank"].sum() == pytest.approx(1.0)
+        assert path_graph.loc["R2", "pagerank"] > path_graph.loc["R1", "pagerank"] > path_graph.loc["R4", "pagerank"]
+
+    def test_eigenvector(self, path_graph):
+        assert path_graph["eigenvector"].max() == pytest.approx(1.0)
+        assert path_graph.loc["R2", "eigenvector"] == pytest.approx(1.0)
+        assert path_graph.loc["R4", "eigenvector"] == 0
+
+    def test_betweenness_matches_hand_count(self, path_graph):
+        # 7 nodes -> 15 pairs; C1 lies on 3 shortest paths, R2 on 4, the ends on none
+        assert path_graph.loc["C1", "betweenness"] == pytest.approx(3 / 15)
+        assert path_graph.loc["R2", "betweenness"] == pytest.approx(4 / 15)
+        assert path_graph.loc["R1", "betweenness"] == 0
+
+    def test_sampled_betweenness_tracks_exact(self):
+        rng = np.random.default_rng(3)
+        risks = pd.DataFrame({"risk_id": [f"R{i}" for i in range(60)]})
+        controls = pd.DataFrame({"control_id": [f"C{i}" for i in range(60)]})
+        mappings = pd.DataFrame(
+            {"risk_id": [f"R{i}" for i in rng.integers(0, 60, 200)], "control_id": [f"C{i}" for i in rng.integers(0, 60, 200)]}
+        )
+        exact = compute_entity_metrics(risks, controls, mappings, betweenness_samples=1000)["betweenness"]
+        sampled = compute_entity_metrics(risks, controls, mappings, betweenness_samples=60)["betweenness"]
+        assert np.corrcoef(exact, sampled)[0, 1] > 0.9
+
+    def test_empty_inputs(self):
+        assert compute_entity_metrics(None, None, None).empty
@@ -0,0 +1,132 @@
+"""
+Tests for MinHash/LSH near-duplicate detection.
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processors.near_duplicates import (
+    candidate_pairs,
+    compute_near_duplicates,
+    find_near_duplicates,
+    generate_near_duplicate_report,
+    jaccard,
+    minhash_signatures,
+    shingles,
+)
+
+
+@pytest.fixture
+def controls():
+    return pd.DataFrame(
+        {
+            "control_id": ["AIGPC.1", "AIGPC.2", "AIGPC.3", "AIGPC.4"],
+            "control_title": [
+                "Model Weight Encryption",
+                "Data Poisoning Monitoring",
+                "Model Weight Encryption",
+                "Model Weight Encryption",
+            ],
+            "control_description": [
+                "Encrypt model weights at rest and in transit using approved cryptographic algorithms and keys",
+                "Monitor training data pipelines for poisoning attempts",
+                "Encrypt model weights at rest and in transit using approved cryptographic algorithms and key",
+                "Encrypt model weights at rest and in transit using approved cryptographic algorithms and keys",
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def definitions():
+    return pd.DataFrame(
+        {
+            "definition_id": ["ai_model", "ml_model", "drift"],
+            "title": ["AI Model", "ML Model", "Drift"],
+            "description": [
+                "A trained system that maps inputs to outputs such as predictions or generated content",
+                "A trained system that maps inputs to outputs such as predictions or generated content",
+                "Change in input data distribution over time",
+            ],
+        }
+    )
+
+
+def test_shingles_are_word_bigrams():
+    assert shingles("Encrypt the weights") == shingles("encrypt, THE weights!")
+    assert len(shingles("one two three")) == 2
+    assert len(shingles("single")) == 1
+    assert shingles("") == set()
+
+
+def test_signature_agreement_estimates_jaccard():
+    rng = random.Random(0)
+    base = set(rng.sample(range(10**6), 400))
+    other = set(list(base)[:300]) | set(rng.sample(range(10**6, 2 * 10**6), 100))
+    signatures = minhash_signatures([base, other], num_perm=512)
+
+    estimate = (signatures[0] == signatures[1]).mean()
+    assert estimate == pytest.approx(jaccard(base, other), abs=0.06)
+
+
+def test_signatures_are_deterministic_and_chunk_independent(monkeypatch):
+    sets = [shingles(f"control {i} text about item {i % 7} and {i % 3}") for i in range(50)] + [set()]
+    expected = minhash_signatures(sets)
+
+    from processors import near_duplicates
+
+    monkeypatch.setattr(near_duplicates, "CHUNK_VALUES", 128 * 3)
+    assert np.array_equal(minhash_signatures(sets), expected)
+
+
+def test_identical_signatures_are_candidates():
+    sets = [{1, 2, 3}, {1, 2, 3}, {7, 8, 9}]
+    assert candidate_pairs(minhash_signatures(sets)) == {(0, 1)}
+
+
+def test_compute_near_duplicates(controls, definitions):
+    duplicates = compute_near_duplicates(controls, definitions)
+
+    rows = {(row.entity_type, row.entity_id): row for row in duplicates.itertuples()}
+    assert set(rows) == {
+        ("control", "AIGPC.1"),
+        ("control", "AIGPC.3"),
+        ("control", "AIGPC.4"),
+        ("definition", "ai_model"),
+        ("definition", "ml_model"),
+    }
+    assert {row.cluster_id for key, row in rows.items() if key[0] == "control"} == {"control-1"}
+    assert {row.canonical_id for key, row in rows.items() if key[0] == "control"} == {"AIGPC.1"}
+    assert rows[("control", "AIGPC.1")].similarity == 1.0
+    assert 0.8 <= rows[("control", "AIGPC.3")].similarity < 1.0
+    assert rows[("definition", "ml_model")].canonical_id == "ai_model"
+    assert set(duplicates["cluster_size"]) == {3, 2}
+
+
+def test_threshold_excludes_loose_matches(controls):
+    duplicates = compute_near_duplicates(controls, None, threshold=0.99)
+    assert set(duplicates["entity_id"]) == {"AIGPC.1", "AIGPC.4"}
+
+
+def test_no_duplicates_or_input():
+    assert compute_near_duplicates(None, None).empty
+    assert find_near_duplicates(["A", "B"], ["alpha beta gamma", "delta epsilon zeta"]) == []
+    # Empty texts are not duplicates of each other
+    assert find_near_duplicates(["A", "B"], ["", ""]) == []
+
+
+def test_bands_must_divide_permutations(controls):
+    with pytest.raises(ValueError):
+        compute_near_duplicates(controls, None, num_perm=100, bands=16)
+
+
+def test_generate_report(controls, definitions):
+    report = generate_near_duplicate_report(compute_near_duplicates(controls, definitions))
+
+    assert "CONTROLS: 1 clusters, 3 entries" in report
+    assert "AIGPC.1 ~ AIGPC.3" in report
+    assert "DEFINITIONS: 1 clusters, 2 entries" in report
+    assert "No near-duplicate" in generate_near_duplicate_report(None)
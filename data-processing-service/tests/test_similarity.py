@@ -0,0 +1,103 @@
+"""
+Tests for TF-IDF similar entities.
+"""
+
+import random
+import string
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processors import similarity
+from processors.similarity import _documents, compute_similar_entities, tfidf_matrix
+
+
+@pytest.fixture
+def entities():
+    risks = pd.DataFrame(
+        {
+            "risk_id": ["R1", "R2", "R3"],
+            "risk_title": ["Training data poisoning", "Poisoned training data", "Model theft"],
+            "risk_description": ["Attackers tamper with training data", None, "Weights are exfiltrated"],
+        }
+    )
+    controls = pd.DataFrame(
+        {
+            "control_id": ["C1", "C2"],
+            "control_title": ["Validate training data", "Protect model weights"],
+            "control_description": ["Check provenance of training data", "Encrypt weights at rest"],
+        }
+    )
+    definitions = pd.DataFrame(
+        {"definition_id": ["D1"], "title": ["Data poisoning"], "description": ["Tampering with training data"]}
+    )
+    return risks, controls, definitions
+
+
+def dense_similarity(risks, controls, definitions):
+    types, ids, tokens = _documents(risks, controls, definitions)
+    indptr, indices, data, n_terms = tfidf_matrix(tokens)
+    matrix = np.zeros((len(ids), n_terms))
+    for row in range(len(ids)):
+        matrix[row, indices[indptr[row]:indptr[row + 1]]] = data[indptr[row]:indptr[row + 1]]
+    scores = matrix @ matrix.T
+    np.fill_diagonal(scores, 0)
+    return types, ids, scores
+
+
+class TestComputeSimilarEntities:
+    """Top-k TF-IDF cosine neighbours per entity and neighbour type."""
+
+    def test_neighbours(self, entities, monkeypatch):
+        # Keep terms shared by most of this tiny corpus
+        monkeypatch.setattr(similarity, "MAX_DOCUMENT_FREQUENCY", 1.0)
+        similar = compute_similar_entities(*entities)
+        r1 = similar[(similar.entity_id == "R1")]
+        assert r1[r1.similar_type == "risk"].similar_id.tolist() == ["R2"]
+        assert r1[r1.similar_type == "control"].iloc[0].similar_id == "C1"
+        assert r1[r1.similar_type == "definition"].similar_id.tolist() == ["D1"]
+        assert (similar.entity_id != similar.similar_id).all()
+        c2 = similar[(similar.entity_id == "C2") & (similar.similar_type == "risk")]
+        assert c2.similar_id.tolist() == ["R3"]
+
+    def test_ranks_are_ordered(self, entities):
+        similar = compute_similar_entities(*entities)
+        for _, group in similar.groupby(["entity_id", "similar_type"]):
+            assert group["rank"].tolist() == list(range(1, len(group) + 1))
+            assert group.score.is_monotonic_decreasing
+
+    def test_batched_products_match_dense(self, monkeypatch):
+        rng = random.Random(4)
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(6)) for _ in range(150)]
+        risks = pd.DataFrame(
+            {
+                "risk_id": [f"R{i}" for i in range(80)],
+                "risk_title": [" ".join(rng.sample(words, 4)) for _ in range(80)],
+                "risk_description": [" ".join(rng.choices(words, k=25)) for _ in range(80)],
+            }
+        )
+        controls = pd.DataFrame(
+            {
+                "control_id": [f"C{i}" for i in range(60)],
+                "control_title": [" ".join(rng.sample(words, 4)) for _ in range(60)],
+                "control_description": [" ".join(rng.choices(words, k=25)) for _ in range(60)],
+            }
+        )
+        # Force many small batches
+        monkeypatch.setattr(similarity, "BATCH_PRODUCTS", 2000)
+        similar = compute_similar_entities(risks, controls, None, top_k=3)
+        types, ids, scores = dense_similarity(risks, controls, None)
+
+        for (entity_id, similar_type), group in similar.groupby(["entity_id", "similar_type"]):
+            columns = [i for i, t in enumerate(types) if t == similar_type]
+            expected = np.sort(scores[ids.index(entity_id), columns])[::-1][: len(group)]
+            np.testing.assert_allclose(group.score.to_numpy(), expected)
+
+    def test_common_terms_are_dropped(self, entities):
+        # "training" and "data" appear in most entities, leaving R1 and R2 nothing distinctive in common
+        similar = compute_similar_entities(*entities)
+        assert similar[(similar.entity_id == "R1") & (similar.similar_type == "risk")].empty
+
+    def test_too_few_entities(self):
+        assert compute_similar_entities(pd.DataFrame({"risk_id": ["R1"], "risk_title": ["Only"]}), None, None).empty
@@ -0,0 +1,80 @@
+"""
+Tests for the definition term occurrence index.
+"""
+
+import random
+import re
+
+import pandas as pd
+import pytest
+
+from processors.term_index import TermAutomaton, build_term_automaton, compute_term_occurrences, find_terms
+
+
+@pytest.fixture
+def definitions():
+    return pd.DataFrame(
+        {
+            "definition_id": ["D1", "D2", "D3"],
+            "term": ["Machine Learning", "Machine Learning Model", "AI-Agent"],
+        }
+    )
+
+
+class TestTermAutomaton:
+    """Multi-pattern matching."""
+
+    def test_overlapping_patterns(self):
+        automaton = TermAutomaton([("he", "he"), ("she", "she"), ("his", "his"), ("hers", "hers")])
+        assert sorted(automaton.find_all("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+    def test_matches_brute_force(self):
+        rng = random.Random(5)
+        for _ in range(200):
+            patterns = {"".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(6)}
+            text = "".join(rng.choice("ab") for _ in range(30))
+            found = sorted(TermAutomaton([(p, p) for p in patterns]).find_all(text))
+            expected = sorted((m.start(), m.start() + len(p), p) for p in patterns for m in re.finditer(f"(?={p})", text))
+            assert found == expected
+
+
+class TestFindTerms:
+    """Whole-word, case-insensitive, leftmost-longest occurrences."""
+
+    def test_longest_match_wins(self, definitions):
+        automaton = build_term_automaton(definitions)
+        text = "A Machine Learning Model and machine learning"
+        assert find_terms(automaton, text) == [
+            (2, 24, "Machine Learning Model", "D2"),
+            (29, 45, "Machine Learning", "D1"),
+        ]
+
+    def test_word_boundaries_and_variants(self, definitions):
+        automaton = build_term_automaton(definitions)
+        text = "An AI agent, an AI-Agent, machine learningx"
+        assert [(text[start:end], term) for start, end, term, _ in find_terms(automaton, text)] == [
+            ("AI agent", "AI-Agent"),
+            ("AI-Agent", "AI-Agent"),
+        ]
+
+
+class TestComputeTermOccurrences:
+    """Occurrence rows for risk and control text."""
+
+    def test_rows(self, definitions):
+        risks = pd.DataFrame(
+            {"risk_id": ["AIR.001"], "risk_title": ["Machine learning drift"], "risk_description": [None]}
+        )
+        controls = pd.DataFrame(
+            {"control_id": ["C1"], "control_title": ["Monitor"], "control_description": ["Review each AI agent."]}
+        )
+        occurrences = compute_term_occurrences(definitions, risks, controls)
+        assert occurrences.to_dict("records") == [
+            {"entity_type": "risk", "entity_id": "AIR.001", "field": "title", "start": 0, "end": 16,
+             "term": "Machine Learning", "definition_id": "D1"},
+            {"entity_type": "control", "entity_id": "C1", "field": "description", "start": 12, "end": 20,
+             "term": "AI-Agent", "definition_id": "D3"},
+        ]
+
+    def test_without_definitions(self):
+        assert compute_term_occurrences(None, pd.DataFrame({"risk_id": ["R1"]}), None).empty
@@ -0,0 +1,47 @@
+"""
+Tests for the search trigram index.
+"""
+
+import pandas as pd
+
+from processors.trigram_index import compute_trigram_index, word_trigrams
+
+
+def _similarity(a, b):
+    grams_a, grams_b = word_trigrams(a), word_trigrams(b)
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def test_word_trigrams_are_padded():
+    assert word_trigrams("ai") == {"  a", " ai", "ai "}
+    assert len(word_trigrams("data")) == 5
+
+
+def test_misspellings_stay_similar():
+    assert _similarity("adverserial", "adversarial") > 0.5
+    assert _similarity("hallucinaton", "hallucination") > 0.5
+    assert _similarity("adverserial", "encryption") < 0.1
+
+
+def test_compute_trigram_index():
+    risks = pd.DataFrame({"risk_id": ["R1"], "risk_title": ["Adversarial attacks"], "risk_description": [None]})
+    controls = pd.DataFrame(
+        {"control_id": ["C1"], "control_title": ["Adversarial testing"], "control_description": ["Red team 2024"]}
+    )
+    definitions = pd.DataFrame({"definition_id": ["d1"], "term": ["AI"], "description": ["Artificial intelligence"]})
+
+    terms, trigrams = compute_trigram_index(risks, controls, definitions)
+
+    by_term = terms.set_index("term")
+    # Short words and numbers are left out
+    assert set(by_term.index) == {"adversarial", "attacks", "testing", "red", "team", "artificial", "intelligence"}
+    assert by_term.loc["adversarial", "frequency"] == 2
+    assert by_term.loc["adversarial", "trigram_count"] == len(word_trigrams("adversarial"))
+    assert len(trigrams) == terms["trigram_count"].sum()
+    postings = trigrams[trigrams["term_id"] == by_term.loc["red", "term_id"]]
+    assert set(postings["trigram"]) == word_trigrams("red")
+
+
+def test_no_text():
+    terms, trigrams = compute_trigram_index(None, None, None)
+    assert terms.empty and trigrams.empty
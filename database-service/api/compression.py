@@ -0,0 +1,160 @@
+"""Negotiated gzip/brotli compression of API responses."""
+
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+# Negotiation and whole-body encoding are shared with the dashboard (shared-services/http_compression.py)
+from http_compression import available_encodings, compress, negotiate_encoding, weaken_etag  # noqa: F401
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is listed in requirements.txt
+    brotli = None
+
+# Content types worth compressing; everything else is passed through untouched
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def process(self, chunk: bytes) -> bytes:
+        """Compress ``chunk`` and flush, so each streamed chunk reaches the client promptly."""
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON and text responses for clients that accept it.
+
+    Bodies smaller than ``minimum_size`` are sent as-is. Streaming responses are
+    compressed chunk by chunk once ``minimum_size`` bytes have arrived. Responses
+    that already carry a Content-Encoding (such as pre-compressed cache entries)
+    are left alone apart from the Vary and ETag adjustments every negotiated
+    response needs.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = negotiate_encoding(accept_encoding)
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+        buffered = b""
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough, buffered
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            if compressor is not None:
+                body = compressor.process(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body += compressor.finish()
+                await send({**message, "body": body})
+                return
+
+            # Hold back the first chunks until there is enough body to decide
+            buffered += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if more_body and len(buffered) < self.minimum_size:
+                return
+            body, buffered = buffered, b""
+            message = {**message, "body": body}
+
+            headers = _Headers(start_message["headers"])
+            if not is_compressible(headers.get("content-type")):
+                passthrough = True
+            else:
+                headers.add_vary()
+                if headers.get("content-encoding"):
+                    headers.weaken_etag()
+                    passthrough = True
+                elif encoding is None or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+            if passthrough:
+                await send({**start_message, "headers": headers.raw})
+                await send(message)
+                return
+
+            headers.set("content-encoding", encoding)
+            headers.weaken_etag()
+            if more_body:
+                headers.remove("content-length")
+                compressor = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                body = compressor.process(body)
+            else:
+                body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                headers.set("content-length", str(len(body)))
+            await send({**start_message, "headers": headers.raw})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class _Headers:
+    """Minimal mutable view over ASGI raw headers."""
+
+    def __init__(self, raw: Iterable[Tuple[bytes, bytes]]):
+        self.raw: List[Tuple[bytes, bytes]] = list(raw)
+
+    def get(self, name: str) -> Optional[str]:
+        key = name.encode("latin-1")
+        for k, v in self.raw:
+            if k.lower() == key:
+                return v.decode("latin-1")
+        return None
+
+    def remove(self, name: str) -> None:
+        key = name.encode("latin-1")
+        self.raw = [(k, v) for k, v in self.raw if k.lower() != key]
+
+    def set(self, name: str, value: str) -> None:
+        self.remove(name)
+        self.raw.append((name.encode("latin-1"), value.encode("latin-1")))
+
+    def add_vary(self) -> None:
+        vary = self.get("vary")
+        if not vary:
+            self.set("vary", "Accept-Encoding")
+        elif "accept-encoding" not in vary.lower():
+            self.set("vary", f"{vary}, Accept-Encoding")
+
+    def weaken_etag(self) -> None:
+        etag = self.get("etag")
+        if etag:
+            self.set("etag", weaken_etag(etag))
@@ -1,18 +1,21 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
+
 class Risk(BaseModel):
     id: str
     title: str
     description: str
     category: Optional[str] = None
 
+
 class Control(BaseModel):
     id: str
     title: str
     description: str
     domain: Optional[str] = None
 
+
 class Definition(BaseModel):
     definition_id: str
     term: str
@@ -21,11 +24,13 @@ class Definition(BaseModel):
     category: Optional[str] = None
     source: Optional[str] = None
 
+
 class Relationship(BaseModel):
     source_id: str
     target_id: str
     relationship_type: str
 
+
 class DatabaseStats(BaseModel):
     total_risks: int
     total_controls: int
@@ -33,8 +38,33 @@ class DatabaseStats(BaseModel):
     total_relationships: int
     database_version: Optional[str] = None
 
+
 class HealthStatus(BaseModel):
     status: str
     database_connected: bool
     database_path: str
     total_records: int
+    generation: Optional[int] = None
+    database_fingerprint: Optional[str] = None
+    checked_at: Optional[float] = None
+
+
+class BatchRequest(BaseModel):
+    ids: List[str]
+
+
+class CoverRequest(BaseModel):
+    risk_ids: List[str]
+    costs: Dict[str, float] = {}
+    exclude: List[str] = []
+
+
+class Scenario(BaseModel):
+    name: Optional[str] = None
+    implemented: Optional[List[str]] = None
+    removed: List[str] = []
+    planned: List[str] = []
+
+
+class ScenarioRequest(BaseModel):
+    scenarios: List[Scenario]
@@ -10,22 +10,72 @@ Updated: Fresh build trigger
 
 import os
 import sys
+import asyncio
 import sqlite3
+import hashlib
+import hmac
 import logging
+import itertools
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional
-from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import uvicorn
 
 from config_manager import ConfigManager
 from db.connections import DatabaseManager
-from api.models import Risk, Control, Definition, Relationship, DatabaseStats, HealthStatus
+from db.executor import DatabaseExecutor
+from db.fingerprint import file_fingerprint
+from db.generations import DatabaseGeneration, DatabaseWatcher
+from db.export import EXPORT_FORMATS, EXPORT_QUERIES, export_stream
+from db.autocomplete import ENTITY_TYPES as AUTOCOMPLETE_TYPES
+from db.optimize import cover_risks
+from db.scenarios import run_scenario
+from api.models import (
+    Risk,
+    Control,
+    Definition,
+    Relationship,
+    DatabaseStats,
+    HealthStatus,
+    BatchRequest,
+    CoverRequest,
+    ScenarioRequest,
+)
+from api.response_cache import ResponseCache, dumps
+from api.compression import CompressionMiddleware, compress, negotiate_encoding
 from db.repositories import (
-    RiskRepository, ControlRepository, DefinitionRepository,
-    RelationshipRepository, SearchRepository, StatsRepository, NetworkRepository, GapsRepository
+    RiskRepository,
+    ControlRepository,
+    DefinitionRepository,
+    RelationshipRepository,
+    SearchRepository,
+    StatsRepository,
+    NetworkRepository,
+    GapsRepository,
+    ImpactRepository,
+    RankingRepository,
+    TermRepository,
+    SimilarityRepository,
+    encode_cursor,
+    decode_cursor,
+)
+from db.snapshot import (
+    DataSnapshot,
+    SnapshotRiskRepository,
+    SnapshotControlRepository,
+    SnapshotDefinitionRepository,
+    SnapshotRelationshipRepository,
+    SnapshotStatsRepository,
+    SnapshotNetworkRepository,
+    SnapshotGapsRepository,
+    SnapshotImpactRepository,
 )
 
 # Initialize configuration manager
@@ -37,6 +87,8 @@ server_config = config_manager.get_server_config()
 database_config = config_manager.get_database_config()
 api_config = config_manager.get_api_config()
 logging_config = config_manager.get_logging_config()
+performance_config = config_manager.get_performance_config()
+health_check_config = config_manager.get_health_check_config()
 
 # Configure logging
 logging.basicConfig(
@@ -49,65 +101,370 @@ logger = logging.getLogger(__name__)
 DB_PATH = database_config.get("path", "aiml_data.db")
 API_PORT = int(server_config.get("port"))
 API_HOST = server_config.get("host", "0.0.0.0")
-
-# Initialize DatabaseManager and Repositories
-db_manager = DatabaseManager(DB_PATH)
-risk_repo = RiskRepository(db_manager)
-control_repo = ControlRepository(db_manager)
-definition_repo = DefinitionRepository(db_manager)
-relationship_repo = RelationshipRepository(db_manager)
-search_repo = SearchRepository(db_manager)
-stats_repo = StatsRepository(db_manager)
-network_repo = NetworkRepository(db_manager)
-gaps_repo = GapsRepository(db_manager)
-
-
-def reinitialize_repositories(new_db_path: str):
-    """Reinitialize all repositories with a new database path. Used for testing."""
-    global db_manager, risk_repo, control_repo, definition_repo
-    global relationship_repo, search_repo, stats_repo, network_repo, gaps_repo
-    global DB_PATH
-    
-    DB_PATH = new_db_path
-    db_manager = DatabaseManager(new_db_path)
-    risk_repo = RiskRepository(db_manager)
-    control_repo = ControlRepository(db_manager)
-    definition_repo = DefinitionRepository(db_manager)
-    relationship_repo = RelationshipRepository(db_manager)
-    search_repo = SearchRepository(db_manager)
-    stats_repo = StatsRepository(db_manager)
-    network_repo = NetworkRepository(db_manager)
-    gaps_repo = GapsRepository(db_manager)
-
-
-
-# Pydantic models for API responses
-# FastAPI app
-app = FastAPI(
-    title="AIML Database Service",
-    description="REST API for AIML Risk Management Database",
-    version="1.0.0",
+SNAPSHOT_MODE = str(database_config.get("snapshot_mode", False)).lower() == "true"
+
+# HTTP caching: GET responses only change when the database file is rebuilt
+http_cache_config = performance_config.get("http_cache", {})
+HTTP_CACHE_ENABLED = str(http_cache_config.get("enabled", True)).lower() == "true"
+CACHE_CONTROL = http_cache_config.get("cache_control", "no-cache")
+UNCACHED_PATHS = {"/api/health", "/api/live", "/api/ready", "/api/pool-stats"}
+
+# Hot reload: watch DB_PATH for a rebuilt file and/or accept POST /api/admin/reload (only when a token is set)
+reload_config = database_config.get("reload", {})
+RELOAD_WATCH = str(reload_config.get("watch", True)).lower() == "true"
+RELOAD_POLL_INTERVAL = float(reload_config.get("poll_interval", 5))
+RELOAD_ADMIN_TOKEN = reload_config.get("admin_token") or None
+
+# Negotiated gzip/brotli for JSON bodies of at least minimum_size bytes
+compression_config = performance_config.get("compression", {})
+COMPRESSION_ENABLED = str(compression_config.get("enabled", True)).lower() == "true"
+COMPRESSION_MIN_SIZE = int(compression_config.get("minimum_size", 1024))
+GZIP_LEVEL = int(compression_config.get("gzip_level", 6))
+BROTLI_QUALITY = int(compression_config.get("brotli_quality", 5))
+
+# Graph queries: deepest neighbourhood and most nodes a single graph response may return
+graph_config = api_config.get("graph", {})
+GRAPH_MAX_HOPS = int(graph_config.get("max_hops", 3))
+GRAPH_MAX_NODES = int(graph_config.get("max_nodes", 2000))
+GRAPH_MAX_SCENARIOS = int(graph_config.get("max_scenarios", 500))
+
+# Bulk export: each download holds a pooled connection until it finishes, so only this many run at once
+EXPORT_MAX_CONCURRENT = int(api_config.get("export", {}).get("max_concurrent", 2))
+export_slots = threading.BoundedSemaphore(EXPORT_MAX_CONCURRENT)
+
+# Fuzzy search (/api/search?fuzzy=true): default minimum trigram similarity of a corrected word, corrections
+# per query word, and BM25 hits re-ranked by similarity
+search_config = api_config.get("search", {})
+FUZZY_THRESHOLD = float(search_config.get("fuzzy_threshold", 0.3))
+FUZZY_MAX_EXPANSIONS = int(search_config.get("fuzzy_max_expansions", 10))
+FUZZY_MAX_CANDIDATES = int(search_config.get("fuzzy_max_candidates", 1000))
+
+# Readiness is checked once per generation and refreshed in the background once older than this
+READINESS_TTL = float(health_check_config.get("readiness_ttl", 30))
+
+# Serialized response bodies, keyed by generation, route and query
+response_cache_config = performance_config.get("response_cache", {})
+RESPONSE_CACHE_ENABLED = str(response_cache_config.get("enabled", True)).lower() == "true"
+response_cache = ResponseCache(
+    max_bytes=int(float(response_cache_config.get("max_size_mb", 64)) * 1024 * 1024),
+    max_entries=int(response_cache_config.get("max_entries", 1024)),
 )
 
 
+def create_database_manager(db_path: str) -> DatabaseManager:
+    """Create a pooled DatabaseManager using the performance configuration."""
+    return DatabaseManager(
+        db_path,
+        max_connections=int(performance_config.get("max_connections", 10)),
+        timeout=float(performance_config.get("connection_timeout", 30)),
+        cached_statements=int(performance_config.get("statement_cache_size", 256)),
+    )
 
 
-# Database connection manager
-def get_db_connection():
-    """Context manager for database connections."""
-    return db_manager.get_db_connection()
+def build_repositories(manager: DatabaseManager, snapshot: Optional[DataSnapshot] = None) -> Dict[str, Any]:
+    """Create the repository set, served from ``snapshot`` when one is given."""
+    if snapshot is None:
+        return {
+            "risk_repo": RiskRepository(manager),
+            "control_repo": ControlRepository(manager),
+            "definition_repo": DefinitionRepository(manager),
+            "relationship_repo": RelationshipRepository(manager),
+            "search_repo": SearchRepository(manager),
+            "stats_repo": StatsRepository(manager),
+            "network_repo": NetworkRepository(manager),
+            "gaps_repo": GapsRepository(manager),
+            "impact_repo": ImpactRepository(manager),
+            "ranking_repo": RankingRepository(manager),
+            "term_repo": TermRepository(manager),
+            "similarity_repo": SimilarityRepository(manager),
+        }
 
+    # Search stays on SQLite so it keeps using the FTS5 index; precomputed analysis tables are read there too
+    return {
+        "risk_repo": SnapshotRiskRepository(manager, snapshot),
+        "control_repo": SnapshotControlRepository(manager, snapshot),
+        "definition_repo": SnapshotDefinitionRepository(manager, snapshot),
+        "relationship_repo": SnapshotRelationshipRepository(manager, snapshot),
+        "search_repo": SearchRepository(manager),
+        "stats_repo": SnapshotStatsRepository(manager, snapshot),
+        "network_repo": SnapshotNetworkRepository(manager, snapshot),
+        "gaps_repo": SnapshotGapsRepository(manager, snapshot),
+        "impact_repo": SnapshotImpactRepository(manager, snapshot),
+        "ranking_repo": RankingRepository(manager),
+        "term_repo": TermRepository(manager),
+        "similarity_repo": SimilarityRepository(manager),
+    }
+
+
+_generation_ids = itertools.count(1)
+_reload_lock = threading.Lock()
+_request_generation: ContextVar[Optional[DatabaseGeneration]] = ContextVar("request_generation", default=None)
+active_generation: Optional[DatabaseGeneration] = None
+
+
+def build_generation(
+    db_path: str, snapshot_mode: bool = False, manager: Optional[DatabaseManager] = None
+) -> DatabaseGeneration:
+    """Open ``db_path`` as a new generation, loading the snapshot if requested."""
+    manager = manager or create_database_manager(db_path)
+    # Hashed once here: the generation's ETags must describe the data it serves, not whatever is at db_path later
+    fingerprint = file_fingerprint(db_path)
+    snapshot = None
+    if snapshot_mode and validate_database(db_path, manager):
+        try:
+            snapshot = DataSnapshot.load(manager)
+        except Exception as e:
+            logger.error(f"Failed to load snapshot, serving from SQLite: {e}")
+    return DatabaseGeneration(
+        next(_generation_ids), db_path, manager, build_repositories(manager, snapshot), snapshot, fingerprint
+    )
 
 
+def activate_generation(generation: DatabaseGeneration):
+    """Make ``generation`` the one new requests are served from and retire the previous one."""
+    global active_generation, DB_PATH, db_manager, risk_repo, control_repo, definition_repo
+    global relationship_repo, search_repo, stats_repo, network_repo, gaps_repo, impact_repo, ranking_repo, term_repo
+    global similarity_repo
+
+    previous = active_generation
+    # Single reference swap: requests read active_generation once and keep what they got
+    active_generation = generation
+
+    # Module-level aliases for scripts and tests
+    DB_PATH = generation.db_path
+    db_manager = generation.db_manager
+    risk_repo = generation.risk_repo
+    control_repo = generation.control_repo
+    definition_repo = generation.definition_repo
+    relationship_repo = generation.relationship_repo
+    search_repo = generation.search_repo
+    stats_repo = generation.stats_repo
+    network_repo = generation.network_repo
+    gaps_repo = generation.gaps_repo
+    impact_repo = generation.impact_repo
+    ranking_repo = generation.ranking_repo
+    term_repo = generation.term_repo
+    similarity_repo = generation.similarity_repo
+
+    if previous is not None and previous is not generation:
+        # Entries are keyed by generation; drop the old ones rather than waiting for eviction
+        response_cache.clear()
+        previous.retire()
+
+
+def current_generation() -> DatabaseGeneration:
+    """The generation pinned by the current request, or the active one outside a request."""
+    return _request_generation.get() or active_generation
+
+
+def warm_generation(generation: DatabaseGeneration):
+    """Prime a generation's caches before it takes traffic."""
+    with generation.db_manager.get_db_connection():
+        generation.search_repo.has_fts_index()
+        generation.search_repo.has_trigram_index()
+        generation.impact_repo.has_coverage_index()
+        generation.ranking_repo.has_metrics()
+        generation.term_repo.has_occurrences()
+        generation.similarity_repo.has_similarities()
+        check_readiness(generation)
+    generation.get_graph()
+    generation.get_completions()
+
+
+def check_readiness(generation: DatabaseGeneration) -> Dict[str, Any]:
+    """Validate a generation and cache the result, with its stats and fingerprint, on the generation."""
+    ready, stats = validate_database(generation.db_path, generation.db_manager), {}
+    if ready:
+        try:
+            stats = generation.stats_repo.get_stats()
+        except Exception as e:
+            logger.error(f"Readiness stats failed: {e}")
+            ready = False
+    generation.readiness = {
+        "ready": ready,
+        "stats": stats,
+        "fingerprint": generation.fingerprint,
+        "checked_at": time.time(),
+    }
+    return generation.readiness
+
+
+def refresh_readiness(generation: DatabaseGeneration):
+    """Re-check readiness unless another refresh of this generation is already running."""
+    if not generation.readiness_refresh.acquire(blocking=False):
+        return
+    generation.acquire()
+    try:
+        check_readiness(generation)
+    except Exception as e:
+        logger.error(f"Readiness refresh failed: {e}")
+    finally:
+        generation.release()
+        generation.readiness_refresh.release()
+
+
+async def get_readiness(generation: DatabaseGeneration) -> Dict[str, Any]:
+    """
+    Cached readiness of ``generation``.
+
+    Only the first probe of a generation waits for the check. After that the
+    cached result is returned immediately, and once it is older than
+    READINESS_TTL a refresh runs on a background thread instead of the
+    database executor, so probes never queue behind user requests.
+    """
+    readiness = generation.readiness
+    if readiness is None:
+        return await asyncio.to_thread(check_readiness, generation)
+    if time.time() - readiness["checked_at"] > READINESS_TTL:
+        threading.Thread(target=refresh_readiness, args=(generation,), name="readiness-refresh", daemon=True).start()
+    return readiness
+
+
+def reload_database(db_path: Optional[str] = None) -> DatabaseGeneration:
+    """Open, validate and warm ``db_path`` (default: the active path), then switch to it."""
+    with _reload_lock:
+        path = db_path or DB_PATH
+        started = time.perf_counter()
+        manager = create_database_manager(path)
+        if not validate_database(path, manager):
+            manager.close()
+            raise ValueError(f"Database {path} failed validation")
+
+        try:
+            generation = build_generation(path, SNAPSHOT_MODE, manager)
+            warm_generation(generation)
+        except Exception:
+            manager.close()
+            raise
+
+        activate_generation(generation)
+        logger.info(
+            f"Activated database generation {generation.generation_id} from {path} "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        return generation
 
 
+def reinitialize_repositories(new_db_path: str, snapshot_mode: Optional[bool] = None):
+    """Switch to a new database path without validation. Used for testing."""
+    activate_generation(build_generation(new_db_path, SNAPSHOT_MODE if snapshot_mode is None else snapshot_mode))
 
-# FastAPI app
-# Initialized above
 
+app = FastAPI(
+    title="AIML Database Service",
+    description="REST API for AIML Risk Management Database",
+    version="1.0.0",
+)
 
+# Repository calls run here instead of on the event loop; one worker per pooled connection
+db_executor = DatabaseExecutor(max_workers=int(performance_config.get("max_connections", 10)))
+
+
+def fetch_page(
+    gen: DatabaseGeneration, repo, limit: int, offset: int, after: Optional[List[Any]], **filters
+) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+    """Fetch one page of a list endpoint with its (cached) total and the cursor for the next page."""
+    # Page and count share one pooled connection; snapshot repositories need none
+    with gen.db_manager.get_db_connection() if gen.snapshot is None else nullcontext():
+        rows = repo.get_all(limit=limit + 1, offset=offset, after=after, **filters)
+        total = repo.count(**filters)
+    next_cursor = encode_cursor(repo.sort_key(rows[limit - 1])) if len(rows) > limit else None
+    return rows[:limit], total, next_cursor
+
+
+def load_batch(
+    gen: DatabaseGeneration, ids: List[str], get_by_ids, get_associations
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[Dict[str, Any]]], List[str]]:
+    """Resolve a batch of ids and their associations, returning (found, associations, not_found)."""
+    # Both lookups share one pooled connection; snapshot repositories need none
+    with gen.db_manager.get_db_connection() if gen.snapshot is None else nullcontext():
+        found = get_by_ids(ids)
+        associations = get_associations(list(found)) if found else {}
+    not_found = [i for i in dict.fromkeys(ids) if i not in found]
+    return found, associations, not_found
+
+
+def attach_terms(gen: DatabaseGeneration, entity_type: str, rows: List[Dict[str, Any]], id_key: str):
+    """Add each row's definition term offsets as ``terms``, when the database has them."""
+    terms = load_terms(gen, entity_type, [row[id_key] for row in rows])
+    if terms is not None:
+        for row in rows:
+            row["terms"] = terms[row[id_key]]
+
+
+def load_terms(gen: DatabaseGeneration, entity_type: str, ids: List[str]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Definition term offsets for each of ``ids``, or None if the database was built without them."""
+    if not ids or not gen.term_repo.has_occurrences():
+        return None
+    return gen.term_repo.get_for(entity_type, ids)
+
+
+def check_batch_size(ids: List[str]):
+    """Reject empty batches and batches larger than the configured maximum with a 400."""
+    max_batch_size = int(api_config.get("limits", {}).get("max_batch_size", 500))
+    if not ids:
+        raise HTTPException(status_code=400, detail="At least one id is required")
+    if len(ids) > max_batch_size:
+        raise HTTPException(status_code=400, detail=f"At most {max_batch_size} ids may be requested per batch")
+
+
+def normalized_query(request: Request) -> str:
+    """The query string with parameters sorted, so equivalent URLs share cache entries."""
+    return "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+
+
+async def cached_json(
+    request: Request, gen: DatabaseGeneration, build: Callable[[], Tuple[Any, Dict[str, str]]]
+) -> Response:
+    """
+    Serve a JSON response from the response cache, rendering it on a miss.
+
+    ``build`` runs on the database executor and returns the JSON-ready payload
+    (plain dicts and lists, not models) and any extra response headers. Large
+    bodies are compressed once for the negotiated encoding and cached that way.
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding")) if COMPRESSION_ENABLED else None
+    key = (gen.generation_id, request.url.path, normalized_query(request), encoding)
+    entry = response_cache.get(key) if RESPONSE_CACHE_ENABLED else None
+    if entry is None:
+
+        def render():
+            payload, headers = build()
+            body = dumps(payload)
+            if encoding and len(body) >= COMPRESSION_MIN_SIZE:
+                body = compress(body, encoding, GZIP_LEVEL, BROTLI_QUALITY)
+                headers = {**headers, "Content-Encoding": encoding}
+            return body, headers
+
+        body, headers = await db_executor.run(render)
+        entry = response_cache.put(key, body, headers) if RESPONSE_CACHE_ENABLED else None
+        if entry is None:
+            return Response(content=body, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=entry.headers)
+
+
+def page_headers(total: int, next_cursor: Optional[str]) -> Dict[str, str]:
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
+
+
+def parse_cursor(cursor: Optional[str], repo) -> Optional[List[Any]]:
+    """Decode a ``cursor`` query parameter for ``repo``'s sort key, rejecting malformed values with a 400."""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, repo.cursor_types)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
+# Database connection manager
+def get_db_connection():
+    """Context manager for database connections."""
+    return current_generation().db_manager.get_db_connection()
+
 
 # CORS middleware - localhost only
 cors_config = config.get("cors", {})
@@ -123,15 +480,85 @@ app.add_middleware(
 )
 
 
+def make_etag(fingerprint: str, request: Request) -> str:
+    """Strong ETag for ``request``: database fingerprint plus the normalized URL."""
+    resource = hashlib.sha256(f"{request.url.path}?{normalized_query(request)}".encode()).hexdigest()
+    return f'"{fingerprint[:20]}-{resource[:12]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against ``etag`` (weak comparison, as RFC 9110 requires).
+
+    ``*`` is not honoured: it would have to be answered before the route runs,
+    claiming a current representation exists even where the route would 404.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """Serve ETag/304 for API GETs without touching the database when the client is current."""
+    path = request.url.path
+    if not HTTP_CACHE_ENABLED or request.method != "GET" or not path.startswith("/api/") or path in UNCACHED_PATHS:
+        return await call_next(request)
+
+    # Computed when the generation was loaded; never hash the file on the event loop
+    fingerprint = current_generation().fingerprint
+    if fingerprint is None:
+        return await call_next(request)
+
+    etag = make_etag(fingerprint, request)
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag):
+        # Echo the weak form when that is what the client holds (a compressed representation)
+        if f"W/{etag}" in if_none_match:
+            etag = f"W/{etag}"
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+@app.middleware("http")
+async def pin_generation(request: Request, call_next):
+    """Serve the whole request from the generation that was active when it arrived."""
+    generation = active_generation
+    generation.acquire()
+    token = _request_generation.set(generation)
+    try:
+        return await call_next(request)
+    finally:
+        _request_generation.reset(token)
+        generation.release()
+
+
+if COMPRESSION_ENABLED:
+    # Registered last so it is outermost and sees the final headers (ETag, Content-Encoding)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        gzip_level=GZIP_LEVEL,
+        brotli_quality=BROTLI_QUALITY,
+    )
+
+
 # Database validation
-def validate_database() -> bool:
-    """Validate that the database exists and has required tables."""
-    if not Path(DB_PATH).exists():
-        logger.error(f"Database file not found: {DB_PATH}")
+def validate_database(db_path: Optional[str] = None, manager: Optional[DatabaseManager] = None) -> bool:
+    """Validate that the database exists and has required tables (default: the active database)."""
+    db_path = db_path or DB_PATH
+    if not Path(db_path).exists():
+        logger.error(f"Database file not found: {db_path}")
         return False
 
     try:
-        with get_db_connection() as conn:
+        with manager.get_db_connection() if manager else get_db_connection() as conn:
             cursor = conn.cursor()
             # Check for required tables from config
             required_tables = database_config.get(
@@ -160,6 +587,27 @@ def validate_database() -> bool:
         return False
 
 
+# Initialize the first database generation
+activate_generation(build_generation(DB_PATH))
+database_watcher = DatabaseWatcher(lambda: DB_PATH, reload_database, interval=RELOAD_POLL_INTERVAL)
+
+
+@app.on_event("startup")
+async def startup_load_generation():
+    """Load the in-memory snapshot when snapshot mode is enabled and start watching the database file."""
+    if SNAPSHOT_MODE and active_generation.snapshot is None and validate_database():
+        activate_generation(build_generation(DB_PATH, snapshot_mode=True))
+    await db_executor.run(check_readiness, active_generation)
+    if RELOAD_WATCH:
+        database_watcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_stop_watcher():
+    """Stop the database file watcher."""
+    database_watcher.stop()
+
+
 # API Routes
 @app.get("/", response_model=HealthStatus)
 async def root():
@@ -169,34 +617,62 @@ async def root():
 
 @app.get("/api/health", response_model=HealthStatus)
 async def health_check():
-    """Health check endpoint."""
-    db_connected = validate_database()
-    stats = stats_repo.get_stats() if db_connected else {}
-    total_records = sum(stats.get(k, 0) for k in ["total_risks", "total_controls"])
+    """Health check endpoint, answered from the cached readiness of the active generation."""
+    gen = current_generation()
+    readiness = await get_readiness(gen)
+    stats = readiness["stats"]
+    fingerprint = readiness["fingerprint"]
 
     return HealthStatus(
-        status="healthy" if db_connected else "unhealthy",
-        database_connected=db_connected,
-        database_path=DB_PATH,
-        total_records=total_records,
+        status="healthy" if readiness["ready"] else "unhealthy",
+        database_connected=readiness["ready"],
+        database_path=gen.db_path,
+        total_records=sum(stats.get(k, 0) for k in ["total_risks", "total_controls"]),
+        generation=gen.generation_id,
+        database_fingerprint=fingerprint[:16] if fingerprint else None,
+        checked_at=readiness["checked_at"],
     )
 
 
+@app.get("/api/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests. Never touches the database."""
+    return {"status": "alive"}
+
+
+@app.get("/api/ready", response_model=HealthStatus)
+async def readiness_check(response: Response):
+    """Readiness probe: 200 when the active database is valid, 503 otherwise (cached per generation)."""
+    status = await health_check()
+    if not status.database_connected:
+        response.status_code = 503
+    return status
+
+
 @app.get("/api/risks", response_model=List[Risk])
 async def get_risks(
+    request: Request,
     limit: int = Query(None, ge=1),
     offset: int = Query(0, ge=0),
     category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces offset"),
 ):
     """Get all risks with optional filtering."""
+    gen = current_generation()
+    after = parse_cursor(cursor, gen.risk_repo)
     try:
         limit = limit or api_config.get("limits", {}).get("default_limit", 100)
         max_limit = api_config.get("limits", {}).get("max_limit", 1000)
         limit = min(limit, max_limit)
 
-        rows = risk_repo.get_all(limit=limit, offset=offset, category=category)
-        return [Risk(**row) for row in rows]
+        def build():
+            rows, total, next_cursor = fetch_page(gen, gen.risk_repo, limit, offset, after, category=category)
+            return [Risk(**row).model_dump() for row in rows], page_headers(total, next_cursor)
 
+        return await cached_json(request, gen, build)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching risks: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -204,19 +680,28 @@ async def get_risks(
 
 @app.get("/api/controls", response_model=List[Control])
 async def get_controls(
+    request: Request,
     limit: int = Query(None, ge=1),
     offset: int = Query(0, ge=0),
     domain: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces offset"),
 ):
     """Get all controls with optional filtering."""
+    gen = current_generation()
+    after = parse_cursor(cursor, gen.control_repo)
     try:
         limit = limit or api_config.get("limits", {}).get("default_limit", 100)
         max_limit = api_config.get("limits", {}).get("max_limit", 1000)
         limit = min(limit, max_limit)
 
-        rows = control_repo.get_all(limit=limit, offset=offset, domain=domain)
-        return [Control(**row) for row in rows]
+        def build():
+            rows, total, next_cursor = fetch_page(gen, gen.control_repo, limit, offset, after, domain=domain)
+            return [Control(**row).model_dump() for row in rows], page_headers(total, next_cursor)
+
+        return await cached_json(request, gen, build)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching controls: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -224,19 +709,28 @@ async def get_controls(
 
 @app.get("/api/definitions", response_model=List[Definition])
 async def get_definitions(
+    request: Request,
     limit: int = Query(None, ge=1),
     offset: int = Query(0, ge=0),
     category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces offset"),
 ):
     """Get all definitions with optional filtering."""
+    gen = current_generation()
+    after = parse_cursor(cursor, gen.definition_repo)
     try:
         limit = limit or api_config.get("limits", {}).get("default_limit", 100)
         max_limit = api_config.get("limits", {}).get("max_limit", 1000)
         limit = min(limit, max_limit)
 
-        rows = definition_repo.get_all(limit=limit, offset=offset, category=category)
-        return [Definition(**row) for row in rows]
+        def build():
+            rows, total, next_cursor = fetch_page(gen, gen.definition_repo, limit, offset, after, category=category)
+            return [Definition(**row).model_dump() for row in rows], page_headers(total, next_cursor)
 
+        return await cached_json(request, gen, build)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching definitions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -245,104 +739,211 @@ async def get_definitions(
 @app.get("/api/relationships", response_model=List[Relationship])
 async def get_relationships(relationship_type: Optional[str] = None, limit: int = Query(None, ge=1)):
     """Get relationship mappings between entities."""
+    gen = current_generation()
     try:
         limit = limit or api_config.get("limits", {}).get("max_relationships_limit", 1000)
         max_limit = api_config.get("limits", {}).get("max_relationships_limit", 5000)
         limit = min(limit, max_limit)
 
-        rows = relationship_repo.get_relationships(relationship_type=relationship_type, limit=limit)
+        rows = await db_executor.run(
+            gen.relationship_repo.get_relationships, relationship_type=relationship_type, limit=limit
+        )
         return [Relationship(**row) for row in rows]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching relationships: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/search")
-async def search(q: str = Query(..., min_length=2, max_length=100), limit: int = Query(None, ge=1)):
-    """Search across all entities."""
+async def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    types: Optional[str] = Query(None, description="Comma-separated entity types (risk,control,definition)"),
+    fuzzy: bool = Query(False, description="Also match misspelled words through the trigram index"),
+    threshold: Optional[float] = Query(None, gt=0, le=1, description="Minimum trigram similarity (fuzzy only)"),
+):
+    """Search across all entities, ranked together by relevance."""
+    gen = current_generation()
+    if fuzzy and not await db_executor.run(
+        lambda: gen.search_repo.has_fts_index() and gen.search_repo.has_trigram_index()
+    ):
+        raise HTTPException(
+            status_code=404,
+            detail="This database was built without the trigram index; rebuild it to enable fuzzy search",
+        )
     try:
         limit = limit or api_config.get("limits", {}).get("search_limit", 50)
         max_limit = api_config.get("limits", {}).get("search_limit", 200)
         limit = min(limit, max_limit)
+        entity_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+
+        if fuzzy:
+            page = await db_executor.run(
+                gen.search_repo.search_fuzzy,
+                q,
+                threshold=threshold or FUZZY_THRESHOLD,
+                limit=limit,
+                offset=offset,
+                entity_types=entity_types,
+                max_expansions=FUZZY_MAX_EXPANSIONS,
+                max_candidates=FUZZY_MAX_CANDIDATES,
+            )
+        else:
+            page = await db_executor.run(
+                gen.search_repo.search_ranked, q, limit=limit, offset=offset, entity_types=entity_types
+            )
+
+        response = {
+            "query": q,
+            "results": page["results"],
+            "total": page["total"],
+            "limit": limit,
+            "offset": offset,
+        }
+        if fuzzy:
+            response["corrections"] = page["corrections"]
+        return response
 
-        results = []
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Search risks
-        risk_results = search_repo.search("risk", q, limit)
-        results.extend(risk_results)
 
-        # Search controls
-        control_results = search_repo.search("control", q, limit)
-        results.extend(control_results)
+@app.get("/api/search/index")
+async def get_search_index(request: Request):
+    """
+    Prebuilt inverted index over all entities, so the dashboard can answer typeahead in the browser.
 
-        # Search definitions
-        def_results = search_repo.search("definition", q, limit)
-        results.extend(def_results)
+    Built once per database generation and served from the response cache; the
+    ``version`` (database fingerprint) and ETag change only when the data does.
+    """
+    gen = current_generation()
 
-        return {"query": q, "results": results[:limit]}
+    def build():
+        index = gen.search_repo.get_client_index()
+        fingerprint = gen.fingerprint
+        index["version"] = fingerprint[:16] if fingerprint else str(gen.generation_id)
+        return index, {}
 
+    try:
+        return await cached_json(request, gen, build)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error searching: {e}")
+        logger.error(f"Error building search index: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/autocomplete")
+async def autocomplete(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    types: Optional[str] = Query(None, description="Comma-separated entity types (risk,control,definition)"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Complete a typed prefix to entity ids, titles and definition terms, most connected first."""
+    entity_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    unknown = [t for t in entity_types or () if t not in AUTOCOMPLETE_TYPES]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown type '{unknown[0]}'; choose from {', '.join(AUTOCOMPLETE_TYPES)}"
+        )
+    gen = current_generation()
+    try:
+        completions = await db_executor.run(gen.get_completions)
+        return {"prefix": prefix, "completions": completions.complete(prefix, entity_types, limit)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error completing prefix: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/stats", response_model=DatabaseStats)
-async def get_stats():
+async def get_stats(request: Request):
     """Get database statistics."""
+    gen = current_generation()
     try:
-        stats = stats_repo.get_stats()
-        return DatabaseStats(
-            total_risks=stats.get("total_risks", 0),
-            total_controls=stats.get("total_controls", 0),
-            total_definitions=stats.get("total_definitions", 0),
-            total_relationships=stats.get("total_relationships", 0),
-            database_version=stats.get("database_version"),
-        )
 
+        def build():
+            stats = gen.stats_repo.get_stats()
+            return (
+                DatabaseStats(
+                    total_risks=stats.get("total_risks", 0),
+                    total_controls=stats.get("total_controls", 0),
+                    total_definitions=stats.get("total_definitions", 0),
+                    total_relationships=stats.get("total_relationships", 0),
+                    database_version=stats.get("database_version"),
+                ).model_dump(),
+                {},
+            )
+
+        return await cached_json(request, gen, build)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/risks/summary")
-async def get_risks_summary():
+async def get_risks_summary(request: Request):
     """Get risks with control and question counts for dashboard tables."""
+    gen = current_generation()
     try:
-        all_risks = risk_repo.get_all()
-        risks = [
-            {
-                "risk_id": risk["id"],
-                "risk_title": risk["title"],
-                "risk_description": risk["description"],
-                "control_count": len(risk_repo.get_associated_controls(risk["id"])),
-            }
-            for risk in all_risks
-        ]
-        return {"details": risks}
 
+        def build():
+            risks = [
+                {
+                    "risk_id": risk["id"],
+                    "risk_title": risk["title"],
+                    "risk_description": risk["description"],
+                    "control_count": risk["control_count"],
+                }
+                for risk in gen.risk_repo.get_summary()
+            ]
+            attach_terms(gen, "risk", risks, "risk_id")
+            return {"details": risks}, {}
+
+        return await cached_json(request, gen, build)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching risks summary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/controls/summary")
-async def get_controls_summary():
+async def get_controls_summary(request: Request):
     """Get controls with risk and question counts for dashboard tables."""
+    gen = current_generation()
     try:
-        all_controls = control_repo.get_all()
-        controls = [
-            {
-                "control_id": control["id"],
-                "control_title": control["title"],
-                "control_description": control["description"],
-                "security_function": control["domain"],
-                "risk_count": len(control_repo.get_associated_risks(control["id"])),
-            }
-            for control in all_controls
-        ]
-        return {"details": controls}
 
+        def build():
+            controls = [
+                {
+                    "control_id": control["id"],
+                    "control_title": control["title"],
+                    "control_description": control["description"],
+                    "security_function": control["domain"],
+                    "risk_count": control["risk_count"],
+                }
+                for control in gen.control_repo.get_summary()
+            ]
+            attach_terms(gen, "control", controls, "control_id")
+            return {"details": controls}, {}
+
+        return await cached_json(request, gen, build)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching controls summary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -351,15 +952,27 @@ async def get_controls_summary():
 @app.get("/api/risk/{risk_id}")
 async def get_risk_detail(risk_id: str):
     """Get detailed risk information including associations."""
+    gen = current_generation()
     try:
-        risk = risk_repo.get_by_id(risk_id)
+
+        def load():
+            with gen.db_manager.get_db_connection():
+                risk = gen.risk_repo.get_by_id(risk_id)
+                if not risk:
+                    return None, [], None
+                return risk, gen.risk_repo.get_associated_controls(risk_id), load_terms(gen, "risk", [risk_id])
+
+        risk, associated_controls, terms = await db_executor.run(load)
         if not risk:
             raise HTTPException(status_code=404, detail=f"Risk {risk_id} not found")
 
-        return {
+        detail = {
             "risk": Risk(**risk),
-            "associated_controls": [Control(**c) for c in risk_repo.get_associated_controls(risk_id)],
+            "associated_controls": [Control(**c) for c in associated_controls],
         }
+        if terms is not None:
+            detail["terms"] = terms[risk_id]
+        return detail
 
     except HTTPException:
         raise
@@ -371,15 +984,28 @@ async def get_risk_detail(risk_id: str):
 @app.get("/api/control/{control_id}")
 async def get_control_detail(control_id: str):
     """Get detailed control information including associations."""
+    gen = current_generation()
     try:
-        control = control_repo.get_by_id(control_id)
+
+        def load():
+            with gen.db_manager.get_db_connection():
+                control = gen.control_repo.get_by_id(control_id)
+                if not control:
+                    return None, [], None
+                associated_risks = gen.control_repo.get_associated_risks(control_id)
+                return control, associated_risks, load_terms(gen, "control", [control_id])
+
+        control, associated_risks, terms = await db_executor.run(load)
         if not control:
             raise HTTPException(status_code=404, detail=f"Control {control_id} not found")
 
-        return {
+        detail = {
             "control": Control(**control),
-            "associated_risks": [Risk(**r) for r in control_repo.get_associated_risks(control_id)],
+            "associated_risks": [Risk(**r) for r in associated_risks],
         }
+        if terms is not None:
+            detail["terms"] = terms[control_id]
+        return detail
 
     except HTTPException:
         raise
@@ -388,42 +1014,480 @@ async def get_control_detail(control_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/risks/batch")
+async def get_risks_batch(batch: BatchRequest):
+    """Get detailed information for several risks at once, keyed by risk id."""
+    check_batch_size(batch.ids)
+    gen = current_generation()
+    try:
+        risks, associations, not_found = await db_executor.run(
+            load_batch, gen, batch.ids, gen.risk_repo.get_by_ids, gen.risk_repo.get_associated_controls_for
+        )
+        terms = await db_executor.run(load_terms, gen, "risk", list(risks))
+        details = {}
+        for risk_id, risk in risks.items():
+            details[risk_id] = {
+                "risk": Risk(**risk),
+                "associated_controls": [Control(**c) for c in associations.get(risk_id, [])],
+            }
+            if terms is not None:
+                details[risk_id]["terms"] = terms[risk_id]
+        return {"risks": details, "not_found": not_found}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching risk batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/controls/batch")
+async def get_controls_batch(batch: BatchRequest):
+    """Get detailed information for several controls at once, keyed by control id."""
+    check_batch_size(batch.ids)
+    gen = current_generation()
+    try:
+        controls, associations, not_found = await db_executor.run(
+            load_batch, gen, batch.ids, gen.control_repo.get_by_ids, gen.control_repo.get_associated_risks_for
+        )
+        terms = await db_executor.run(load_terms, gen, "control", list(controls))
+        details = {}
+        for control_id, control in controls.items():
+            details[control_id] = {
+                "control": Control(**control),
+                "associated_risks": [Risk(**r) for r in associations.get(control_id, [])],
+            }
+            if terms is not None:
+                details[control_id]["terms"] = terms[control_id]
+        return {"controls": details, "not_found": not_found}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching control batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class ExportResponse(StreamingResponse):
+    """
+    Streams an export, then closes it, unpins its generation and frees its export slot, however the response ends.
+
+    The request middleware unpins before the body streams, so the export holds
+    its own pin. Releasing here rather than in the body generator also covers a
+    client that disconnects before the first chunk, when the generator never
+    starts and its ``finally`` would never run.
+    """
+
+    def __init__(self, generation: DatabaseGeneration, chunks, **kwargs):
+        super().__init__(chunks, **kwargs)
+        self.generation = generation
+        self.chunks = chunks
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                # Returns the export's pooled connection now instead of when the generator is collected
+                self.chunks.close()
+            except ValueError:
+                # Still producing a chunk on a worker thread; the connection is returned when it is collected
+                pass
+            export_slots.release()
+            self.generation.release()
+
+
+@app.get("/api/export/{entity}")
+async def export_entity(
+    entity: str,
+    fmt: str = Query("ndjson", alias="format", description="ndjson, csv or xlsx"),
+):
+    """Stream every row of risks, controls, definitions or mappings (risk-control pairs with titles)."""
+    if entity not in EXPORT_QUERIES:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown export '{entity}'; choose from {', '.join(EXPORT_QUERIES)}"
+        )
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{fmt}'; choose from {', '.join(EXPORT_FORMATS)}")
+
+    if not export_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail=f"At most {EXPORT_MAX_CONCURRENT} exports can run at once; retry when one finishes",
+            headers={"Retry-After": "5"},
+        )
+
+    gen = current_generation()
+    media_type, extension = EXPORT_FORMATS[fmt]
+    fetch_size = int(api_config.get("export", {}).get("fetch_size", 1000))
+    gen.acquire()
+    return ExportResponse(
+        gen,
+        export_stream(gen.db_manager, entity, fmt, fetch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{extension}"'},
+    )
+
+
 @app.get("/api/file-metadata")
 async def get_file_metadata():
     """Get metadata about source files used to build the database."""
+    gen = current_generation()
     try:
-        metadata = stats_repo.get_file_metadata()
+        metadata = await db_executor.run(gen.stats_repo.get_file_metadata)
         return {m["data_type"]: m for m in metadata}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching file metadata: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/network")
-async def get_network_data():
+async def get_network_data(request: Request):
     """Get network data for relationship visualization."""
+    gen = current_generation()
     try:
-        return network_repo.get_network_data()
+        return await cached_json(request, gen, lambda: (gen.network_repo.get_network_data(), {}))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching network data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/gaps")
-async def get_gaps_analysis():
+async def get_gaps_analysis(request: Request):
     """Get critical gaps analysis - unmapped risks, controls, and questions."""
+    gen = current_generation()
     try:
-        return gaps_repo.get_gaps_analysis()
+        return await cached_json(request, gen, lambda: (gen.gaps_repo.get_gaps_analysis(), {}))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching gaps data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/coverage/matrix")
+async def get_coverage_matrix(request: Request, group_size: int = Query(1, ge=1, le=1000)):
+    """Mapping counts per control domain and risk (or run of ``group_size`` risks) for heatmaps."""
+    gen = current_generation()
+    try:
+        return await cached_json(request, gen, lambda: (gen.gaps_repo.get_coverage_matrix(group_size), {}))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building coverage matrix: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/analysis/single-points")
+async def get_single_points(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """Get risks covered by exactly one control and the controls that are sole coverage for the most risks."""
+    gen = current_generation()
+
+    def build():
+        data = gen.impact_repo.get_single_points(limit=limit, offset=offset)
+        return data, {"X-Total-Count": str(data["summary"]["single_control_risks"])}
+
+    try:
+        return await cached_json(request, gen, build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching single points of failure: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/control/{control_id}/impact")
+async def get_control_impact(control_id: str):
+    """Get the risks a control maps, split into those it alone covers and those other controls also cover."""
+    gen = current_generation()
+    try:
+        impact = await db_executor.run(gen.impact_repo.get_control_impact, control_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching control impact: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if impact is None:
+        raise HTTPException(status_code=404, detail="Control not found")
+    return impact
+
+
+@app.get("/api/rankings/{entity_type}")
+async def get_rankings(
+    request: Request,
+    entity_type: str,
+    metric: str = Query("pagerank", description=", ".join(RankingRepository.METRICS)),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """Rank risks or controls by a centrality score computed when the database was built."""
+    entity = entity_type.rstrip("s")
+    if entity not in RankingRepository.ENTITY_TABLES:
+        raise HTTPException(status_code=404, detail="Rankings are available for risks and controls")
+    if metric not in RankingRepository.METRICS:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown metric '{metric}'; choose from {', '.join(RankingRepository.METRICS)}"
+        )
+    gen = current_generation()
+    if not await db_executor.run(gen.ranking_repo.has_metrics):
+        raise HTTPException(
+            status_code=404, detail="This database was built without centrality metrics; rebuild it to enable rankings"
+        )
+
+    def build():
+        with gen.db_manager.get_db_connection():
+            rows = gen.ranking_repo.get_rankings(entity, metric, limit, offset, descending=order == "desc")
+            total = gen.ranking_repo.count(entity)
+        payload = {"entity_type": entity, "metric": metric, "order": order, "total": total, "rankings": rows}
+        return payload, {"X-Total-Count": str(total)}
+
+    try:
+        return await cached_json(request, gen, build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching rankings: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/graph/neighbors")
+async def get_graph_neighbors(
+    request: Request,
+    node_id: str = Query(..., alias="id", description="Risk or control id"),
+    hops: int = Query(1, ge=0, le=GRAPH_MAX_HOPS),
+    max_nodes: int = Query(GRAPH_MAX_NODES, ge=1, le=GRAPH_MAX_NODES),
+):
+    """Get the risks and controls within ``hops`` mappings of a node, with the mappings between them."""
+    gen = current_generation()
+    graph = await db_executor.run(gen.get_graph)
+    if node_id not in graph:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    try:
+        return await cached_json(request, gen, lambda: (graph.neighborhood(node_id, hops, max_nodes), {}))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching graph neighborhood: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/graph/components")
+async def get_graph_components(
+    request: Request,
+    min_size: int = Query(1, ge=1),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """Get connected components of the risk-control graph, largest first."""
+    gen = current_generation()
+
+    def build():
+        graph = gen.get_graph()
+        components = graph.components(min_size)
+        payload = {
+            "total": len(components),
+            "components": components[offset : offset + limit],
+            "graph": graph.get_stats(),
+        }
+        return payload, {"X-Total-Count": str(len(components))}
+
+    try:
+        return await cached_json(request, gen, build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching graph components: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/graph/components/{component}")
+async def get_graph_component(
+    request: Request, component: int, max_nodes: int = Query(GRAPH_MAX_NODES, ge=1, le=GRAPH_MAX_NODES)
+):
+    """Get the nodes and mappings of one connected component."""
+    gen = current_generation()
+    graph = await db_executor.run(gen.get_graph)
+    if not 0 <= component < len(graph.component_sizes):
+        raise HTTPException(status_code=404, detail=f"Component {component} not found")
+
+    def build():
+        members = graph.component_members(component)
+        subgraph = graph.subgraph([graph.ids[n] for n in members[:max_nodes]])
+        del subgraph["not_found"]
+        return {"component": component, **subgraph, "truncated": len(members) > max_nodes}, {}
+
+    try:
+        return await cached_json(request, gen, build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching graph component: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/graph/subgraph")
+async def get_graph_subgraph(batch: BatchRequest):
+    """Get the subgraph induced by a set of risk and control ids: those nodes and the mappings among them."""
+    if not batch.ids:
+        raise HTTPException(status_code=400, detail="At least one id is required")
+    if len(batch.ids) > GRAPH_MAX_NODES:
+        raise HTTPException(status_code=400, detail=f"At most {GRAPH_MAX_NODES} ids may be requested per subgraph")
+    gen = current_generation()
+    try:
+        graph = await db_executor.run(gen.get_graph)
+        return await db_executor.run(graph.subgraph, batch.ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching graph subgraph: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/optimize/cover")
+async def optimize_cover(cover: CoverRequest):
+    """
+    Find a near-minimal set of controls covering the given risks.
+
+    Optional ``costs`` weight controls (default 1 each) and ``exclude`` rules
+    controls out. Every chosen control lists the requested risks it covers, and
+    every risk lists the chosen controls covering it; risks with no eligible
+    control are reported as ``uncovered``.
+    """
+    if not cover.risk_ids:
+        raise HTTPException(status_code=400, detail="At least one risk id is required")
+    if len(cover.risk_ids) > GRAPH_MAX_NODES:
+        raise HTTPException(status_code=400, detail=f"At most {GRAPH_MAX_NODES} risks may be covered per request")
+    invalid = sorted(control_id for control_id, cost in cover.costs.items() if not cost > 0)
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Control costs must be positive: {', '.join(invalid)}")
+
+    gen = current_generation()
+    try:
+        graph = await db_executor.run(gen.get_graph)
+        return await db_executor.run(cover_risks, graph, cover.risk_ids, cover.costs, cover.exclude)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error optimizing control cover: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/scenarios/coverage")
+async def simulate_coverage(batch: ScenarioRequest):
+    """
+    Simulate risk coverage for a batch of what-if scenarios.
+
+    Each scenario starts from its ``implemented`` controls (default: every
+    mapped control), drops ``removed`` and adds ``planned``. The response gives
+    coverage before and after, the risks it newly uncovers or covers, and the
+    coverage change per control domain.
+    """
+    if not batch.scenarios:
+        raise HTTPException(status_code=400, detail="At least one scenario is required")
+    if len(batch.scenarios) > GRAPH_MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {GRAPH_MAX_SCENARIOS} scenarios may be run per request")
+
+    gen = current_generation()
+
+    def simulate():
+        graph = gen.get_graph()
+        return {
+            "total_risks": graph.risk_count,
+            "scenarios": [
+                run_scenario(graph, s.implemented, s.removed, s.planned, s.name or f"scenario-{i + 1}")
+                for i, s in enumerate(batch.scenarios)
+            ],
+        }
+
+    try:
+        return await db_executor.run(simulate)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error simulating coverage scenarios: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/{entity_type}/{entity_id}/similar")
+async def get_similar_entities(
+    entity_type: str,
+    entity_id: str,
+    similar_type: Optional[str] = Query(None, alias="type", description="Only return risks, controls or definitions"),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Risks, controls and definitions whose text is most similar to one entity (TF-IDF cosine)."""
+    tables = SimilarityRepository.ENTITY_TABLES
+    if entity_type not in tables:
+        raise HTTPException(status_code=404, detail="Similar entities are available for risk, control and definition")
+    if similar_type is not None and similar_type not in tables:
+        raise HTTPException(status_code=400, detail=f"Unknown type '{similar_type}'; choose from {', '.join(tables)}")
+    gen = current_generation()
+    if not await db_executor.run(gen.similarity_repo.has_similarities):
+        raise HTTPException(
+            status_code=404, detail="This database was built without similarity data; rebuild it to enable it"
+        )
+
+    try:
+        similar = await db_executor.run(gen.similarity_repo.get_similar, entity_type, entity_id, similar_type, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching similar entities: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if similar is None:
+        raise HTTPException(status_code=404, detail=f"{entity_type.capitalize()} {entity_id} not found")
+    return {"entity_type": entity_type, "entity_id": entity_id, "similar": similar}
+
+
+@app.get("/api/pool-stats")
+async def get_pool_stats():
+    """Get connection pool, executor and response cache counters."""
+    gen = current_generation()
+    return {
+        **gen.db_manager.get_pool_stats(),
+        "executor": db_executor.get_stats(),
+        "response_cache": response_cache.get_stats(),
+    }
+
+
+@app.post("/api/admin/reload")
+async def admin_reload(request: Request):
+    """Load the rebuilt database file as a new generation and switch to it without downtime."""
+    if not RELOAD_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin reload is disabled; set DB_RELOAD_TOKEN to enable it")
+    if not hmac.compare_digest(request.headers.get("x-admin-token", ""), RELOAD_ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    previous = active_generation.generation_id
+    try:
+        # Off the database workers, so a snapshot load does not hold up queries
+        generation = await asyncio.to_thread(reload_database)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Database reload failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}")
+
+    return {"previous_generation": previous, **generation.describe()}
+
+
 @app.get("/api/last-updated")
 async def get_last_updated():
     """Get last updated timestamps and file versions."""
+    gen = current_generation()
     try:
-        metadata_list = stats_repo.get_file_metadata()
+        metadata_list = await db_executor.run(gen.stats_repo.get_file_metadata)
         metadata = {row["data_type"]: row for row in metadata_list}
 
         def get_item(key):
@@ -438,14 +1502,13 @@ async def get_last_updated():
             "controls": get_item("controls"),
             "definitions": get_item("definitions"),
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting last updated data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-
-
-
 def main():
     """Main entry point."""
     logger.info(f"Starting AIML Database Service on {API_HOST}:{API_PORT}")
@@ -458,7 +1521,6 @@ def main():
 
     logger.info("Database validation successful.")
 
-
     logger.info("Starting server...")
 
     uvicorn.run("app:app", host=API_HOST, port=API_PORT, log_level="info", access_log=True)
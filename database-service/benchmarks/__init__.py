@@ -0,0 +1 @@
+"""Performance benchmarks for the database service (run manually, not part of the test suite)."""
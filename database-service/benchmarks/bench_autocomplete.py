@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark prefix autocomplete as the corpus grows.
+
+Builds synthetic databases of increasing size, loads the completion index and
+reports its build time, key count and the p50/p99 latency of completing one-
+to four-character prefixes. Lookup cost should stay flat as the corpus grows.
+
+Usage:
+    python benchmarks/bench_autocomplete.py [--scales 1 10 50] [--iterations 2000] [--limit 10]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import WORDS, build_synthetic_database  # noqa: E402
+from db.autocomplete import CompletionIndex  # noqa: E402
+from db.connections import DatabaseManager  # noqa: E402
+from db.graph import TaxonomyGraph  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50], help="Multiples of 100/1000/200 entities")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    prefixes = [word[:length] for word in WORDS for length in range(1, 5)]
+    print(f"{'entities':>10}{'keys':>10}{'build ms':>10}{'p50 us':>10}{'p99 us':>10}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = build_synthetic_database(
+                Path(tmp) / "bench.db", risks=100 * scale, controls=1000 * scale, definitions=200 * scale
+            )
+            manager = DatabaseManager(str(db_path))
+            index = CompletionIndex.load(manager, TaxonomyGraph.load(manager))
+            manager.close()
+
+        samples = []
+        for _ in range(args.iterations):
+            prefix = rng.choice(prefixes)
+            started = time.perf_counter()
+            index.complete(prefix, limit=args.limit)
+            samples.append((time.perf_counter() - started) * 1_000_000)
+        stats = index.get_stats()
+        print(
+            f"{stats['entities']:>10,}{stats['keys']:>10,}{stats['build_ms']:>10.0f}"
+            f"{percentile(samples, 50):>10.1f}{percentile(samples, 99):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression per endpoint.
+
+Requests each large JSON endpoint from the app on a synthetic database with
+``Accept-Encoding: identity``, ``gzip`` and (if installed) ``br``. Reports the
+bytes on the wire, the server-side p50 latency and the estimated end-to-end
+time at the given link speed (server time + bytes / bandwidth). The first
+request for each encoding fills the response cache, so the p50 is the steady
+state; pass ``--no-cache`` to compress on every request instead.
+
+Usage:
+    python benchmarks/bench_compression.py [--risks 500] [--controls 5000] [--mbps 100]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# common_config.py sits next to app.py in the container; use the repo copy when run from a checkout
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "shared-services"))
+
+from benchmarks.synthetic import build_synthetic_database  # noqa: E402
+
+ENDPOINTS = (
+    "/api/network",
+    "/api/gaps",
+    "/api/risks/summary",
+    "/api/controls/summary",
+    "/api/definitions?limit=1000",
+    "/api/controls?limit=1000",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--risks", type=int, default=500)
+    parser.add_argument("--controls", type=int, default=5000)
+    parser.add_argument("--definitions", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--mbps", type=float, default=100.0, help="Link speed used for the transfer estimate")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    import app as app_module
+    from api.compression import available_encodings
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = build_synthetic_database(
+            Path(tmp) / "bench.db", risks=args.risks, controls=args.controls, definitions=args.definitions
+        )
+        app_module.reinitialize_repositories(str(db_path))
+        app_module.RESPONSE_CACHE_ENABLED = not args.no_cache
+        app_module.HTTP_CACHE_ENABLED = False
+        bytes_per_ms = args.mbps * 1_000_000 / 8 / 1000
+
+        encodings = ("identity",) + tuple(reversed(available_encodings()))
+        print(f"{'endpoint':<30}{'encoding':<10}{'bytes':>12}{'ratio':>8}{'server p50 ms':>15}{'est. total ms':>15}")
+        with TestClient(app_module.app) as client:
+            for endpoint in ENDPOINTS:
+                identity_bytes = None
+                for encoding in encodings:
+                    headers = {"Accept-Encoding": encoding}
+                    wire = len(_wire_bytes(client, endpoint, headers))
+                    samples = []
+                    for _ in range(args.iterations):
+                        started = time.perf_counter()
+                        client.get(endpoint, headers=headers)
+                        samples.append((time.perf_counter() - started) * 1000)
+                    server = statistics.median(samples)
+                    identity_bytes = identity_bytes or wire
+                    print(
+                        f"{endpoint:<30}{encoding:<10}{wire:>12,}{identity_bytes / wire:>8.1f}"
+                        f"{server:>15.2f}{server + wire / bytes_per_ms:>15.2f}"
+                    )
+
+
+def _wire_bytes(client, endpoint, headers):
+    """The response body exactly as sent, before any client-side decoding."""
+    with client.stream("GET", endpoint, headers=headers) as response:
+        return b"".join(response.iter_raw())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark the snapshot backend against the SQLite backend.
+
+Runs the repository calls behind the detail, list and summary endpoints on a
+synthetic database and reports p50/p99 latency per backend.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--risks 500] [--controls 5000] [--iterations 2000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import build_synthetic_database  # noqa: E402
+from db.connections import DatabaseManager  # noqa: E402
+from db.repositories import RiskRepository, ControlRepository, GapsRepository  # noqa: E402
+from db.snapshot import (  # noqa: E402
+    DataSnapshot,
+    SnapshotRiskRepository,
+    SnapshotControlRepository,
+    SnapshotGapsRepository,
+)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_call(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--risks", type=int, default=500)
+    parser.add_argument("--controls", type=int, default=5000)
+    parser.add_argument("--definitions", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = build_synthetic_database(
+            Path(tmp) / "bench.db", risks=args.risks, controls=args.controls, definitions=args.definitions
+        )
+        manager = DatabaseManager(str(db_path))
+        snapshot = DataSnapshot.load(manager)
+        print(f"Snapshot load: {snapshot.load_ms} ms for {snapshot.stats}")
+
+        backends = {
+            "sqlite": (RiskRepository(manager), ControlRepository(manager), GapsRepository(manager)),
+            "snapshot": (
+                SnapshotRiskRepository(manager, snapshot),
+                SnapshotControlRepository(manager, snapshot),
+                SnapshotGapsRepository(manager, snapshot),
+            ),
+        }
+        rng = random.Random(7)
+        risk_ids = snapshot.risk_ids
+        control_ids = snapshot.control_ids
+
+        print(f"\n{'operation':<28}{'backend':<10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, make_call, iterations in (
+            (
+                "risk detail",
+                lambda r, c, g: lambda: (
+                    r.get_by_id(rng.choice(risk_ids)),
+                    r.get_associated_controls(rng.choice(risk_ids)),
+                ),
+                args.iterations,
+            ),
+            (
+                "control detail",
+                lambda r, c, g: lambda: (
+                    c.get_by_id(rng.choice(control_ids)),
+                    c.get_associated_risks(rng.choice(control_ids)),
+                ),
+                args.iterations,
+            ),
+            (
+                "controls list (100)",
+                lambda r, c, g: lambda: c.get_all(limit=100, offset=rng.randrange(len(control_ids))),
+                args.iterations,
+            ),
+            ("controls by domain", lambda r, c, g: lambda: c.get_all(limit=100, domain="Detect"), args.iterations),
+            ("risks summary", lambda r, c, g: r.get_summary, max(args.iterations // 20, 20)),
+            ("controls summary", lambda r, c, g: c.get_summary, max(args.iterations // 20, 20)),
+            ("gaps", lambda r, c, g: g.get_gaps_analysis, max(args.iterations // 20, 20)),
+        ):
+            for backend, repos in backends.items():
+                samples = time_call(make_call(*repos), iterations)
+                print(f"{name:<28}{backend:<10}{statistics.median(samples):>10.4f}{percentile(samples, 99):>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
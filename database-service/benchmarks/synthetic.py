@@ -0,0 +1,97 @@
+"""
+Synthetic database generator for benchmarks.
+
+Builds a database with the same schema the data processing service produces,
+sized by the number of risks, controls and definitions requested.
+"""
+
+import random
+import sqlite3
+from pathlib import Path
+
+WORDS = (
+    "model data training adversarial privacy bias drift inference pipeline access audit "
+    "encryption monitoring governance supply chain poisoning evaluation robustness logging "
+    "explainability fairness deployment validation retention consent leakage prompt injection "
+    "hallucination oversight lineage provenance incident response threat testing"
+).split()
+
+
+def _sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+
+
+def build_synthetic_database(
+    db_path: Path,
+    risks: int = 500,
+    controls: int = 5000,
+    definitions: int = 1000,
+    mappings_per_control: int = 3,
+    seed: int = 42,
+) -> Path:
+    """Create (or replace) a synthetic database at ``db_path``."""
+    rng = random.Random(seed)
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("CREATE TABLE risks (risk_id TEXT PRIMARY KEY, risk_title TEXT NOT NULL, risk_description TEXT)")
+    cursor.execute(
+        "CREATE TABLE controls (control_id TEXT PRIMARY KEY, control_title TEXT NOT NULL, "
+        "control_description TEXT, asset_type TEXT, control_type TEXT, security_function TEXT, maturity_level TEXT)"
+    )
+    cursor.execute(
+        "CREATE TABLE definitions (definition_id TEXT PRIMARY KEY, term TEXT NOT NULL, title TEXT NOT NULL, "
+        "description TEXT, category TEXT, source TEXT)"
+    )
+    cursor.execute("CREATE TABLE risk_control_mapping (risk_id TEXT NOT NULL, control_id TEXT NOT NULL)")
+    cursor.execute(
+        "CREATE TABLE file_metadata (data_type TEXT, filename TEXT, file_exists BOOLEAN, file_size INTEGER, "
+        "file_modified_time TIMESTAMP, version TEXT)"
+    )
+
+    risk_ids = [f"R.AIR.{i:04d}" for i in range(1, risks + 1)]
+    cursor.executemany(
+        "INSERT INTO risks VALUES (?, ?, ?)",
+        [(rid, _sentence(rng, 4), _sentence(rng, 25)) for rid in risk_ids],
+    )
+
+    functions = ["Govern", "Identify", "Protect", "Detect", "Respond", "Recover"]
+    control_rows = []
+    mapping_rows = set()
+    for i in range(1, controls + 1):
+        control_id = f"C.AIC{i % 40}.{i}"
+        control_rows.append(
+            (control_id, _sentence(rng, 5), _sentence(rng, 30), "Model", "Preventive", rng.choice(functions), "Basic")
+        )
+        for risk_id in rng.sample(risk_ids, min(mappings_per_control, len(risk_ids))):
+            mapping_rows.add((risk_id, control_id))
+    cursor.executemany("INSERT INTO controls VALUES (?, ?, ?, ?, ?, ?, ?)", control_rows)
+    cursor.executemany("INSERT INTO risk_control_mapping VALUES (?, ?)", sorted(mapping_rows))
+
+    categories = ["Security", "Privacy", "Governance", "Fairness", "Operations"]
+    cursor.executemany(
+        "INSERT INTO definitions VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                f"DEF.{i:05d}",
+                f"{rng.choice(WORDS).title()} {i}",
+                f"{rng.choice(WORDS).title()} {i}",
+                _sentence(rng, 20),
+                rng.choice(categories),
+                "Synthetic",
+            )
+            for i in range(1, definitions + 1)
+        ],
+    )
+    cursor.executemany(
+        "INSERT INTO file_metadata VALUES (?, ?, ?, ?, ?, ?)",
+        [(t, f"{t}.xlsx", True, 1024, "2025-01-01 00:00:00", "v1") for t in ("risks", "controls", "definitions")],
+    )
+    cursor.execute("CREATE INDEX idx_rcm_risk ON risk_control_mapping (risk_id)")
+    cursor.execute("CREATE INDEX idx_rcm_control ON risk_control_mapping (control_id)")
+    conn.commit()
+    conn.close()
+    return db_path
@@ -0,0 +1,156 @@
+"""In-process prefix autocomplete over entity ids, titles and definition terms."""
+
+import heapq
+import re
+import time
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .connections import DatabaseManager
+from .graph import CONTROL, RISK, TaxonomyGraph
+
+ENTITY_TYPES = ("risk", "control", "definition")
+
+# Sorts after every character a normalized key can contain
+_KEY_END = "\U0010ffff"
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase words joined by single spaces: ``"AIR.001"`` -> ``"air 001"``."""
+    return _SEPARATORS.sub(" ", (text or "").lower()).strip()
+
+
+class _TypeIndex:
+    """
+    Sorted completion keys of one entity type with a range-minimum sparse table.
+
+    Entities are numbered best first, so the entity number is the priority.
+    ``table[j][i]`` is the key position with the lowest entity number in
+    ``[i, i + 2**j)``, so the best key of any range is found in O(1).
+    """
+
+    def __init__(self, keys: List[Tuple[str, int]]):
+        """``keys`` are (normalized key, entity number)."""
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.entities = array("i", (entity for _, entity in keys))
+        self.table = [array("i", range(len(keys)))]
+        span = 1
+        while span * 2 <= len(keys):
+            previous, entities = self.table[-1], self.entities
+            self.table.append(
+                array("i", (a if entities[a] <= entities[b] else b for a, b in zip(previous, previous[span:])))
+            )
+            span *= 2
+
+    def _best(self, lo: int, hi: int) -> int:
+        level = (hi - lo).bit_length() - 1
+        a, b = self.table[level][lo], self.table[level][hi - (1 << level)]
+        return a if self.entities[a] <= self.entities[b] else b
+
+    def matches(self, prefix: str) -> Iterator[int]:
+        """
+        Yield the entity numbers of keys starting with ``prefix``, best first.
+
+        Binary search finds the key range in O(log n); each further match costs
+        one heap operation over the sub-ranges left and right of the last one.
+        An entity reached through several keys is yielded once per key.
+        """
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _KEY_END, lo)
+        if lo >= hi:
+            return
+        best = self._best(lo, hi)
+        heap = [(self.entities[best], best, lo, hi)]
+        while heap:
+            entity, position, lo, hi = heapq.heappop(heap)
+            yield entity
+            for start, end in ((lo, position), (position + 1, hi)):
+                if start < end:
+                    best = self._best(start, end)
+                    heapq.heappush(heap, (self.entities[best], best, start, end))
+
+
+class CompletionIndex:
+    """
+    Prefix completions for risks, controls and definitions, ranked by a static popularity score.
+
+    Every entity is reachable by its id, its title (term, for definitions) and
+    each word-start suffix of the title, all normalized with :func:`normalize`,
+    so "poison" completes "Data Poisoning". Entities get one global priority
+    from their score (mapping degree for risks and controls, the number of
+    risks and controls using the term for definitions), breaking ties by
+    title. Lookups take O(log n + k log k) for k completions, whatever the
+    size of the prefix's range. Built once per database generation and
+    read-only afterwards.
+    """
+
+    def __init__(self, entities: Sequence[Tuple[str, str, Optional[str], int]]):
+        """``entities`` are (entity_type, entity_id, title, score)."""
+        started = time.perf_counter()
+        ranked = sorted(entities, key=lambda e: (-e[3], normalize(e[2]), ENTITY_TYPES.index(e[0]), e[1]))
+        self.entities: List[Tuple[str, str, Optional[str], int]] = ranked
+
+        keys: Dict[str, List[Tuple[str, int]]] = {entity_type: [] for entity_type in ENTITY_TYPES}
+        for number, (entity_type, entity_id, title, _) in enumerate(ranked):
+            entity_keys = {normalize(entity_id)}
+            words = normalize(title).split()
+            entity_keys.update(" ".join(words[start:]) for start in range(len(words)))
+            entity_keys.discard("")
+            keys[entity_type].extend((key, number) for key in entity_keys)
+        self.types = {entity_type: _TypeIndex(type_keys) for entity_type, type_keys in keys.items()}
+        self.key_count = sum(len(index.keys) for index in self.types.values())
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    @classmethod
+    def load(cls, db_manager: DatabaseManager, graph: TaxonomyGraph) -> "CompletionIndex":
+        """Risks and controls come from the generation's graph; definitions and term usage from SQLite."""
+        entities = [
+            (RISK if node < graph.risk_count else CONTROL, graph.ids[node], graph.titles[node], graph.degree(node))
+            for node in range(len(graph))
+        ]
+        with db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0] for row in cursor.fetchall()}
+            usage: Dict[str, int] = {}
+            if "term_occurrences" in tables:
+                cursor.execute(
+                    "SELECT definition_id, COUNT(DISTINCT entity_type || ':' || entity_id) FROM term_occurrences "
+                    "GROUP BY definition_id"
+                )
+                usage = {row[0]: row[1] for row in cursor.fetchall()}
+            if "definitions" in tables:
+                cursor.execute("SELECT definition_id, term FROM definitions")
+                entities.extend(("definition", row[0], row[1], usage.get(row[0], 0)) for row in cursor.fetchall())
+        return cls(entities)
+
+    def complete(
+        self, prefix: str, entity_types: Optional[Sequence[str]] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        The ``limit`` best entities with a key starting with ``prefix``, best first.
+
+        Each requested type yields its matches best first; the streams are
+        merged on the shared entity numbering and duplicates (several keys of one
+        entity) are skipped.
+        """
+        normalized = normalize(prefix)
+        if not normalized or limit <= 0:
+            return []
+        streams = [self.types[t].matches(normalized) for t in (entity_types or ENTITY_TYPES) if t in self.types]
+        completions, seen = [], set()
+        for number in heapq.merge(*streams):
+            if number in seen:
+                continue
+            seen.add(number)
+            entity_type, entity_id, title, score = self.entities[number]
+            completions.append({"entity_type": entity_type, "entity_id": entity_id, "title": title, "score": score})
+            if len(completions) == limit:
+                break
+        return completions
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entities": len(self.entities), "keys": self.key_count, "build_ms": self.build_ms}
@@ -1,30 +1,199 @@
 """Database connection managers and initialization."""
 
+import queue
 import sqlite3
 import logging
+import threading
+import time
 from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List
+
 from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
 
 class DatabaseManager:
-    """Manages database connections and initialization."""
+    """
+    Manages a pool of long-lived, read-only SQLite connections.
+
+    Connections are opened lazily with ``mode=ro`` and kept alive between
+    requests so the connection setup and SQLite's prepared-statement cache are
+    reused. A thread that already holds a connection gets the same one back on
+    nested checkouts, so every repository call made while serving one request
+    shares a single connection.
+    """
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        max_connections: int = 10,
+        timeout: float = 30,
+        cached_statements: int = 256,
+    ):
         self.db_path = db_path
+        self.max_connections = max(1, int(max_connections))
+        self.timeout = float(timeout)
+        self.cached_statements = int(cached_statements)
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open_connections: List[sqlite3.Connection] = []
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "hits": 0,
+            "misses": 0,
+            "waits": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "timeouts": 0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new read-only connection to the database file."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        with self._lock:
+            self._open_connections.append(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close a connection and forget about it."""
+        with self._lock:
+            if conn in self._open_connections:
+                self._open_connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _checkout(self) -> sqlite3.Connection:
+        """Take a connection from the pool, opening one if none is idle."""
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise HTTPException(status_code=503, detail="Database connection pool exhausted")
+        waited_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            conn = self._idle.get_nowait()
+            hit = True
+        except queue.Empty:
+            try:
+                conn = self._connect()
+            except sqlite3.Error:
+                self._slots.release()
+                raise
+            hit = False
+
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["hits" if hit else "misses"] += 1
+            if waited_ms >= 1.0:
+                self._stats["waits"] += 1
+            self._stats["total_wait_ms"] += waited_ms
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], waited_ms)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection, broken: bool = False) -> None:
+        """Return a connection to the pool, closing it if it misbehaved."""
+        if broken or self._closed:
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+        self._slots.release()
 
     @contextmanager
     def get_db_connection(self):
         """Context manager for main database connections."""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            # Nested checkout on the same thread: share the held connection
+            try:
+                yield held
+            except sqlite3.Error as e:
+                logger.error(f"Database error: {e}")
+                raise HTTPException(status_code=500, detail=f"Database error: {e}")
+            return
+
+        broken = False
         conn = None
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn = self._checkout()
+            self._local.conn = conn
             yield conn
         except sqlite3.Error as e:
+            broken = True
             logger.error(f"Database error: {e}")
             raise HTTPException(status_code=500, detail=f"Database error: {e}")
         finally:
-            if conn:
-                conn.close()
+            if conn is not None:
+                self._local.conn = None
+                self._release(conn, broken=broken)
+
+    @contextmanager
+    def checkout_connection(self):
+        """
+        Check out a pooled connection that is not bound to the current thread.
+
+        For work that moves between threads while it holds the connection, such
+        as a streamed response iterated from a thread pool. Nested
+        ``get_db_connection`` calls do not share it.
+        """
+        broken = False
+        conn = self._checkout()
+        try:
+            yield conn
+        except sqlite3.Error as e:
+            broken = True
+            logger.error(f"Database error: {e}")
+            raise
+        finally:
+            self._release(conn, broken=broken)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool counters for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            open_connections = len(self._open_connections)
+        idle = self._idle.qsize()
+        checkouts = stats["checkouts"]
+        stats.update(
+            {
+                "max_connections": self.max_connections,
+                "open_connections": open_connections,
+                "idle_connections": idle,
+                "in_use_connections": max(open_connections - idle, 0),
+                "hit_ratio": round(stats["hits"] / checkouts, 4) if checkouts else 0.0,
+                "avg_wait_ms": round(stats["total_wait_ms"] / checkouts, 4) if checkouts else 0.0,
+                "total_wait_ms": round(stats["total_wait_ms"], 4),
+                "max_wait_ms": round(stats["max_wait_ms"], 4),
+            }
+        )
+        return stats
+
+    def close_all(self) -> None:
+        """Close every idle pooled connection."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def close(self) -> None:
+        """Close the pool: idle connections now, checked-out ones when they are returned."""
+        self._closed = True
+        self.close_all()
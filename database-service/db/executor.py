@@ -0,0 +1,56 @@
+"""Bounded executor that keeps blocking SQLite work off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DatabaseExecutor:
+    """
+    Runs repository calls on a fixed-size thread pool.
+
+    The pool is sized to the connection pool, so at most one worker waits on
+    each connection and the event loop stays free to accept and answer other
+    requests while queries run. Context variables (such as the generation a
+    request is pinned to) are carried over to the worker thread.
+    """
+
+    def __init__(self, max_workers: int = 10):
+        self.max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db-worker")
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "running": 0, "max_running": 0}
+
+    def _call(self, context: contextvars.Context, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._stats["running"] += 1
+            self._stats["max_running"] = max(self._stats["max_running"], self._stats["running"])
+        try:
+            return context.run(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._stats["running"] -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on a worker thread and await its result."""
+        with self._lock:
+            self._stats["submitted"] += 1
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._call, contextvars.copy_context(), fn, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return executor counters for monitoring."""
+        with self._lock:
+            return {"max_workers": self.max_workers, **self._stats}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
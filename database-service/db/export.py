@@ -0,0 +1,109 @@
+"""Streaming bulk export of whole tables as NDJSON, CSV or XLSX."""
+
+import csv
+import io
+import json
+import tempfile
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .connections import DatabaseManager
+
+# Entity name -> query; rows are exported with every column the query returns
+EXPORT_QUERIES: Dict[str, str] = {
+    "risks": "SELECT * FROM risks ORDER BY risk_id",
+    "controls": "SELECT * FROM controls ORDER BY control_id",
+    "definitions": "SELECT * FROM definitions ORDER BY term, definition_id",
+    "mappings": """
+        SELECT m.risk_id, r.risk_title, m.control_id, c.control_title, c.security_function
+        FROM risk_control_mapping m
+        LEFT JOIN risks r ON r.risk_id = m.risk_id
+        LEFT JOIN controls c ON c.control_id = m.control_id
+        ORDER BY m.risk_id, m.control_id
+    """,
+}
+
+# Format -> (media type, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+# Bytes read from the finished XLSX file per streamed chunk
+XLSX_CHUNK_SIZE = 64 * 1024
+
+Batches = Iterator[List[Sequence[Any]]]
+
+
+def ndjson_chunks(columns: List[str], batches: Batches) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows).encode()
+
+
+def csv_chunks(columns: List[str], batches: Batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def xlsx_chunks(columns: List[str], batches: Batches, sheet: str = "export") -> Iterator[bytes]:
+    """
+    Write rows to a write-only workbook, then stream the saved file.
+
+    XLSX is a zip archive with its directory at the end, so nothing can be sent
+    before the last row is written. Memory still stays flat: openpyxl's
+    write-only mode spools rows to temporary files.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet)
+    worksheet.append(columns)
+    for rows in batches:
+        for row in rows:
+            worksheet.append(list(row))
+
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while True:
+            chunk = spool.read(XLSX_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+WRITERS = {"ndjson": ndjson_chunks, "csv": csv_chunks, "xlsx": xlsx_chunks}
+
+
+def export_stream(db_manager: DatabaseManager, entity: str, fmt: str, fetch_size: int = 1000) -> Iterator[bytes]:
+    """
+    Byte chunks of ``entity`` exported as ``fmt``, read from a cursor ``fetch_size`` rows at a time.
+
+    A pooled connection is checked out on the first chunk and returned when the
+    generator finishes or is closed (e.g. when the client disconnects).
+    """
+    with db_manager.checkout_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXPORT_QUERIES[entity])
+        columns = [d[0] for d in cursor.description]
+
+        def batches() -> Batches:
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    return
+                yield [tuple(row) for row in rows]
+
+        try:
+            kwargs = {"sheet": entity} if fmt == "xlsx" else {}
+            yield from WRITERS[fmt](columns, batches(), **kwargs)
+        finally:
+            cursor.close()
@@ -0,0 +1,29 @@
+"""Content fingerprint of the database file, used as the HTTP validator."""
+
+import hashlib
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_fingerprint(db_path: str) -> Optional[str]:
+    """
+    SHA-256 of the database file contents, or None if the file cannot be read.
+
+    Computed once per database generation when it is built, never on the
+    request path: a generation's fingerprint describes the data it was loaded
+    from, even after the file at ``db_path`` has been replaced.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(db_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError as e:
+        logger.error(f"Failed to fingerprint database {db_path}: {e}")
+        return None
+    logger.info(f"Database fingerprint: {digest.hexdigest()[:16]}")
+    return digest.hexdigest()
@@ -0,0 +1,196 @@
+"""Database generations for zero-downtime reloads of the database file."""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .autocomplete import CompletionIndex
+from .connections import DatabaseManager
+from .graph import TaxonomyGraph
+from .snapshot import DataSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseGeneration:
+    """
+    One loaded database file: its connection pool, repositories and snapshot.
+
+    Requests pin the generation that was active when they started. When a newer
+    generation is activated the old one is retired, and its pool is closed once
+    the last request pinned to it has finished.
+    """
+
+    def __init__(
+        self,
+        generation_id: int,
+        db_path: str,
+        db_manager: DatabaseManager,
+        repositories: Dict[str, Any],
+        snapshot: Optional[DataSnapshot] = None,
+        fingerprint: Optional[str] = None,
+    ):
+        self.generation_id = generation_id
+        self.db_path = db_path
+        self.db_manager = db_manager
+        self.snapshot = snapshot
+        self._fingerprint = fingerprint
+        self.loaded_at = time.time()
+        for name, repo in repositories.items():
+            setattr(self, name, repo)
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._retired = False
+
+        # Last readiness check (validation, stats, fingerprint), refreshed in the background
+        self.readiness: Optional[Dict[str, Any]] = None
+        self.readiness_refresh = threading.Lock()
+
+        # Risk-control graph, built on first use (or when the generation is warmed)
+        self._graph: Optional[TaxonomyGraph] = None
+        self._graph_lock = threading.Lock()
+        # Autocomplete keys, built on first use from the graph (or when the generation is warmed)
+        self._completions: Optional[CompletionIndex] = None
+        self._completions_lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Pin this generation for the duration of a request."""
+        with self._lock:
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Unpin after a request; closes the pool if this was the last request on a retired generation."""
+        with self._lock:
+            self._in_flight -= 1
+            close = self._retired and self._in_flight == 0
+        if close:
+            self._close()
+
+    def retire(self) -> None:
+        """Stop serving new requests from this generation and close it once drained."""
+        with self._lock:
+            self._retired = True
+            close = self._in_flight == 0
+        if close:
+            self._close()
+
+    def get_graph(self) -> TaxonomyGraph:
+        """The CSR graph of this generation's mappings, built once from the snapshot or SQLite."""
+        if self._graph is None:
+            with self._graph_lock:
+                if self._graph is None:
+                    if self.snapshot is not None:
+                        self._graph = TaxonomyGraph.from_snapshot(self.snapshot)
+                    else:
+                        self._graph = TaxonomyGraph.load(self.db_manager)
+                    logger.info(
+                        f"Graph for generation {self.generation_id} built in {self._graph.build_ms} ms: "
+                        f"{len(self._graph)} nodes, {self._graph.edge_count} edges"
+                    )
+        return self._graph
+
+    def get_completions(self) -> CompletionIndex:
+        """The prefix autocomplete index of this generation's entities, built once."""
+        if self._completions is None:
+            graph = self.get_graph()
+            with self._completions_lock:
+                if self._completions is None:
+                    self._completions = CompletionIndex.load(self.db_manager, graph)
+                    stats = self._completions.get_stats()
+                    logger.info(
+                        f"Autocomplete for generation {self.generation_id} built in {stats['build_ms']} ms: "
+                        f"{stats['entities']} entities, {stats['keys']} keys"
+                    )
+        return self._completions
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """SHA-256 of the file this generation was loaded from, fixed when it was built."""
+        return self._fingerprint
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _close(self) -> None:
+        logger.info(f"Closing database generation {self.generation_id} ({self.db_path})")
+        self.db_manager.close()
+
+    def describe(self) -> Dict[str, Any]:
+        """Summary of this generation for health and admin responses."""
+        fingerprint = self.fingerprint
+        return {
+            "generation": self.generation_id,
+            "database_path": self.db_path,
+            "fingerprint": fingerprint[:16] if fingerprint else None,
+            "loaded_at": self.loaded_at,
+            "snapshot": self.snapshot is not None,
+        }
+
+
+class DatabaseWatcher:
+    """
+    Polls the database file and calls ``on_change`` after it has been replaced.
+
+    A change is only reported once the file's inode, size and modification time
+    have been stable for one full poll interval, so a file that is still being
+    written is not picked up half-way.
+    """
+
+    def __init__(self, get_path: Callable[[], str], on_change: Callable[[], Any], interval: float = 5.0):
+        self.get_path = get_path
+        self.on_change = on_change
+        self.interval = float(interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _stat_key(path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="database-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        path = self.get_path()
+        loaded = self._stat_key(path)
+        pending = None
+        while not self._stop.wait(self.interval):
+            if self.get_path() != path:
+                # Another path was activated (e.g. by an admin reload); follow it
+                path = self.get_path()
+                loaded, pending = self._stat_key(path), None
+                continue
+
+            current = self._stat_key(path)
+            if current is None or current == loaded:
+                pending = None
+                continue
+            if current != pending:
+                pending = current
+                continue
+
+            try:
+                self.on_change()
+                loaded = current
+            except Exception as e:
+                logger.error(f"Database reload failed, keeping the active generation: {e}")
+                loaded = current
+            pending = None
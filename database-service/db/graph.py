@@ -0,0 +1,256 @@
+"""In-process risk-control graph in compressed sparse row (CSR) form."""
+
+import logging
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .connections import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+RISK = "risk"
+CONTROL = "control"
+
+
+class TaxonomyGraph:
+    """
+    The bipartite risk-control mapping graph, indexed for neighbourhood queries.
+
+    Nodes are numbered risks first (in id order), then controls. Forward
+    adjacency (risk -> controls) and reverse adjacency (control -> risks) are
+    CSR arrays: node ``i``'s row is ``targets[offsets[i]:offsets[i + 1]]``.
+    Connected components are labelled once at build time. The graph is built
+    once per database generation and is read-only afterwards.
+    """
+
+    def __init__(
+        self,
+        risks: Sequence[Tuple[str, Optional[str]]],
+        controls: Sequence[Tuple[str, Optional[str], Optional[str]]],
+        edges: Iterable[Tuple[str, str]],
+    ):
+        """``risks`` are (id, title), ``controls`` (id, title, security_function), ``edges`` (risk_id, control_id)."""
+        started = time.perf_counter()
+        risks = sorted(risks)
+        controls = sorted(controls)
+        self.risk_count = len(risks)
+        self.ids: List[str] = [r[0] for r in risks] + [c[0] for c in controls]
+        self.titles: List[Optional[str]] = [r[1] for r in risks] + [c[1] for c in controls]
+        # An empty security function is no domain, as NULLIF(security_function, '') treats it in SQL
+        self.domains: List[Optional[str]] = [None] * len(risks) + [c[2] or None for c in controls]
+        self.index: Dict[str, int] = {}
+        for node, node_id in enumerate(self.ids):
+            self.index.setdefault(node_id, node)
+
+        pairs = set()
+        dropped = 0
+        for risk_id, control_id in edges:
+            source, target = self.index.get(risk_id), self.index.get(control_id)
+            if source is None or target is None or source >= self.risk_count or target < self.risk_count:
+                dropped += 1
+                continue
+            pairs.add((source, target))
+        if dropped:
+            logger.warning(f"Graph: skipped {dropped} mappings whose risk or control does not exist")
+        self.edge_count = len(pairs)
+
+        self.fwd_offsets, self.fwd_targets = self._csr(pairs, len(self.ids))
+        self.rev_offsets, self.rev_targets = self._csr(((t, s) for s, t in pairs), len(self.ids))
+
+        # Risks each control covers as a bitset over risk node numbers, for set-cover searches
+        self.coverage: List[int] = [0] * (len(self.ids) - self.risk_count)
+        for source, target in pairs:
+            self.coverage[target - self.risk_count] |= 1 << source
+        # Risks covered by the full mapping, and by each control domain (security function)
+        self.covered = 0
+        self.domain_coverage: Dict[Optional[str], int] = {}
+        for offset, bits in enumerate(self.coverage):
+            domain = self.domains[self.risk_count + offset]
+            self.covered |= bits
+            self.domain_coverage[domain] = self.domain_coverage.get(domain, 0) | bits
+
+        self.component = array("i", [-1] * len(self.ids))
+        self.component_sizes: List[Tuple[int, int]] = []
+        self._label_components()
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    @staticmethod
+    def _csr(pairs: Iterable[Tuple[int, int]], node_count: int) -> Tuple[array, array]:
+        """Offsets and targets for (source, target) pairs; each row's targets come out sorted."""
+        pairs = sorted(pairs)
+        offsets = array("i", [0] * (node_count + 1))
+        for source, _ in pairs:
+            offsets[source + 1] += 1
+        for node in range(node_count):
+            offsets[node + 1] += offsets[node]
+        targets = array("i", [0] * len(pairs))
+        fill = array("i", offsets[:-1])
+        for source, target in pairs:
+            targets[fill[source]] = target
+            fill[source] += 1
+        return offsets, targets
+
+    @classmethod
+    def load(cls, db_manager: DatabaseManager) -> "TaxonomyGraph":
+        """Build the graph from the risks, controls and risk_control_mapping tables."""
+        with db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT risk_id, risk_title FROM risks")
+            risks = [tuple(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT control_id, control_title, security_function FROM controls")
+            controls = [tuple(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT risk_id, control_id FROM risk_control_mapping")
+            edges = [tuple(row) for row in cursor.fetchall()]
+        return cls(risks, controls, edges)
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "TaxonomyGraph":
+        """Build the graph from an already loaded DataSnapshot without touching SQLite."""
+        risks = [(r["id"], r["title"]) for r in snapshot.risks_by_id.values()]
+        controls = [(c["id"], c["title"], c["domain"]) for c in snapshot.controls_by_id.values()]
+        edges = ((m["source_id"], m["target_id"]) for m in snapshot.mappings)
+        return cls(risks, controls, edges)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.index
+
+    def neighbors(self, node: int) -> Iterable[int]:
+        """Adjacent nodes: a risk's controls or a control's risks."""
+        yield from self.fwd_targets[self.fwd_offsets[node] : self.fwd_offsets[node + 1]]
+        yield from self.rev_targets[self.rev_offsets[node] : self.rev_offsets[node + 1]]
+
+    def degree(self, node: int) -> int:
+        return self.fwd_offsets[node + 1] - self.fwd_offsets[node] + self.rev_offsets[node + 1] - self.rev_offsets[node]
+
+    def _label_components(self) -> None:
+        sizes = []
+        for start in range(len(self.ids)):
+            if self.component[start] != -1:
+                continue
+            label = len(sizes)
+            self.component[start] = label
+            frontier, risks, controls = [start], 0, 0
+            while frontier:
+                node = frontier.pop()
+                if node < self.risk_count:
+                    risks += 1
+                else:
+                    controls += 1
+                for neighbor in self.neighbors(node):
+                    if self.component[neighbor] == -1:
+                        self.component[neighbor] = label
+                        frontier.append(neighbor)
+            sizes.append((risks, controls))
+        self.component_sizes = sizes
+
+    def node(self, node: int, **extra) -> Dict[str, Any]:
+        is_risk = node < self.risk_count
+        record = {
+            "id": self.ids[node],
+            "type": RISK if is_risk else CONTROL,
+            "title": self.titles[node],
+            "degree": self.degree(node),
+            "component": self.component[node],
+        }
+        if not is_risk:
+            record["domain"] = self.domains[node]
+        record.update(extra)
+        return record
+
+    def _edges_within(self, nodes: Iterable[int]) -> List[Dict[str, Any]]:
+        """Mappings with both ends in ``nodes`` (the induced subgraph's edges)."""
+        members = set(nodes)
+        edges = []
+        for source in sorted(n for n in members if n < self.risk_count):
+            for target in self.fwd_targets[self.fwd_offsets[source] : self.fwd_offsets[source + 1]]:
+                if target in members:
+                    edges.append(
+                        {
+                            "source_id": self.ids[source],
+                            "target_id": self.ids[target],
+                            "relationship_type": "risk_control",
+                        }
+                    )
+        return edges
+
+    def neighborhood(self, node_id: str, hops: int = 1, max_nodes: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Nodes within ``hops`` mappings of ``node_id`` and the mappings between them.
+
+        Breadth-first, so when ``max_nodes`` cuts the result short the nearest
+        nodes are kept and ``truncated`` is set. None if ``node_id`` is unknown.
+        """
+        start = self.index.get(node_id)
+        if start is None:
+            return None
+        distance = {start: 0}
+        frontier = [start]
+        truncated = False
+        for hop in range(1, hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self.neighbors(node):
+                    if neighbor in distance:
+                        continue
+                    if max_nodes is not None and len(distance) >= max_nodes:
+                        truncated = True
+                        break
+                    distance[neighbor] = hop
+                    next_frontier.append(neighbor)
+                if truncated:
+                    break
+            if truncated or not next_frontier:
+                break
+            frontier = next_frontier
+
+        return {
+            "center": node_id,
+            "hops": hops,
+            "nodes": [self.node(n, distance=d) for n, d in distance.items()],
+            "edges": self._edges_within(distance),
+            "truncated": truncated,
+        }
+
+    def subgraph(self, node_ids: Sequence[str]) -> Dict[str, Any]:
+        """The subgraph induced by ``node_ids``: those nodes and every mapping between two of them."""
+        nodes = {}
+        not_found = []
+        for node_id in dict.fromkeys(node_ids):
+            node = self.index.get(node_id)
+            if node is None:
+                not_found.append(node_id)
+            else:
+                nodes[node] = None
+        return {
+            "nodes": [self.node(n) for n in nodes],
+            "edges": self._edges_within(nodes),
+            "not_found": not_found,
+        }
+
+    def components(self, min_size: int = 1) -> List[Dict[str, Any]]:
+        """Connected components of at least ``min_size`` nodes, largest first."""
+        summaries = [
+            {"component": label, "size": risks + controls, "risks": risks, "controls": controls}
+            for label, (risks, controls) in enumerate(self.component_sizes)
+            if risks + controls >= min_size
+        ]
+        summaries.sort(key=lambda c: (-c["size"], c["component"]))
+        return summaries
+
+    def component_members(self, label: int) -> List[int]:
+        return [node for node, component in enumerate(self.component) if component == label]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": len(self.ids),
+            "risks": self.risk_count,
+            "controls": len(self.ids) - self.risk_count,
+            "edges": self.edge_count,
+            "components": len(self.component_sizes),
+            "isolated": sum(1 for risks, controls in self.component_sizes if risks + controls == 1),
+            "build_ms": self.build_ms,
+        }
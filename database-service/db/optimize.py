@@ -0,0 +1,116 @@
+"""Weighted set cover: the cheapest set of controls that covers a set of risks."""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .graph import TaxonomyGraph
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def cover_risks(
+    graph: TaxonomyGraph,
+    risk_ids: Sequence[str],
+    costs: Optional[Dict[str, float]] = None,
+    exclude: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Choose a near-minimal-cost set of controls mapped to every coverable risk in ``risk_ids``.
+
+    Uses the greedy weighted set-cover heuristic (ln n approximation): repeatedly
+    take the control with the lowest cost per newly covered risk. Each control's
+    coverage is a bitset, so the per-step gain is an AND and a popcount. Gains
+    only shrink as risks get covered, so candidates sit in a heap and are only
+    re-scored when they reach the top (lazy greedy). A final pass drops picked
+    controls, most expensive first, whose risks the other picks already cover.
+
+    ``costs`` maps control ids to positive weights (default 1 each); ``exclude``
+    lists controls that must not be chosen.
+    """
+    costs = costs or {}
+    excluded = set(exclude)
+
+    target = 0
+    not_found = []
+    requested = []
+    for risk_id in dict.fromkeys(risk_ids):
+        node = graph.index.get(risk_id)
+        if node is None or node >= graph.risk_count:
+            not_found.append(risk_id)
+            continue
+        requested.append(node)
+        target |= 1 << node
+
+    def cost_of(control: int) -> float:
+        return float(costs.get(graph.ids[control], 1.0))
+
+    heap = []
+    coverable = 0
+    for offset, bits in enumerate(graph.coverage):
+        control = graph.risk_count + offset
+        gain = _popcount(bits & target)
+        if gain and graph.ids[control] not in excluded:
+            coverable |= bits & target
+            heap.append((cost_of(control) / gain, cost_of(control), graph.ids[control], control))
+    heapq.heapify(heap)
+
+    uncovered = coverable
+    chosen: List[int] = []
+    while uncovered and heap:
+        _, cost, control_id, control = heapq.heappop(heap)
+        gain = _popcount(graph.coverage[control - graph.risk_count] & uncovered)
+        if not gain:
+            continue
+        entry = (cost / gain, cost, control_id, control)
+        if heap and entry > heap[0]:
+            # Stale score; re-queue with the current gain and look at the new best
+            heapq.heappush(heap, entry)
+            continue
+        chosen.append(control)
+        uncovered &= ~graph.coverage[control - graph.risk_count]
+
+    chosen = _drop_redundant(graph, chosen, target, cost_of)
+
+    covered_by: Dict[int, List[str]] = {node: [] for node in requested}
+    controls = []
+    for control in chosen:
+        bits = graph.coverage[control - graph.risk_count] & target
+        covers = [node for node in requested if bits >> node & 1]
+        for node in covers:
+            covered_by[node].append(graph.ids[control])
+        controls.append(
+            {
+                "control_id": graph.ids[control],
+                "title": graph.titles[control],
+                "domain": graph.domains[control],
+                "cost": cost_of(control),
+                "covers": [graph.ids[node] for node in covers],
+            }
+        )
+
+    return {
+        "controls": controls,
+        "total_cost": sum(c["cost"] for c in controls),
+        "risks": [
+            {"risk_id": graph.ids[node], "title": graph.titles[node], "covered_by": covered_by[node]}
+            for node in requested
+        ],
+        "uncovered": [graph.ids[node] for node in requested if not coverable >> node & 1],
+        "not_found": not_found,
+    }
+
+
+def _drop_redundant(graph: TaxonomyGraph, chosen: List[int], target: int, cost_of) -> List[int]:
+    """Remove picks whose target risks are all covered by the remaining picks, most expensive first."""
+    kept = list(chosen)
+    for control in sorted(chosen, key=lambda c: (-cost_of(c), graph.ids[c])):
+        others = 0
+        for other in kept:
+            if other != control:
+                others |= graph.coverage[other - graph.risk_count]
+        bits = graph.coverage[control - graph.risk_count] & target
+        if bits & ~others == 0:
+            kept.remove(control)
+    return kept
@@ -1,31 +1,117 @@
+import re
+import html
+import json
+import math
+import base64
 import sqlite3
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from .connections import DatabaseManager
+from .scenarios import UNASSIGNED
+from .search_index import build_search_index
 
 logger = logging.getLogger(__name__)
 
+
+def encode_cursor(sort_key: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps(list(sort_key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Optional[Sequence[type]] = None) -> List[Any]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`; raises ValueError if it is malformed.
+
+    With ``types`` the key must have exactly that many elements, each an
+    instance of the matching type (a repository's ``cursor_types``).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(key, list) or not key:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if types is not None and (len(key) != len(types) or not all(isinstance(value, t) for value, t in zip(key, types))):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key
+
+
+# Ids bound per ``IN (...)`` query; stays under SQLite's default host parameter limit
+IN_CHUNK_SIZE = 500
+
+
+def _chunks(ids: Sequence[str], size: int = IN_CHUNK_SIZE):
+    unique = list(dict.fromkeys(ids))
+    for start in range(0, len(unique), size):
+        yield unique[start : start + size]
+
+
+def _placeholders(values: Sequence[Any]) -> str:
+    return ",".join("?" * len(values))
+
+
 class BaseRepository:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        self._counts: Dict[Any, int] = {}
+        self._counts_lock = threading.Lock()
+
+    def _cached_count(self, key: Any, query: str, params: Sequence[Any] = ()) -> int:
+        """Run a COUNT query once per key; the database is read-only, so totals never change."""
+        if key not in self._counts:
+            with self.db_manager.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                count = cursor.fetchone()[0]
+            with self._counts_lock:
+                self._counts[key] = count
+        return self._counts[key]
+
 
 class RiskRepository(BaseRepository):
-    def get_all(self, limit: int = 100, offset: int = 0, category: Optional[str] = None) -> List[Dict[str, Any]]:
+    # Element types of a sort key, checked when a cursor is decoded
+    cursor_types = (str,)
+
+    @staticmethod
+    def sort_key(row: Dict[str, Any]) -> List[Any]:
+        return [row["id"]]
+
+    def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        category: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return risks ordered by id; ``after`` (a sort key) seeks past it instead of using ``offset``."""
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
             query = (
                 "SELECT risk_id as id, risk_title as title, "
                 "risk_description as description, NULL as category FROM risks"
             )
-            params = []
+            conditions, params = [], []
             if category:
-                query += " WHERE category = ?"
+                conditions.append("category = ?")
                 params.append(category)
+            if after:
+                conditions.append("risk_id > ?")
+                params.append(after[0])
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
             query += " ORDER BY id LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+            params.extend([limit, 0 if after else offset])
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
+    def count(self, category: Optional[str] = None) -> int:
+        if category:
+            return self._cached_count(category, "SELECT COUNT(*) FROM risks WHERE category = ?", (category,))
+        return self._cached_count(None, "SELECT COUNT(*) FROM risks")
+
     def get_by_id(self, risk_id: str) -> Optional[Dict[str, Any]]:
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
@@ -37,6 +123,41 @@ class RiskRepository(BaseRepository):
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def get_by_ids(self, risk_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the risks among ``risk_ids`` that exist, keyed by id."""
+        risks = {}
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(risk_ids):
+                cursor.execute(
+                    "SELECT risk_id as id, risk_title as title, risk_description as description, NULL as category "
+                    f"FROM risks WHERE risk_id IN ({_placeholders(chunk)})",
+                    chunk,
+                )
+                risks.update((row["id"], dict(row)) for row in cursor.fetchall())
+        return risks
+
+    def get_associated_controls_for(self, risk_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the controls mapped to each of ``risk_ids`` (every id gets a list, possibly empty)."""
+        associations: Dict[str, List[Dict[str, Any]]] = {risk_id: [] for risk_id in risk_ids}
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(risk_ids):
+                cursor.execute(
+                    f"""
+                    SELECT m.risk_id as risk_id, c.control_id as id, c.control_title as title,
+                           c.control_description as description, c.security_function as domain
+                    FROM controls c
+                    JOIN risk_control_mapping m ON c.control_id = m.control_id
+                    WHERE m.risk_id IN ({_placeholders(chunk)})
+                    """,
+                    chunk,
+                )
+                for row in cursor.fetchall():
+                    control = dict(row)
+                    associations[control.pop("risk_id")].append(control)
+        return associations
+
     def get_associated_controls(self, risk_id: str) -> List[Dict[str, Any]]:
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
@@ -52,8 +173,38 @@ class RiskRepository(BaseRepository):
             )
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_summary(self) -> List[Dict[str, Any]]:
+        """Return every risk with its mapped control count in a single aggregate query."""
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT r.risk_id as id, r.risk_title as title, r.risk_description as description,
+                       COUNT(c.control_id) as control_count
+                FROM risks r
+                LEFT JOIN risk_control_mapping m ON m.risk_id = r.risk_id
+                LEFT JOIN controls c ON c.control_id = m.control_id
+                GROUP BY r.risk_id
+                ORDER BY r.risk_id
+                """)
+            return [dict(row) for row in cursor.fetchall()]
+
+
 class ControlRepository(BaseRepository):
-    def get_all(self, limit: int = 100, offset: int = 0, domain: Optional[str] = None) -> List[Dict[str, Any]]:
+    # Element types of a sort key, checked when a cursor is decoded
+    cursor_types = (str,)
+
+    @staticmethod
+    def sort_key(row: Dict[str, Any]) -> List[Any]:
+        return [row["id"]]
+
+    def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        domain: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return controls ordered by id; ``after`` (a sort key) seeks past it instead of using ``offset``."""
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
             query = (
@@ -61,15 +212,25 @@ class ControlRepository(BaseRepository):
                 "control_description as description, security_function as domain "
                 "FROM controls"
             )
-            params = []
+            conditions, params = [], []
             if domain:
-                query += " WHERE security_function = ?"
+                conditions.append("security_function = ?")
                 params.append(domain)
+            if after:
+                conditions.append("control_id > ?")
+                params.append(after[0])
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
             query += " ORDER BY id LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+            params.extend([limit, 0 if after else offset])
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
+    def count(self, domain: Optional[str] = None) -> int:
+        if domain:
+            return self._cached_count(domain, "SELECT COUNT(*) FROM controls WHERE security_function = ?", (domain,))
+        return self._cached_count(None, "SELECT COUNT(*) FROM controls")
+
     def get_by_id(self, control_id: str) -> Optional[Dict[str, Any]]:
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
@@ -81,6 +242,41 @@ class ControlRepository(BaseRepository):
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def get_by_ids(self, control_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the controls among ``control_ids`` that exist, keyed by id."""
+        controls = {}
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(control_ids):
+                cursor.execute(
+                    "SELECT control_id as id, control_title as title, control_description as description, "
+                    f"security_function as domain FROM controls WHERE control_id IN ({_placeholders(chunk)})",
+                    chunk,
+                )
+                controls.update((row["id"], dict(row)) for row in cursor.fetchall())
+        return controls
+
+    def get_associated_risks_for(self, control_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the risks mapped to each of ``control_ids`` (every id gets a list, possibly empty)."""
+        associations: Dict[str, List[Dict[str, Any]]] = {control_id: [] for control_id in control_ids}
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(control_ids):
+                cursor.execute(
+                    f"""
+                    SELECT m.control_id as control_id, r.risk_id as id, r.risk_title as title,
+                           r.risk_description as description, NULL as category
+                    FROM risks r
+                    JOIN risk_control_mapping m ON r.risk_id = m.risk_id
+                    WHERE m.control_id IN ({_placeholders(chunk)})
+                    """,
+                    chunk,
+                )
+                for row in cursor.fetchall():
+                    risk = dict(row)
+                    associations[risk.pop("control_id")].append(risk)
+        return associations
+
     def get_associated_risks(self, control_id: str) -> List[Dict[str, Any]]:
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
@@ -95,75 +291,395 @@ class ControlRepository(BaseRepository):
             )
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_summary(self) -> List[Dict[str, Any]]:
+        """Return every control with its mapped risk count in a single aggregate query."""
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.control_id as id, c.control_title as title, c.control_description as description,
+                       c.security_function as domain, COUNT(r.risk_id) as risk_count
+                FROM controls c
+                LEFT JOIN risk_control_mapping m ON m.control_id = c.control_id
+                LEFT JOIN risks r ON r.risk_id = m.risk_id
+                GROUP BY c.control_id
+                ORDER BY c.control_id
+                """)
+            return [dict(row) for row in cursor.fetchall()]
+
+
 class DefinitionRepository(BaseRepository):
-    def get_all(self, limit: int = 100, offset: int = 0, category: Optional[str] = None) -> List[Dict[str, Any]]:
+    cursor_types = (str, str)
+
+    @staticmethod
+    def sort_key(row: Dict[str, Any]) -> List[Any]:
+        return [row["term"], row["definition_id"]]
+
+    def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        category: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return definitions ordered by (term, id); ``after`` seeks past that key instead of using ``offset``."""
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
             query = "SELECT definition_id, term, title, description, category, source FROM definitions"
-            params = []
+            conditions, params = [], []
             if category:
-                query += " WHERE category = ?"
+                conditions.append("category = ?")
                 params.append(category)
-            query += " ORDER BY term LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+            if after:
+                conditions.append("(term, definition_id) > (?, ?)")
+                params.extend(after[:2])
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY term, definition_id LIMIT ? OFFSET ?"
+            params.extend([limit, 0 if after else offset])
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
+    def count(self, category: Optional[str] = None) -> int:
+        if category:
+            return self._cached_count(category, "SELECT COUNT(*) FROM definitions WHERE category = ?", (category,))
+        return self._cached_count(None, "SELECT COUNT(*) FROM definitions")
+
+
 class RelationshipRepository(BaseRepository):
     def get_relationships(self, relationship_type: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
             relationships = []
-            
+
             if not relationship_type or relationship_type == "risk_control":
                 cursor.execute(
                     "SELECT risk_id as source_id, control_id as target_id, 'risk_control' as relationship_type "
-                    "FROM risk_control_mapping LIMIT ?", (limit,)
+                    "FROM risk_control_mapping LIMIT ?",
+                    (limit,),
                 )
                 relationships.extend([dict(row) for row in cursor.fetchall()])
 
-
             return relationships[:limit]
 
+
 class SearchRepository(BaseRepository):
+    ENTITY_TYPES = ("risk", "control", "definition")
+
+    # BM25 column weights for (entity_type, entity_id, title, description, extra)
+    BM25_WEIGHTS = (0.0, 4.0, 10.0, 2.0, 1.0)
+
+    # FTS5 marks matches with these control characters; the text is HTML-escaped before they become <mark> tags
+    _MARK_START, _MARK_END = "\x02", "\x03"
+    HIGHLIGHT_COLUMNS = (
+        "highlight(search_index, 2, char(2), char(3)) as title_highlight, "
+        "snippet(search_index, 3, char(2), char(3), '…', 16) as snippet"
+    )
+
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__(db_manager)
+        self._has_fts: Optional[bool] = None
+        self._has_trigrams: Optional[bool] = None
+
+    def has_fts_index(self) -> bool:
+        """Return True if the database was built with the FTS5 ``search_index`` table."""
+        if self._has_fts is None:
+            with self.db_manager.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_index'")
+                self._has_fts = cursor.fetchone() is not None
+        return self._has_fts
+
+    def has_trigram_index(self) -> bool:
+        """Return True if the database was built with the ``search_terms``/``search_trigrams`` fuzzy index."""
+        if self._has_trigrams is None:
+            with self.db_manager.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT COUNT(*) FROM sqlite_master "
+                    "WHERE type='table' AND name IN ('search_terms', 'search_trigrams')"
+                )
+                self._has_trigrams = cursor.fetchone()[0] == 2
+        return self._has_trigrams
+
+    @staticmethod
+    def build_match_query(query: str) -> str:
+        """Turn free text into an FTS5 MATCH expression of quoted prefix terms."""
+        tokens = re.findall(r"\w+", query.lower())
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def trigrams(word: str) -> set:
+        """Padded trigrams of a lowercase word, exactly as data processing indexes vocabulary words."""
+        padded = f"  {word} "
+        return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+    @classmethod
+    def _to_html(cls, marked: Optional[str]) -> Optional[str]:
+        """Escape highlighted source text so the only markup in it is the ``<mark>`` tags around matches."""
+        if marked is None:
+            return None
+        return html.escape(marked).replace(cls._MARK_START, "<mark>").replace(cls._MARK_END, "</mark>")
+
+    def _finish_results(self, cursor, rows: List[Dict[str, Any]]) -> None:
+        """Escape highlights and add the ``category``/``source`` fields definitions had in LIKE search results."""
+        for row in rows:
+            row["title_highlight"] = self._to_html(row["title_highlight"])
+            row["snippet"] = self._to_html(row["snippet"])
+        definitions = [row for row in rows if row["type"] == "definition"]
+        if not definitions:
+            return
+        fields = {}
+        for chunk in _chunks([row["id"] for row in definitions]):
+            placeholders = ",".join("?" for _ in chunk)
+            cursor.execute(
+                f"SELECT definition_id, category, source FROM definitions WHERE definition_id IN ({placeholders})",
+                chunk,
+            )
+            fields.update((row[0], (row[1], row[2])) for row in cursor.fetchall())
+        for row in definitions:
+            row["category"], row["source"] = fields.get(row["id"], (None, None))
+
+    def similar_terms(self, cursor, word: str, threshold: float, limit: int) -> List[Tuple[str, float]]:
+        """
+        Vocabulary words whose trigram (Jaccard) similarity to ``word`` is at least ``threshold``, best first.
+
+        Only the postings of the word's own trigrams are read. A word with ``m``
+        trigrams can only reach the threshold against one with ``n`` when
+        ``threshold * n <= m <= n / threshold`` and they share at least
+        ``threshold * n`` trigrams, so SQLite discards the rest before grouping.
+        """
+        grams = sorted(self.trigrams(word))
+        n = len(grams)
+        placeholders = ",".join("?" for _ in grams)
+        cursor.execute(
+            f"""
+            SELECT t.term, t.trigram_count, t.frequency, COUNT(*) AS shared
+            FROM search_trigrams g JOIN search_terms t ON t.term_id = g.term_id
+            WHERE g.trigram IN ({placeholders}) AND t.trigram_count BETWEEN ? AND ?
+            GROUP BY g.term_id
+            HAVING shared >= ?
+            """,
+            [*grams, math.floor(threshold * n), math.ceil(n / threshold), math.ceil(threshold * n - 1e-9)],
+        )
+        scored = []
+        for term, count, frequency, shared in cursor.fetchall():
+            similarity = shared / (n + count - shared)
+            if similarity >= threshold:
+                scored.append((-similarity, -frequency, term))
+        scored.sort()
+        return [(term, round(-similarity, 4)) for similarity, _, term in scored[:limit]]
+
+    def search_fuzzy(
+        self,
+        query: str,
+        threshold: float = 0.3,
+        limit: int = 50,
+        offset: int = 0,
+        entity_types: Optional[List[str]] = None,
+        max_expansions: int = 10,
+        max_candidates: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Typo-tolerant search: every query word also matches the vocabulary words that share enough trigrams.
+
+        Each word expands to its ``max_expansions`` most similar vocabulary words
+        (plus its own prefix matches) through the trigram index, and the
+        expansions run as one FTS5 query. The ``max_candidates`` best BM25 hits are
+        re-ranked by the mean, over query words, of the similarity of the word's
+        best match in the entity, so exact matches come before corrections.
+
+        Returns:
+            The requested page of results (each with a ``similarity``), the total
+            number of candidates, and ``corrections`` listing the vocabulary words
+            each misspelled query word was expanded to
+        """
+        types = [t for t in (entity_types or self.ENTITY_TYPES) if t in self.ENTITY_TYPES]
+        words = list(dict.fromkeys(re.findall(r"\w+", query.lower())))
+        if not types or not words:
+            return {"results": [], "total": 0, "corrections": {}}
+
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            expansions = {word: self.similar_terms(cursor, word, threshold, max_expansions) for word in words}
+            groups = []
+            for word in words:
+                alternatives = [f'"{word}"*'] + [f'"{term}"' for term, _ in expansions[word] if term != word]
+                groups.append("(" + " OR ".join(alternatives) + ")")
+
+            type_placeholders = ",".join("?" for _ in types)
+            weights = ", ".join(str(w) for w in self.BM25_WEIGHTS)
+            cursor.execute(
+                f"""
+                SELECT entity_type as type, entity_id as id, title, description, extra,
+                       {self.HIGHLIGHT_COLUMNS},
+                       bm25(search_index, {weights}) as rank
+                FROM search_index
+                WHERE search_index MATCH ? AND entity_type IN ({type_placeholders})
+                ORDER BY rank
+                LIMIT ?
+                """,
+                [" AND ".join(groups), *types, max_candidates],
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+            self._finish_results(cursor, rows)
+
+        results = []
+        for row in rows:
+            text = f"{row['id']} {row['title'] or ''} {row['description'] or ''} {row.pop('extra') or ''}"
+            document_words = set(re.findall(r"\w+", text.lower()))
+            similarities = []
+            for word in words:
+                if any(candidate.startswith(word) for candidate in document_words):
+                    similarities.append(1.0)
+                    continue
+                matched = [similarity for term, similarity in expansions[word] if term in document_words]
+                # Matched through stemming (e.g. a plural of an expansion): credit the threshold
+                similarities.append(max(matched, default=threshold))
+            row["similarity"] = round(sum(similarities) / len(similarities), 4)
+            row["score"] = round(-row.pop("rank"), 4)
+            results.append(row)
+        results.sort(key=lambda r: (-r["similarity"], -r["score"]))
+
+        corrections = {
+            word: [term for term, _ in expansions[word] if term != word]
+            for word in words
+            if expansions[word] and expansions[word][0][0] != word
+        }
+        return {"results": results[offset : offset + limit], "total": len(results), "corrections": corrections}
+
+    # Searchable documents per entity table, matching the columns of the FTS5 search_index
+    CLIENT_INDEX_SOURCES = {
+        "risks": "SELECT 'risk', risk_id, risk_title, COALESCE(risk_description, ''), '' FROM risks ORDER BY risk_id",
+        "controls": (
+            "SELECT 'control', control_id, control_title, COALESCE(control_description, ''), "
+            "COALESCE(security_function, '') FROM controls ORDER BY control_id"
+        ),
+        "definitions": (
+            "SELECT 'definition', definition_id, term, COALESCE(description, ''), COALESCE(category, '') "
+            "FROM definitions ORDER BY term"
+        ),
+    }
+
+    def get_client_index(self) -> Dict[str, Any]:
+        """
+        Inverted index over every risk, control and definition for client-side typeahead.
+
+        Built from the entity tables (not the FTS5 index, whose tokens are stemmed)
+        with the same field weights as ranked search.
+        """
+        documents = []
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0] for row in cursor.fetchall()}
+            for table, sql in self.CLIENT_INDEX_SOURCES.items():
+                if table in tables:
+                    cursor.execute(sql)
+                    documents.extend(tuple(row) for row in cursor.fetchall())
+        return build_search_index(documents, self.BM25_WEIGHTS[1:])
+
+    def search_ranked(
+        self,
+        query: str,
+        limit: int = 50,
+        offset: int = 0,
+        entity_types: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search all entity types with one BM25-ranked query.
+
+        Falls back to the per-type LIKE scan when the database has no FTS index.
+        Returns the requested page of results together with the total match count.
+        """
+        types = [t for t in (entity_types or self.ENTITY_TYPES) if t in self.ENTITY_TYPES]
+        if not types:
+            return {"results": [], "total": 0}
+
+        if not self.has_fts_index():
+            return self._search_like_ranked(query, limit, offset, types)
+
+        match_query = self.build_match_query(query)
+        if not match_query:
+            return {"results": [], "total": 0}
+
+        type_placeholders = ",".join("?" for _ in types)
+        where = f"search_index MATCH ? AND entity_type IN ({type_placeholders})"
+        params = [match_query, *types]
+
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM search_index WHERE {where}", params)
+            total = cursor.fetchone()[0]
+
+            weights = ", ".join(str(w) for w in self.BM25_WEIGHTS)
+            cursor.execute(
+                f"""
+                SELECT entity_type as type, entity_id as id, title, description,
+                       {self.HIGHLIGHT_COLUMNS},
+                       bm25(search_index, {weights}) as rank
+                FROM search_index
+                WHERE {where}
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+                """,
+                [*params, limit, offset],
+            )
+            results = []
+            for row in cursor.fetchall():
+                result = dict(row)
+                result["score"] = round(-result.pop("rank"), 4)
+                results.append(result)
+            self._finish_results(cursor, results)
+
+        return {"results": results, "total": total}
+
+    def _search_like_ranked(self, query: str, limit: int, offset: int, types: List[str]) -> Dict[str, Any]:
+        """LIKE-based fallback that merges types and ranks title matches first."""
+        needle = query.strip().lower()
+        merged = []
+        for entity_type in types:
+            merged.extend(self.search(entity_type, query, limit + offset))
+        merged.sort(key=lambda r: 0 if needle and needle in (r.get("title") or "").lower() else 1)
+        return {"results": merged[offset : offset + limit], "total": len(merged)}
+
     def search(self, entity_type: str, query: str, limit: int = 50) -> List[Dict[str, Any]]:
-        import re
         sanitized_q = re.sub(r"[^\w\s\-\.]", "", query.strip())
         if not sanitized_q:
             return []
-            
+
         search_term = f"%{sanitized_q}%"
         results = []
-        
+
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
-            
+
             if entity_type == "risk":
                 cursor.execute(
                     "SELECT 'risk' as type, risk_id as id, risk_title as title, risk_description as description "
                     "FROM risks WHERE risk_title LIKE ? OR risk_description LIKE ? OR risk_id LIKE ? LIMIT ?",
-                    (search_term, search_term, search_term, limit)
+                    (search_term, search_term, search_term, limit),
                 )
                 results.extend([dict(row) for row in cursor.fetchall()])
-            
+
             elif entity_type == "control":
                 cursor.execute(
                     "SELECT 'control' as type, control_id as id, control_title as title, control_description as description "
                     "FROM controls WHERE control_title LIKE ? OR control_description LIKE ? OR control_id LIKE ? LIMIT ?",
-                    (search_term, search_term, search_term, limit)
+                    (search_term, search_term, search_term, limit),
                 )
                 results.extend([dict(row) for row in cursor.fetchall()])
-            
+
             elif entity_type == "definition":
                 cursor.execute(
                     "SELECT 'definition' as type, definition_id as id, term as title, description, category, source "
                     "FROM definitions WHERE term LIKE ? OR description LIKE ? OR category LIKE ? LIMIT ?",
-                    (search_term, search_term, search_term, limit)
+                    (search_term, search_term, search_term, limit),
                 )
                 results.extend([dict(row) for row in cursor.fetchall()])
-            
+
             return results[:limit]
 
+
 class StatsRepository(BaseRepository):
     def get_stats(self) -> Dict[str, Any]:
         with self.db_manager.get_db_connection() as conn:
@@ -175,13 +691,13 @@ class StatsRepository(BaseRepository):
             stats["total_controls"] = cursor.fetchone()[0]
             cursor.execute("SELECT COUNT(*) FROM definitions")
             stats["total_definitions"] = cursor.fetchone()[0]
-            
+
             # Sum of all mappings
             total_rel = 0
             cursor.execute("SELECT COUNT(*) FROM risk_control_mapping")
             total_rel += cursor.fetchone()[0]
             stats["total_relationships"] = total_rel
-            
+
             return stats
 
     def get_file_metadata(self) -> List[Dict[str, Any]]:
@@ -190,44 +706,50 @@ class StatsRepository(BaseRepository):
             cursor.execute("SELECT * FROM file_metadata")
             return [dict(row) for row in cursor.fetchall()]
 
+
 class NetworkRepository(BaseRepository):
     def get_network_data(self) -> Dict[str, Any]:
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
-            
-            cursor.execute("SELECT risk_id as source_id, control_id as target_id, 'risk_control' as relationship_type FROM risk_control_mapping")
+
+            cursor.execute(
+                "SELECT risk_id as source_id, control_id as target_id, 'risk_control' as relationship_type FROM risk_control_mapping"
+            )
             risk_control_links = [dict(row) for row in cursor.fetchall()]
-            
+
             return {
                 "risk_control_links": risk_control_links,
             }
 
+
 class GapsRepository(BaseRepository):
     def get_gaps_analysis(self) -> Dict[str, Any]:
         with self.db_manager.get_db_connection() as conn:
             cursor = conn.cursor()
-            
+
             cursor.execute("SELECT risk_id, risk_title, risk_description FROM risks")
             all_risks = [dict(row) for row in cursor.fetchall()]
-            
+
             cursor.execute("SELECT control_id, control_title, control_description FROM controls")
             all_controls = [dict(row) for row in cursor.fetchall()]
-            
+
             cursor.execute("SELECT DISTINCT risk_id FROM risk_control_mapping")
             mapped_risk_ids = {row["risk_id"] for row in cursor.fetchall()}
-            
+
             cursor.execute("SELECT DISTINCT control_id FROM risk_control_mapping")
             mapped_control_ids = {row["control_id"] for row in cursor.fetchall()}
-            
+
             unmapped_risks = [r for r in all_risks if r["risk_id"] not in mapped_risk_ids]
             unmapped_controls = [c for c in all_controls if c["control_id"] not in mapped_control_ids]
-            
+
             total_risks = len(all_risks)
             total_controls = len(all_controls)
-            
+
             risk_coverage_pct = ((total_risks - len(unmapped_risks)) / total_risks * 100) if total_risks > 0 else 0
-            control_coverage_pct = ((total_controls - len(unmapped_controls)) / total_controls * 100) if total_controls > 0 else 0
-            
+            control_coverage_pct = (
+                ((total_controls - len(unmapped_controls)) / total_controls * 100) if total_controls > 0 else 0
+            )
+
             return {
                 "summary": {
                     "total_risks": total_risks,
@@ -243,3 +765,326 @@ class GapsRepository(BaseRepository):
                 "unmapped_risks": unmapped_risks,
                 "unmapped_controls": unmapped_controls,
             }
+
+    def get_coverage_matrix(self, group_size: int = 1) -> Dict[str, Any]:
+        """
+        Mapping counts per control domain (``security_function``) and risk.
+
+        Counts come from one grouped query over the mappings. Columns are the risks
+        in id order, or consecutive runs of ``group_size`` risks. ``counts`` is the
+        dense matrix flattened row by row.
+        """
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT risk_id FROM risks ORDER BY risk_id")
+            risk_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT DISTINCT COALESCE(NULLIF(security_function, ''), ?) FROM controls", (UNASSIGNED,))
+            domains = sorted((row[0] for row in cursor.fetchall()), key=lambda d: (d == UNASSIGNED, d))
+            cursor.execute(
+                """
+                SELECT COALESCE(NULLIF(c.security_function, ''), ?) AS domain, m.risk_id, COUNT(*) AS mappings
+                FROM risk_control_mapping m
+                JOIN controls c ON c.control_id = m.control_id
+                GROUP BY domain, m.risk_id
+                """,
+                (UNASSIGNED,),
+            )
+            cells = cursor.fetchall()
+
+        column_of = {risk_id: position // group_size for position, risk_id in enumerate(risk_ids)}
+        row_of = {domain: position for position, domain in enumerate(domains)}
+        groups = [risk_ids[start : start + group_size] for start in range(0, len(risk_ids), group_size)]
+        width = len(groups)
+        counts = [0] * (len(domains) * width)
+        for domain, risk_id, mappings in cells:
+            column = column_of.get(risk_id)
+            if column is not None:
+                counts[row_of[domain] * width + column] += mappings
+
+        return {
+            "rows": domains,
+            "columns": [group[0] if len(group) == 1 else f"{group[0]}-{group[-1]}" for group in groups],
+            "group_size": group_size,
+            "shape": [len(domains), width],
+            "counts": counts,
+            "row_totals": [sum(counts[row * width : (row + 1) * width]) for row in range(len(domains))],
+            "column_totals": [sum(counts[column::width]) for column in range(width)] if domains else [0] * width,
+            "max": max(counts, default=0),
+        }
+
+
+class ImpactRepository(BaseRepository):
+    """Coverage multiplicity per risk and sole coverage per control ("single points of failure")."""
+
+    # Same definitions the data build materializes as indexed tables; used for databases built without them
+    RISK_COVERAGE_SQL = """
+        SELECT r.risk_id, COUNT(DISTINCT c.control_id) AS control_count,
+               CASE WHEN COUNT(DISTINCT c.control_id) = 1 THEN MIN(c.control_id) END AS sole_control_id
+        FROM risks r
+        LEFT JOIN risk_control_mapping m ON m.risk_id = r.risk_id
+        LEFT JOIN controls c ON c.control_id = m.control_id
+        GROUP BY r.risk_id
+    """
+    CONTROL_IMPACT_SQL = """
+        SELECT c.control_id, COUNT(DISTINCT rc.risk_id) AS risk_count,
+               COUNT(DISTINCT CASE WHEN rc.control_count = 1 THEN rc.risk_id END) AS sole_risk_count
+        FROM controls c
+        LEFT JOIN risk_control_mapping m ON m.control_id = c.control_id
+        LEFT JOIN {risk_coverage} rc ON rc.risk_id = m.risk_id
+        GROUP BY c.control_id
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__(db_manager)
+        self._has_index: Optional[bool] = None
+
+    def has_coverage_index(self) -> bool:
+        """Return True if the database was built with the ``risk_coverage`` and ``control_impact`` tables."""
+        if self._has_index is None:
+            with self.db_manager.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type='table' "
+                    "AND name IN ('risk_coverage', 'control_impact')"
+                )
+                self._has_index = cursor.fetchone()[0] == 2
+        return self._has_index
+
+    def _sources(self) -> Tuple[str, str]:
+        """The (risk coverage, control impact) tables, or equivalent subqueries on older databases."""
+        if self.has_coverage_index():
+            return "risk_coverage", "control_impact"
+        risk_coverage = f"({self.RISK_COVERAGE_SQL})"
+        return risk_coverage, f"({self.CONTROL_IMPACT_SQL.format(risk_coverage=risk_coverage)})"
+
+    def get_single_points(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+        """Risks covered by exactly one control (paged) and the controls that are sole coverage most often."""
+        risk_coverage, control_impact = self._sources()
+        summary = {
+            "total_risks": self._cached_count("total", f"SELECT COUNT(*) FROM {risk_coverage} rc"),
+            "uncovered_risks": self._cached_count(
+                "uncovered", f"SELECT COUNT(*) FROM {risk_coverage} rc WHERE rc.control_count = 0"
+            ),
+            "single_control_risks": self._cached_count(
+                "single", f"SELECT COUNT(*) FROM {risk_coverage} rc WHERE rc.control_count = 1"
+            ),
+            "sole_coverage_controls": self._cached_count(
+                "sole", f"SELECT COUNT(*) FROM {control_impact} ci WHERE ci.sole_risk_count > 0"
+            ),
+        }
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT rc.risk_id, r.risk_title, rc.sole_control_id AS control_id, c.control_title
+                FROM {risk_coverage} rc
+                JOIN risks r ON r.risk_id = rc.risk_id
+                LEFT JOIN controls c ON c.control_id = rc.sole_control_id
+                WHERE rc.control_count = 1
+                ORDER BY rc.risk_id
+                LIMIT ? OFFSET ?
+                """,
+                (limit, offset),
+            )
+            risks = [dict(row) for row in cursor.fetchall()]
+            cursor.execute(
+                f"""
+                SELECT ci.control_id, c.control_title, c.security_function, ci.risk_count, ci.sole_risk_count
+                FROM {control_impact} ci
+                JOIN controls c ON c.control_id = ci.control_id
+                WHERE ci.sole_risk_count > 0
+                ORDER BY ci.sole_risk_count DESC, ci.control_id
+                LIMIT ?
+                """,
+                (limit,),
+            )
+            controls = [dict(row) for row in cursor.fetchall()]
+        return {"summary": summary, "risks": risks, "controls": controls}
+
+    def get_control_impact(self, control_id: str) -> Optional[Dict[str, Any]]:
+        """How many risks ``control_id`` maps, which of them it alone covers, and how covered the rest are."""
+        risk_coverage, control_impact = self._sources()
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT ci.control_id, c.control_title, c.security_function, ci.risk_count, ci.sole_risk_count
+                FROM {control_impact} ci
+                JOIN controls c ON c.control_id = ci.control_id
+                WHERE ci.control_id = ?
+                """,
+                (control_id,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            impact = dict(row)
+            cursor.execute(
+                f"""
+                SELECT m.risk_id, r.risk_title, rc.control_count
+                FROM risk_control_mapping m
+                JOIN risks r ON r.risk_id = m.risk_id
+                JOIN {risk_coverage} rc ON rc.risk_id = m.risk_id
+                WHERE m.control_id = ?
+                ORDER BY m.risk_id
+                """,
+                (control_id,),
+            )
+            risks = [dict(r) for r in cursor.fetchall()]
+        impact["sole_risks"] = [{k: r[k] for k in ("risk_id", "risk_title")} for r in risks if r["control_count"] == 1]
+        impact["shared_risks"] = [r for r in risks if r["control_count"] > 1]
+        return impact
+
+
+class RankingRepository(BaseRepository):
+    """Centrality rankings from the ``entity_metrics`` table computed by the data build."""
+
+    METRICS = ("degree", "degree_centrality", "pagerank", "eigenvector", "betweenness")
+    # entity_type -> (table, id column, title column)
+    ENTITY_TABLES = {
+        "risk": ("risks", "risk_id", "risk_title"),
+        "control": ("controls", "control_id", "control_title"),
+    }
+
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__(db_manager)
+        self._has_metrics: Optional[bool] = None
+
+    def has_metrics(self) -> bool:
+        """Return True if the database was built with the ``entity_metrics`` table."""
+        if self._has_metrics is None:
+            with self.db_manager.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='entity_metrics'")
+                self._has_metrics = cursor.fetchone() is not None
+        return self._has_metrics
+
+    def count(self, entity_type: str) -> int:
+        return self._cached_count(
+            entity_type, "SELECT COUNT(*) FROM entity_metrics WHERE entity_type = ?", (entity_type,)
+        )
+
+    def get_rankings(
+        self, entity_type: str, metric: str, limit: int = 50, offset: int = 0, descending: bool = True
+    ) -> List[Dict[str, Any]]:
+        """One page of risks or controls ordered by ``metric``, each with its rank and every score."""
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        table, id_column, title_column = self.ENTITY_TABLES[entity_type]
+        direction = "DESC" if descending else "ASC"
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT em.entity_id, t.{title_column} AS title, {", ".join(f"em.{m}" for m in self.METRICS)}
+                FROM entity_metrics em
+                LEFT JOIN {table} t ON t.{id_column} = em.entity_id
+                WHERE em.entity_type = ?
+                ORDER BY em.{metric} {direction}, em.entity_id
+                LIMIT ? OFFSET ?
+                """,
+                (entity_type, limit, offset),
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+        for position, row in enumerate(rows, start=offset + 1):
+            row["rank"] = position
+        return rows
+
+
+class TermRepository(BaseRepository):
+    """Definition term offsets in risk and control text, from the ``term_occurrences`` table."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__(db_manager)
+        self._has_occurrences: Optional[bool] = None
+
+    def has_occurrences(self) -> bool:
+        """Return True if the database was built with the ``term_occurrences`` table."""
+        if self._has_occurrences is None:
+            with self.db_manager.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='term_occurrences'")
+                self._has_occurrences = cursor.fetchone() is not None
+        return self._has_occurrences
+
+    def get_for(self, entity_type: str, entity_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Return the term occurrences of each of ``entity_ids`` (every id gets a list, possibly empty).
+
+        Occurrences are ordered by field and offset and never overlap within a field.
+        """
+        occurrences: Dict[str, List[Dict[str, Any]]] = {entity_id: [] for entity_id in entity_ids}
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(entity_ids):
+                cursor.execute(
+                    f"""
+                    SELECT entity_id, field, start, "end", term, definition_id
+                    FROM term_occurrences
+                    WHERE entity_type = ? AND entity_id IN ({_placeholders(chunk)})
+                    ORDER BY entity_id, field, start
+                    """,
+                    [entity_type, *chunk],
+                )
+                for row in cursor.fetchall():
+                    occurrence = dict(row)
+                    occurrences[occurrence.pop("entity_id")].append(occurrence)
+        return occurrences
+
+
+class SimilarityRepository(BaseRepository):
+    """TF-IDF "similar entities" from the ``similar_entities`` table computed by the data build."""
+
+    # entity_type -> (table, id column, title column)
+    ENTITY_TABLES = {
+        "risk": ("risks", "risk_id", "risk_title"),
+        "control": ("controls", "control_id", "control_title"),
+        "definition": ("definitions", "definition_id", "term"),
+    }
+
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__(db_manager)
+        self._has_similarities: Optional[bool] = None
+
+    def has_similarities(self) -> bool:
+        """Return True if the database was built with the ``similar_entities`` table."""
+        if self._has_similarities is None:
+            with self.db_manager.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='similar_entities'")
+                self._has_similarities = cursor.fetchone() is not None
+        return self._has_similarities
+
+    def get_similar(
+        self, entity_type: str, entity_id: str, similar_type: Optional[str] = None, limit: int = 10
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Most similar entities to one risk, control or definition, best first.
+
+        Returns None if the entity does not exist.
+        """
+        table, id_column, _ = self.ENTITY_TABLES[entity_type]
+        titles = " ".join(
+            f"LEFT JOIN {other} t_{name} ON s.similar_type = '{name}' AND t_{name}.{other_id} = s.similar_id"
+            for name, (other, other_id, _) in self.ENTITY_TABLES.items()
+        )
+        title = ", ".join(f"t_{name}.{title_column}" for name, (_, _, title_column) in self.ENTITY_TABLES.items())
+        query = f"""
+            SELECT s.similar_type AS entity_type, s.similar_id AS entity_id, COALESCE({title}) AS title, s.score
+            FROM similar_entities s {titles}
+            WHERE s.entity_type = ? AND s.entity_id = ?
+        """
+        params: List[Any] = [entity_type, entity_id]
+        if similar_type:
+            query += " AND s.similar_type = ?"
+            params.append(similar_type)
+        query += " ORDER BY s.score DESC, s.similar_type, s.similar_id LIMIT ?"
+        params.append(limit)
+
+        with self.db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT 1 FROM {table} WHERE {id_column} = ?", (entity_id,))
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
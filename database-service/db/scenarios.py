@@ -0,0 +1,131 @@
+"""What-if coverage scenarios: risk coverage after implementing, removing or planning controls."""
+
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from .graph import TaxonomyGraph
+
+# Domain label for controls without a security function
+UNASSIGNED = "Unassigned"
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def _nodes(bits: int) -> List[int]:
+    """Set bit positions of ``bits``, ascending."""
+    nodes = []
+    while bits:
+        low = bits & -bits
+        nodes.append(low.bit_length() - 1)
+        bits ^= low
+    return nodes
+
+
+def _coverage(graph: TaxonomyGraph, covered: int) -> Dict[str, Any]:
+    count = _popcount(covered)
+    pct = count / graph.risk_count * 100 if graph.risk_count else 0
+    return {"covered_risks": count, "coverage_pct": round(pct, 1)}
+
+
+def run_scenario(
+    graph: TaxonomyGraph,
+    implemented: Optional[Sequence[str]] = None,
+    removed: Sequence[str] = (),
+    planned: Sequence[str] = (),
+    name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Compare risk coverage before and after a change to the set of controls in place.
+
+    Before the change the controls in place are ``implemented`` (default: every
+    mapped control, i.e. the coverage ``/api/gaps`` reports). After it, they
+    are those minus ``removed`` plus ``planned``.
+
+    Coverage before the change comes from bitsets precomputed on the graph when
+    ``implemented`` is omitted. A removal can only uncover risks its control
+    maps, so only those risks are re-checked, against their other controls in
+    the reverse adjacency. The cost grows with the size of the change, not the
+    size of the taxonomy.
+    """
+    not_found: List[str] = []
+
+    def resolve(control_ids: Optional[Sequence[str]]) -> Optional[Set[int]]:
+        if control_ids is None:
+            return None
+        nodes = set()
+        for control_id in dict.fromkeys(control_ids):
+            node = graph.index.get(control_id)
+            if node is None or node < graph.risk_count:
+                not_found.append(control_id)
+            else:
+                nodes.add(node)
+        return nodes
+
+    base = resolve(implemented)
+    removed_nodes = resolve(removed)
+    planned_nodes = resolve(planned)
+
+    def coverage_of(control: int) -> int:
+        return graph.coverage[control - graph.risk_count]
+
+    def domain_of(control: int) -> Optional[str]:
+        return graph.domains[control]
+
+    if base is None:
+        before = graph.covered
+        domains_before = dict(graph.domain_coverage)
+    else:
+        before, domains_before = 0, {}
+        for control in base:
+            before |= coverage_of(control)
+            domains_before[domain_of(control)] = domains_before.get(domain_of(control), 0) | coverage_of(control)
+
+    def in_place_after(control: int) -> bool:
+        if control in planned_nodes:
+            return True
+        return (base is None or control in base) and control not in removed_nodes
+
+    # Risks that lose their last control overall, and per domain
+    lost, domains_lost = 0, {}
+    for control in removed_nodes:
+        if (base is not None and control not in base) or control in planned_nodes:
+            continue
+        domain = domain_of(control)
+        for risk in _nodes(coverage_of(control)):
+            others = [c for c in graph.neighbors(risk) if c != control and in_place_after(c)]
+            if not others:
+                lost |= 1 << risk
+            if not any(domain_of(c) == domain for c in others):
+                domains_lost[domain] = domains_lost.get(domain, 0) | 1 << risk
+
+    after = before & ~lost
+    domains_after = {domain: bits & ~domains_lost.get(domain, 0) for domain, bits in domains_before.items()}
+    for control in planned_nodes:
+        after |= coverage_of(control)
+        domains_after[domain_of(control)] = domains_after.get(domain_of(control), 0) | coverage_of(control)
+
+    domains = []
+    for domain in sorted(set(domains_before) | set(domains_after), key=lambda d: (d is None, d or "")):
+        count_before = _popcount(domains_before.get(domain, 0))
+        count_after = _popcount(domains_after.get(domain, 0))
+        domains.append(
+            {
+                "domain": domain or UNASSIGNED,
+                "covered_before": count_before,
+                "covered_after": count_after,
+                "delta": count_after - count_before,
+            }
+        )
+
+    before_summary, after_summary = _coverage(graph, before), _coverage(graph, after)
+    return {
+        "name": name,
+        "before": before_summary,
+        "after": after_summary,
+        "delta": after_summary["covered_risks"] - before_summary["covered_risks"],
+        "newly_uncovered": [graph.ids[risk] for risk in _nodes(before & ~after)],
+        "newly_covered": [graph.ids[risk] for risk in _nodes(after & ~before)],
+        "domains": domains,
+        "not_found": not_found,
+    }
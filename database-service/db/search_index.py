@@ -0,0 +1,70 @@
+"""Compact inverted index over all searchable entities, shipped to the browser for client-side typeahead."""
+
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Bumped whenever the artifact layout changes, so clients can reject a format they do not understand
+FORMAT_VERSION = 1
+
+ENTITY_TYPES = ("risk", "control", "definition")
+# Searchable fields, in posting bitmask order (bit i = FIELDS[i])
+FIELDS = ("id", "title", "description", "extra")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, split like ``SearchRepository.build_match_query`` splits queries."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def build_search_index(
+    documents: Sequence[Tuple[str, str, str, str, str]], field_weights: Sequence[float]
+) -> Dict[str, Any]:
+    """
+    Build the client search artifact.
+
+    Every ``(entity_type, id, title, description, extra)`` document becomes a
+    row of ``documents``. ``tokens`` is the sorted vocabulary, and
+    ``postings[i]`` lists the documents containing ``tokens[i]`` as
+    ``document * 16 + field bitmask`` values, delta-encoded so the JSON stays
+    small. ``prefixes`` maps each two-character prefix to its ``[start, end)``
+    range in ``tokens``, so a typed prefix resolves to candidate tokens
+    without scanning the vocabulary.
+
+    Args:
+        documents: Searchable entities, in result tie-break order
+        field_weights: Score weight of a match in each of ``FIELDS``
+    """
+    rows: List[List[Any]] = []
+    masks: Dict[str, Dict[int, int]] = {}
+    for number, (entity_type, entity_id, title, description, extra) in enumerate(documents):
+        rows.append([ENTITY_TYPES.index(entity_type), entity_id, title or "", description or ""])
+        for bit, text in enumerate((entity_id, title, description, extra)):
+            for token in tokenize(text):
+                postings = masks.setdefault(token, {})
+                postings[number] = postings.get(number, 0) | (1 << bit)
+
+    tokens = sorted(masks)
+    postings, prefixes = [], {}
+    for position, token in enumerate(tokens):
+        previous, encoded = 0, []
+        for number in sorted(masks[token]):
+            value = number * 16 + masks[token][number]
+            encoded.append(value - previous)
+            previous = value
+        postings.append(encoded)
+        if len(token) >= 2:
+            span = prefixes.setdefault(token[:2], [position, position + 1])
+            span[1] = position + 1
+
+    return {
+        "format": FORMAT_VERSION,
+        "types": list(ENTITY_TYPES),
+        "fields": list(FIELDS),
+        "field_weights": list(field_weights),
+        "documents": rows,
+        "tokens": tokens,
+        "postings": postings,
+        "prefixes": prefixes,
+    }
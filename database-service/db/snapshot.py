@@ -0,0 +1,414 @@
+"""In-memory snapshot backend for the read-only database."""
+
+import bisect
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .connections import DatabaseManager
+from .repositories import (
+    RiskRepository,
+    ControlRepository,
+    DefinitionRepository,
+    RelationshipRepository,
+    StatsRepository,
+    NetworkRepository,
+    GapsRepository,
+    ImpactRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DataSnapshot:
+    """
+    Indexed in-process copy of risks, controls, definitions and mappings.
+
+    The database file never changes while the service runs, so everything the
+    list, detail and summary endpoints need is loaded once and kept in hash maps,
+    adjacency lists and pre-sorted views. Records are shared between callers and
+    must be treated as read-only.
+    """
+
+    def __init__(self):
+        self.risks_by_id: Dict[str, Dict[str, Any]] = {}
+        self.controls_by_id: Dict[str, Dict[str, Any]] = {}
+        self.definitions: List[Dict[str, Any]] = []
+
+        # Sorted views (by id / term) and per-filter-key sorted views
+        self.risk_ids: List[str] = []
+        self.control_ids: List[str] = []
+        self.risk_ids_by_category: Dict[str, List[str]] = {}
+        self.control_ids_by_domain: Dict[str, List[str]] = {}
+        self.definitions_by_category: Dict[str, List[Dict[str, Any]]] = {}
+        # (term, definition_id) keys parallel to the definition lists, for keyset seeks
+        self.definition_keys: List[Tuple[str, str]] = []
+        self.definition_keys_by_category: Dict[str, List[Tuple[str, str]]] = {}
+
+        # Forward (risk -> controls) and reverse (control -> risks) adjacency
+        self.controls_by_risk: Dict[str, List[str]] = {}
+        self.risks_by_control: Dict[str, List[str]] = {}
+        self.mappings: List[Dict[str, Any]] = []
+
+        # Risks whose only control is the key, and risks covered by exactly one control (sorted by id)
+        self.sole_risks_by_control: Dict[str, List[str]] = {}
+        self.single_control_risks: List[str] = []
+        # Controls that are sole coverage for any risk, most sole-covered risks first
+        self.sole_coverage_ranking: List[str] = []
+
+        self.file_metadata: List[Dict[str, Any]] = []
+        self.stats: Dict[str, Any] = {}
+        self.gaps: Dict[str, Any] = {}
+        self.loaded_at: float = 0.0
+        self.load_ms: float = 0.0
+
+    @classmethod
+    def load(cls, db_manager: DatabaseManager) -> "DataSnapshot":
+        """Read the whole database through ``db_manager`` and build the indexes."""
+        started = time.perf_counter()
+        snapshot = cls()
+
+        with db_manager.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            tables = {row[0] for row in cursor.fetchall()}
+
+            def fetch(table: str, order_by: Optional[str] = None) -> List[Dict[str, Any]]:
+                if table not in tables:
+                    logger.warning(f"Snapshot: table {table} not found, loading it as empty")
+                    return []
+                query = f"SELECT * FROM {table}"
+                if order_by:
+                    query += f" ORDER BY {order_by}"
+                cursor.execute(query)
+                return [dict(row) for row in cursor.fetchall()]
+
+            risk_rows = fetch("risks", "risk_id")
+            control_rows = fetch("controls", "control_id")
+            definition_rows = fetch("definitions", "term, definition_id")
+            mapping_rows = fetch("risk_control_mapping")
+            snapshot.file_metadata = fetch("file_metadata")
+
+        for row in risk_rows:
+            risk_id = row["risk_id"]
+            snapshot.risks_by_id[risk_id] = {
+                "id": risk_id,
+                "title": row.get("risk_title"),
+                "description": row.get("risk_description"),
+                "category": None,
+            }
+            snapshot.risk_ids.append(risk_id)
+            if row.get("category"):
+                snapshot.risk_ids_by_category.setdefault(row["category"], []).append(risk_id)
+
+        for row in control_rows:
+            control_id = row["control_id"]
+            snapshot.controls_by_id[control_id] = {
+                "id": control_id,
+                "title": row.get("control_title"),
+                "description": row.get("control_description"),
+                "domain": row.get("security_function"),
+            }
+            snapshot.control_ids.append(control_id)
+            if row.get("security_function"):
+                snapshot.control_ids_by_domain.setdefault(row["security_function"], []).append(control_id)
+
+        for row in definition_rows:
+            definition = {
+                key: row.get(key) for key in ("definition_id", "term", "title", "description", "category", "source")
+            }
+            key = (definition["term"], definition["definition_id"])
+            snapshot.definitions.append(definition)
+            snapshot.definition_keys.append(key)
+            if definition["category"]:
+                snapshot.definitions_by_category.setdefault(definition["category"], []).append(definition)
+                snapshot.definition_keys_by_category.setdefault(definition["category"], []).append(key)
+
+        for row in mapping_rows:
+            risk_id, control_id = row["risk_id"], row["control_id"]
+            snapshot.mappings.append(
+                {"source_id": risk_id, "target_id": control_id, "relationship_type": "risk_control"}
+            )
+            if control_id in snapshot.controls_by_id:
+                snapshot.controls_by_risk.setdefault(risk_id, []).append(control_id)
+            if risk_id in snapshot.risks_by_id:
+                snapshot.risks_by_control.setdefault(control_id, []).append(risk_id)
+
+        for risk_id in snapshot.risk_ids:
+            controls = set(snapshot.controls_by_risk.get(risk_id, ()))
+            if len(controls) == 1:
+                snapshot.single_control_risks.append(risk_id)
+                snapshot.sole_risks_by_control.setdefault(controls.pop(), []).append(risk_id)
+        snapshot.sole_coverage_ranking = sorted(
+            snapshot.sole_risks_by_control, key=lambda c: (-len(snapshot.sole_risks_by_control[c]), c)
+        )
+
+        snapshot.stats = {
+            "total_risks": len(snapshot.risk_ids),
+            "total_controls": len(snapshot.control_ids),
+            "total_definitions": len(snapshot.definitions),
+            "total_relationships": len(snapshot.mappings),
+        }
+        snapshot.gaps = snapshot._compute_gaps(mapping_rows)
+
+        snapshot.loaded_at = time.time()
+        snapshot.load_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            f"Snapshot loaded in {snapshot.load_ms} ms: {snapshot.stats['total_risks']} risks, "
+            f"{snapshot.stats['total_controls']} controls, {snapshot.stats['total_definitions']} definitions, "
+            f"{snapshot.stats['total_relationships']} mappings"
+        )
+        return snapshot
+
+    def _compute_gaps(self, mapping_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Precompute the gaps analysis payload from the mapping rows."""
+        mapped_risk_ids = {row["risk_id"] for row in mapping_rows}
+        mapped_control_ids = {row["control_id"] for row in mapping_rows}
+
+        unmapped_risks = [
+            {"risk_id": r["id"], "risk_title": r["title"], "risk_description": r["description"]}
+            for r in (self.risks_by_id[i] for i in self.risk_ids)
+            if r["id"] not in mapped_risk_ids
+        ]
+        unmapped_controls = [
+            {"control_id": c["id"], "control_title": c["title"], "control_description": c["description"]}
+            for c in (self.controls_by_id[i] for i in self.control_ids)
+            if c["id"] not in mapped_control_ids
+        ]
+
+        total_risks = len(self.risk_ids)
+        total_controls = len(self.control_ids)
+        risk_coverage_pct = ((total_risks - len(unmapped_risks)) / total_risks * 100) if total_risks > 0 else 0
+        control_coverage_pct = (
+            ((total_controls - len(unmapped_controls)) / total_controls * 100) if total_controls > 0 else 0
+        )
+
+        return {
+            "summary": {
+                "total_risks": total_risks,
+                "total_controls": total_controls,
+                "mapped_risks": total_risks - len(unmapped_risks),
+                "mapped_controls": total_controls - len(unmapped_controls),
+                "unmapped_risks": len(unmapped_risks),
+                "unmapped_controls": len(unmapped_controls),
+                "risk_coverage_pct": round(risk_coverage_pct, 1),
+                "control_coverage_pct": round(control_coverage_pct, 1),
+                "control_utilization_pct": round(control_coverage_pct, 1),
+            },
+            "unmapped_risks": unmapped_risks,
+            "unmapped_controls": unmapped_controls,
+        }
+
+
+def _page(items: List[Any], limit: int, offset: int) -> List[Any]:
+    return items[offset : offset + limit]
+
+
+def _seek(keys: List[Any], after: Optional[Any], offset: int) -> int:
+    """Start index of a page: just past ``after`` in the sorted ``keys``, or ``offset``."""
+    return bisect.bisect_right(keys, after) if after is not None else offset
+
+
+class SnapshotRiskRepository(RiskRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        category: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        ids = self.snapshot.risk_ids_by_category.get(category, []) if category else self.snapshot.risk_ids
+        start = _seek(ids, after[0] if after else None, offset)
+        return [self.snapshot.risks_by_id[i] for i in _page(ids, limit, start)]
+
+    def count(self, category: Optional[str] = None) -> int:
+        return len(self.snapshot.risk_ids_by_category.get(category, []) if category else self.snapshot.risk_ids)
+
+    def get_by_id(self, risk_id: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot.risks_by_id.get(risk_id)
+
+    def get_associated_controls(self, risk_id: str) -> List[Dict[str, Any]]:
+        return [self.snapshot.controls_by_id[i] for i in self.snapshot.controls_by_risk.get(risk_id, [])]
+
+    def get_by_ids(self, risk_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        risks = self.snapshot.risks_by_id
+        return {i: risks[i] for i in risk_ids if i in risks}
+
+    def get_associated_controls_for(self, risk_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        return {i: self.get_associated_controls(i) for i in risk_ids}
+
+    def get_summary(self) -> List[Dict[str, Any]]:
+        risks = self.snapshot.risks_by_id
+        return [
+            {
+                "id": i,
+                "title": risks[i]["title"],
+                "description": risks[i]["description"],
+                "control_count": len(self.snapshot.controls_by_risk.get(i, [])),
+            }
+            for i in self.snapshot.risk_ids
+        ]
+
+
+class SnapshotControlRepository(ControlRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        domain: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        ids = self.snapshot.control_ids_by_domain.get(domain, []) if domain else self.snapshot.control_ids
+        start = _seek(ids, after[0] if after else None, offset)
+        return [self.snapshot.controls_by_id[i] for i in _page(ids, limit, start)]
+
+    def count(self, domain: Optional[str] = None) -> int:
+        return len(self.snapshot.control_ids_by_domain.get(domain, []) if domain else self.snapshot.control_ids)
+
+    def get_by_id(self, control_id: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot.controls_by_id.get(control_id)
+
+    def get_associated_risks(self, control_id: str) -> List[Dict[str, Any]]:
+        return [self.snapshot.risks_by_id[i] for i in self.snapshot.risks_by_control.get(control_id, [])]
+
+    def get_by_ids(self, control_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        controls = self.snapshot.controls_by_id
+        return {i: controls[i] for i in control_ids if i in controls}
+
+    def get_associated_risks_for(self, control_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        return {i: self.get_associated_risks(i) for i in control_ids}
+
+    def get_summary(self) -> List[Dict[str, Any]]:
+        return [
+            {**self.snapshot.controls_by_id[i], "risk_count": len(self.snapshot.risks_by_control.get(i, []))}
+            for i in self.snapshot.control_ids
+        ]
+
+
+class SnapshotDefinitionRepository(DefinitionRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        category: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        if category:
+            items = self.snapshot.definitions_by_category.get(category, [])
+            keys = self.snapshot.definition_keys_by_category.get(category, [])
+        else:
+            items, keys = self.snapshot.definitions, self.snapshot.definition_keys
+        start = _seek(keys, tuple(after[:2]) if after else None, offset)
+        return _page(items, limit, start)
+
+    def count(self, category: Optional[str] = None) -> int:
+        return len(self.snapshot.definitions_by_category.get(category, []) if category else self.snapshot.definitions)
+
+
+class SnapshotRelationshipRepository(RelationshipRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def get_relationships(self, relationship_type: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        if relationship_type and relationship_type != "risk_control":
+            return []
+        return self.snapshot.mappings[:limit]
+
+
+class SnapshotStatsRepository(StatsRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.snapshot.stats)
+
+    def get_file_metadata(self) -> List[Dict[str, Any]]:
+        return self.snapshot.file_metadata
+
+
+class SnapshotNetworkRepository(NetworkRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def get_network_data(self) -> Dict[str, Any]:
+        return {"risk_control_links": self.snapshot.mappings}
+
+
+class SnapshotGapsRepository(GapsRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def get_gaps_analysis(self) -> Dict[str, Any]:
+        return self.snapshot.gaps
+
+
+class SnapshotImpactRepository(ImpactRepository):
+    def __init__(self, db_manager: DatabaseManager, snapshot: DataSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    def _control_counts(self, control_id: str) -> Dict[str, Any]:
+        control = self.snapshot.controls_by_id[control_id]
+        return {
+            "control_id": control_id,
+            "control_title": control["title"],
+            "security_function": control["domain"],
+            "risk_count": len(set(self.snapshot.risks_by_control.get(control_id, ()))),
+            "sole_risk_count": len(self.snapshot.sole_risks_by_control.get(control_id, ())),
+        }
+
+    def get_single_points(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        risks = []
+        for risk_id in _page(snapshot.single_control_risks, limit, offset):
+            control_id = snapshot.controls_by_risk[risk_id][0]
+            risks.append(
+                {
+                    "risk_id": risk_id,
+                    "risk_title": snapshot.risks_by_id[risk_id]["title"],
+                    "control_id": control_id,
+                    "control_title": snapshot.controls_by_id[control_id]["title"],
+                }
+            )
+        return {
+            "summary": {
+                "total_risks": len(snapshot.risk_ids),
+                "uncovered_risks": sum(1 for r in snapshot.risk_ids if r not in snapshot.controls_by_risk),
+                "single_control_risks": len(snapshot.single_control_risks),
+                "sole_coverage_controls": len(snapshot.sole_coverage_ranking),
+            },
+            "risks": risks,
+            "controls": [self._control_counts(c) for c in snapshot.sole_coverage_ranking[:limit]],
+        }
+
+    def get_control_impact(self, control_id: str) -> Optional[Dict[str, Any]]:
+        if control_id not in self.snapshot.controls_by_id:
+            return None
+        impact = self._control_counts(control_id)
+        risks = [
+            {
+                "risk_id": risk_id,
+                "risk_title": self.snapshot.risks_by_id[risk_id]["title"],
+                "control_count": len(set(self.snapshot.controls_by_risk[risk_id])),
+            }
+            for risk_id in sorted(set(self.snapshot.risks_by_control.get(control_id, ())))
+        ]
+        impact["sole_risks"] = [{k: r[k] for k in ("risk_id", "risk_title")} for r in risks if r["control_count"] == 1]
+        impact["shared_risks"] = [r for r in risks if r["control_count"] > 1]
+        return impact
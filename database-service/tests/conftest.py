@@ -250,6 +250,21 @@ def sample_database(test_db_path):
     return test_db_path
 
 
+@pytest.fixture
+def add_table(sample_database):
+    """Return a function that adds a table of ``rows`` to the sample database, as the data build would."""
+
+    def add(table, columns, rows):
+        conn = sqlite3.connect(str(sample_database))
+        conn.execute(f"CREATE TABLE {table} ({columns})")
+        conn.executemany(f"INSERT INTO {table} VALUES ({','.join('?' * len(rows[0]))})", rows)
+        conn.commit()
+        conn.close()
+        return sample_database
+
+    return add
+
+
 @pytest.fixture
 def test_config(temp_dir, test_db_path):
     """Create a test configuration."""
@@ -441,6 +456,13 @@ def test_client(mock_config_manager, sample_database):
         yield mock_client
 
 
+@pytest.fixture
+def admin_headers():
+    """Enable POST /api/admin/reload with a test token and return the headers that authorize it."""
+    with patch("app.RELOAD_ADMIN_TOKEN", "test-token"):
+        yield {"X-Admin-Token": "test-token"}
+
+
 @pytest.fixture
 def database_service_process():
     """Start the database service process for end-to-end testing."""
@@ -0,0 +1,80 @@
+"""
+Tests for prefix autocomplete (/api/autocomplete).
+"""
+
+import random
+
+from db.autocomplete import CompletionIndex, normalize
+
+
+def _brute_force(entities, prefix, types, limit):
+    """Reference ranking: every entity with a matching key, by score then title."""
+    matches = []
+    for entity_type, entity_id, title, score in entities:
+        words = normalize(title).split()
+        keys = {normalize(entity_id)} | {" ".join(words[i:]) for i in range(len(words))}
+        if entity_type in types and any(key.startswith(normalize(prefix)) for key in keys):
+            matches.append((-score, normalize(title), ("risk", "control", "definition").index(entity_type), entity_id))
+    return [entity_id for *_, entity_id in sorted(matches)[:limit]]
+
+
+class TestCompletionIndex:
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        words = ["data", "model", "drift", "privacy", "poisoning", "access", "audit", "bias"]
+        entities = [
+            (
+                rng.choice(("risk", "control", "definition")),
+                f"E.{i:03d}",
+                " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))),
+                rng.randint(0, 5),
+            )
+            for i in range(300)
+        ]
+        index = CompletionIndex(entities)
+
+        for prefix in ("d", "data", "dr", "po", "privacy a", "e.01", "e 1", "zz"):
+            for types in (("risk", "control", "definition"), ("control",), ("risk", "definition")):
+                for limit in (1, 7, 50):
+                    got = [c["entity_id"] for c in index.complete(prefix, types, limit)]
+                    assert got == _brute_force(entities, prefix, types, limit), (prefix, types, limit)
+
+    def test_normalize(self):
+        assert normalize("AIR.001") == "air 001"
+        assert normalize("  Data--Poisoning_Risk ") == "data poisoning risk"
+        assert normalize(None) == ""
+
+    def test_empty_prefix_and_index(self):
+        assert CompletionIndex([]).complete("data") == []
+        assert CompletionIndex([("risk", "R1", "Data", 1)]).complete("...") == []
+
+
+class TestAutocompleteEndpoint:
+    def test_mapped_entities_rank_first(self, test_client):
+        response = test_client.get("/api/autocomplete?prefix=data")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["prefix"] == "data"
+        assert [(c["entity_type"], c["entity_id"]) for c in data["completions"]] == [
+            ("control", "AIGPC.1"),
+            ("risk", "AIR.001"),
+            ("definition", "DEF.001"),
+        ]
+        assert data["completions"][0]["title"] == "Data Encryption"
+
+    def test_word_suffix_and_type_filter(self, test_client):
+        data = test_client.get("/api/autocomplete?prefix=contr&types=definition,control").json()
+        assert [c["entity_id"] for c in data["completions"]] == ["AIGPC.3", "DEF.003"]
+
+        data = test_client.get("/api/autocomplete?prefix=contr&types=definition").json()
+        assert [c["entity_id"] for c in data["completions"]] == ["DEF.003"]
+
+    def test_ids_and_limit(self, test_client):
+        # Equal mapping degree, so ties break on title: "Compliance Risk" before "Data Privacy Risk"
+        data = test_client.get("/api/autocomplete?prefix=AIR.00&limit=2").json()
+        assert [c["entity_id"] for c in data["completions"]] == ["AIR.004", "AIR.001"]
+
+    def test_validation(self, test_client):
+        assert test_client.get("/api/autocomplete?prefix=data&types=question").status_code == 400
+        assert test_client.get("/api/autocomplete").status_code == 422
+        assert test_client.get("/api/autocomplete?prefix=zzz").json()["completions"] == []
@@ -0,0 +1,99 @@
+"""
+Tests for negotiated response compression.
+"""
+
+import gzip
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.compression import CompressionMiddleware, compress, negotiate_encoding
+
+
+class TestNegotiation:
+    """Accept-Encoding parsing."""
+
+    def test_prefers_server_order_at_equal_q(self):
+        assert negotiate_encoding("gzip, br", ("br", "gzip")) == "br"
+        assert negotiate_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+
+    def test_honours_q_values(self):
+        assert negotiate_encoding("br;q=0.5, gzip", ("br", "gzip")) == "gzip"
+        assert negotiate_encoding("gzip;q=0", ("gzip",)) is None
+        assert negotiate_encoding("*", ("br", "gzip")) == "br"
+
+    def test_identity(self):
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding("identity") is None
+
+
+class TestEndpointCompression:
+    """Compression on the database service API."""
+
+    def test_large_json_is_gzipped(self, test_client, sample_database):
+        # The sample database is tiny; compress cached bodies of any size
+        with patch("app.COMPRESSION_MIN_SIZE", 0):
+            response = test_client.get("/api/controls/summary", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert response.headers["ETag"].startswith("W/")
+        assert response.json()["details"]
+
+        plain = test_client.get("/api/controls/summary", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in plain.headers
+        assert plain.json() == response.json()
+
+    def test_weak_etag_revalidates(self, test_client, sample_database):
+        headers = {"Accept-Encoding": "gzip"}
+        with patch("app.COMPRESSION_MIN_SIZE", 0):
+            etag = test_client.get("/api/network", headers=headers).headers["ETag"]
+        assert etag.startswith("W/")
+        response = test_client.get("/api/network", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+    def test_small_bodies_are_not_compressed(self, test_client, sample_database):
+        response = test_client.get("/api/live", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_uncached_routes_use_middleware(self, test_client, sample_database):
+        response = test_client.get("/api/relationships", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        if len(response.content) >= 1024:
+            assert response.headers["Content-Encoding"] == "gzip"
+
+
+def _streaming_app():
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(200):
+                yield f'{{"row": {i}, "relationship_type": "mitigates"}}\n'.encode()
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return app
+
+
+def test_streaming_response_is_compressed():
+    client = TestClient(_streaming_app())
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers or int(response.headers["Content-Length"]) == len(
+        response.content
+    )
+    assert len(response.text.splitlines()) == 200
+
+
+def test_compress_round_trip():
+    body = b'{"source_id": "AIR.001", "target_id": "AIGPC.1"}' * 100
+    assert gzip.decompress(compress(body, "gzip")) == body
+    brotli = pytest.importorskip("brotli")
+    assert brotli.decompress(compress(body, "br")) == body
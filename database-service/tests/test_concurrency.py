@@ -0,0 +1,100 @@
+"""
+Concurrency tests: blocking database work must not serialize requests on the event loop.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+SLOW_QUERY_SECONDS = 0.2
+
+
+def _slow(result):
+    def call(*args, **kwargs):
+        time.sleep(SLOW_QUERY_SECONDS)  # Blocks the calling thread, like a long sqlite3 query
+        return result
+
+    return call
+
+
+async def _fetch_all(app, paths):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for path in paths))
+        return responses, time.perf_counter() - started
+
+
+@pytest.fixture
+def service(sample_database, mock_config_manager):
+    import app as app_module
+
+    app_module.reinitialize_repositories(str(sample_database))
+    return app_module
+
+
+class TestConcurrentRequests:
+    """Slow queries run in parallel on the database executor."""
+
+    def test_concurrent_slow_queries_overlap(self, service):
+        clients = min(5, service.db_executor.max_workers)
+        slow_gaps = _slow({"summary": {}, "unmapped_risks": [], "unmapped_controls": []})
+
+        with patch.object(service.active_generation.gaps_repo, "get_gaps_analysis", side_effect=slow_gaps):
+            responses, elapsed = asyncio.run(_fetch_all(service.app, ["/api/gaps"] * clients))
+
+        assert all(r.status_code == 200 for r in responses)
+        # Serialized on the event loop this would take clients * SLOW_QUERY_SECONDS
+        assert elapsed < SLOW_QUERY_SECONDS * clients / 2
+        assert service.db_executor.get_stats()["max_running"] >= 2
+
+    def test_event_loop_stays_responsive(self, service):
+        slow_network = _slow({"risk_control_links": []})
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=service.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                slow = asyncio.ensure_future(client.get("/api/network"))
+                await asyncio.sleep(0.02)
+                started = time.perf_counter()
+                fast = await client.get("/api/pool-stats")
+                fast_elapsed = time.perf_counter() - started
+                return await slow, fast, fast_elapsed
+
+        with patch.object(service.active_generation.network_repo, "get_network_data", side_effect=slow_network):
+            slow, fast, fast_elapsed = asyncio.run(scenario())
+
+        assert slow.status_code == 200
+        assert fast.status_code == 200
+        assert fast_elapsed < SLOW_QUERY_SECONDS / 2
+
+    def test_concurrent_real_queries(self, service):
+        paths = ["/api/risks", "/api/controls", "/api/risk/AIR.001", "/api/control/AIGPC.1", "/api/stats"] * 4
+        responses, _ = asyncio.run(_fetch_all(service.app, paths))
+
+        assert [r.status_code for r in responses] == [200] * len(paths)
+        pool = service.db_manager.get_pool_stats()
+        assert pool["open_connections"] <= pool["max_connections"]
+        assert pool["in_use_connections"] == 0
+
+
+class TestPoolExhaustion:
+    """A request that cannot get a pooled connection fails fast with 503, not 500."""
+
+    @pytest.mark.parametrize("path", ["/api/risks", "/api/risk/AIR.001", "/api/stats", "/api/search?q=data"])
+    def test_exhausted_pool_returns_503(self, service, sample_database, path):
+        from db.connections import DatabaseManager
+
+        manager = DatabaseManager(str(sample_database), max_connections=1, timeout=0.05)
+        service.activate_generation(service.build_generation(str(sample_database), manager=manager))
+
+        # Hold the only connection while the request waits for one
+        with manager.get_db_connection():
+            responses, _ = asyncio.run(_fetch_all(service.app, [path]))
+
+        assert responses[0].status_code == 503
+        assert responses[0].json()["detail"] == "Database connection pool exhausted"
+        assert manager.get_pool_stats()["timeouts"] == 1
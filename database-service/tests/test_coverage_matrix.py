@@ -0,0 +1,50 @@
+"""
+Tests for the control domain x risk coverage matrix (/api/coverage/matrix).
+"""
+
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def unassigned_database(sample_database):
+    """Sample database plus AIGPC.5, with no security function, mapped to AIR.001 and AIR.004."""
+    conn = sqlite3.connect(str(sample_database))
+    conn.execute("INSERT INTO controls (control_id, control_title) VALUES ('AIGPC.5', 'Unassigned control')")
+    conn.executemany(
+        "INSERT INTO risk_control_mapping VALUES (?, ?)", [("AIR.001", "AIGPC.5"), ("AIR.004", "AIGPC.5")]
+    )
+    conn.commit()
+    conn.close()
+    return sample_database
+
+
+class TestCoverageMatrix:
+    """GET /api/coverage/matrix."""
+
+    def test_domain_by_risk(self, test_client):
+        response = test_client.get("/api/coverage/matrix")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows"] == ["Detect", "Protect"]
+        assert data["columns"] == ["AIR.001", "AIR.002", "AIR.003", "AIR.004"]
+        assert data["shape"] == [2, 4]
+        assert data["counts"] == [0, 1, 0, 1, 1, 0, 1, 0]
+        assert data["row_totals"] == [2, 2]
+        assert data["column_totals"] == [1, 1, 1, 1]
+
+    def test_grouped_columns(self, test_client):
+        data = test_client.get("/api/coverage/matrix?group_size=3").json()
+        assert data["columns"] == ["AIR.001-AIR.003", "AIR.004"]
+        assert data["counts"] == [1, 1, 2, 0]
+        assert data["max"] == 2
+
+    def test_unassigned_domain_is_last(self, unassigned_database, test_client):
+        data = test_client.get("/api/coverage/matrix").json()
+        assert data["rows"] == ["Detect", "Protect", "Unassigned"]
+        assert data["counts"][8:] == [1, 0, 0, 1]
+        assert data["column_totals"] == [2, 1, 1, 2]
+
+    def test_validation(self, test_client):
+        assert test_client.get("/api/coverage/matrix?group_size=0").status_code == 422
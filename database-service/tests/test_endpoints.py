@@ -7,6 +7,7 @@ Tests all API endpoints for proper functionality, error handling, and response f
 import pytest
 import json
 import sqlite3
+import threading
 
 # Import the app
 import sys
@@ -17,6 +18,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # Conditional imports
 try:
     from app import app, get_db_connection, validate_database
+    from db.repositories import encode_cursor
     from unittest.mock import patch
 except ImportError:
     pytest.skip("App module not available", allow_module_level=True)
@@ -59,6 +61,42 @@ class TestHealthEndpoints:
         assert data["database_connected"] is False
         assert data["total_records"] == 0
 
+    def test_liveness_endpoint(self, test_client, mock_config_manager):
+        """Test liveness answers without touching the database."""
+        with patch("app.validate_database") as mock_validate:
+            response = test_client.get("/api/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+        mock_validate.assert_not_called()
+
+    def test_readiness_endpoint(self, test_client, sample_database, mock_config_manager):
+        """Test readiness is 200 for a valid database and 503 otherwise."""
+        assert test_client.get("/api/ready").status_code == 200
+
+        from app import reinitialize_repositories
+        reinitialize_repositories("/nonexistent/database.db")
+        response = test_client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json()["database_connected"] is False
+
+    def test_health_is_cached_per_generation(self, test_client, sample_database, mock_config_manager):
+        """Test repeated probes reuse the readiness check until it goes stale."""
+        import app as app_module
+
+        with patch("app.validate_database", wraps=app_module.validate_database) as mock_validate:
+            first = test_client.get("/api/health").json()
+            for _ in range(5):
+                assert test_client.get("/api/health").json() == first
+            mock_validate.assert_not_called()
+
+            with patch("app.READINESS_TTL", 0):
+                test_client.get("/api/health")
+                for thread in threading.enumerate():
+                    if thread.name == "readiness-refresh":
+                        thread.join(timeout=5)
+            assert mock_validate.call_count == 1
+        assert test_client.get("/api/health").json()["checked_at"] > first["checked_at"]
+
 
 class TestRisksEndpoints:
     """Test risks-related endpoints."""
@@ -124,6 +162,51 @@ class TestRisksEndpoints:
             assert response.status_code == 500
 
 
+class TestCursorPagination:
+    """Test keyset pagination headers on list endpoints."""
+
+    def test_walk_pages_with_cursor(self, test_client, sample_database, mock_config_manager):
+        """Test following X-Next-Cursor returns every control exactly once."""
+        seen, cursor = [], None
+        while True:
+            url = "/api/controls?limit=3" + (f"&cursor={cursor}" if cursor else "")
+            response = test_client.get(url)
+            assert response.status_code == 200
+            assert response.headers["X-Total-Count"] == "4"
+            seen.extend(c["id"] for c in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert seen == ["AIGPC.1", "AIGPC.2", "AIGPC.3", "AIGPC.4"]
+
+    def test_filtered_total_and_last_page(self, test_client, sample_database, mock_config_manager):
+        """Test totals follow the filter and the last page has no next cursor."""
+        response = test_client.get("/api/controls?domain=Protect&limit=10")
+        assert response.headers["X-Total-Count"] == str(len(response.json()))
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, test_client, sample_database, mock_config_manager):
+        """Test a malformed cursor is rejected."""
+        response = test_client.get("/api/risks?cursor=%%%")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "endpoint,key",
+        [
+            ("/api/risks", [{"a": 1}]),
+            ("/api/controls", [1]),
+            ("/api/controls", ["AIGPC.1", "AIGPC.2"]),
+            ("/api/definitions", ["term"]),
+            ("/api/definitions", ["term", None]),
+        ],
+    )
+    def test_cursor_with_wrong_key_shape(self, test_client, sample_database, mock_config_manager, endpoint, key):
+        """Test a well-formed cursor whose key does not fit the endpoint's sort key is rejected."""
+        response = test_client.get(f"{endpoint}?cursor={encode_cursor(key)}")
+        assert response.status_code == 400
+
+
 class TestControlsEndpoints:
     """Test controls-related endpoints."""
 
@@ -311,6 +394,44 @@ class TestDetailEndpoints:
         response = test_client.get("/api/control/NONEXISTENT")
         assert response.status_code == 404
 
+class TestBatchEndpoints:
+    """Test batch detail endpoints."""
+
+    def test_risks_batch(self, test_client, sample_database, mock_config_manager):
+        """Test risks batch returns a map keyed by id plus the ids that were not found."""
+        response = test_client.post("/api/risks/batch", json={"ids": ["AIR.001", "AIR.002", "MISSING"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["risks"]) == {"AIR.001", "AIR.002"}
+        assert data["not_found"] == ["MISSING"]
+
+        detail = test_client.get("/api/risk/AIR.001").json()
+        assert data["risks"]["AIR.001"]["risk"] == detail["risk"]
+        assert sorted(c["id"] for c in data["risks"]["AIR.001"]["associated_controls"]) == sorted(
+            c["id"] for c in detail["associated_controls"]
+        )
+
+    def test_controls_batch(self, test_client, sample_database, mock_config_manager):
+        """Test controls batch matches the single control detail endpoint."""
+        response = test_client.post("/api/controls/batch", json={"ids": ["AIGPC.1", "AIGPC.2"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["not_found"] == []
+        for control_id in ("AIGPC.1", "AIGPC.2"):
+            detail = test_client.get(f"/api/control/{control_id}").json()
+            assert data["controls"][control_id]["control"] == detail["control"]
+            assert sorted(r["id"] for r in data["controls"][control_id]["associated_risks"]) == sorted(
+                r["id"] for r in detail["associated_risks"]
+            )
+
+    def test_batch_size_limits(self, test_client, sample_database, mock_config_manager):
+        """Test empty and oversized batches are rejected."""
+        assert test_client.post("/api/risks/batch", json={"ids": []}).status_code == 400
+        with patch.dict("app.api_config", {"limits": {"max_batch_size": 2}}):
+            response = test_client.post("/api/controls/batch", json={"ids": ["AIGPC.1", "AIGPC.2", "AIGPC.3"]})
+        assert response.status_code == 400
+        assert test_client.post("/api/risks/batch", json={}).status_code == 422
+
 class TestUtilityEndpoints:
     """Test utility endpoints."""
 
@@ -357,6 +478,123 @@ class TestUtilityEndpoints:
             assert "version" in data[data_type]
 
 
+class TestConditionalRequests:
+    """Test ETag / If-None-Match handling."""
+
+    def test_etag_and_not_modified(self, test_client, sample_database, mock_config_manager):
+        """Test a matching If-None-Match returns 304 without a body."""
+        identity = {"Accept-Encoding": "identity"}
+        response = test_client.get("/api/network", headers=identity)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag.startswith('"')
+        assert response.headers["Cache-Control"] == "no-cache"
+
+        response = test_client.get("/api/network", headers={"If-None-Match": etag, **identity})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+        response = test_client.get("/api/network", headers={"If-None-Match": f'"stale", W/{etag}'})
+        assert response.status_code == 304
+
+    def test_etag_varies_by_url(self, test_client, sample_database, mock_config_manager):
+        """Test different resources and query strings get different ETags."""
+        gaps = test_client.get("/api/gaps").headers["ETag"]
+        first = test_client.get("/api/risks?limit=1&offset=0").headers["ETag"]
+        reordered = test_client.get("/api/risks?offset=0&limit=1").headers["ETag"]
+        other = test_client.get("/api/risks?limit=2").headers["ETag"]
+
+        assert first == reordered
+        assert len({gaps, first, other}) == 3
+
+        response = test_client.get("/api/risks?limit=2", headers={"If-None-Match": first})
+        assert response.status_code == 200
+
+    def test_wildcard_does_not_answer_for_missing_resources(self, test_client, sample_database, mock_config_manager):
+        """Test If-None-Match: * never turns a 404 into a 304."""
+        for path in ("/api/nonexistent", "/api/risk/AIR.999"):
+            response = test_client.get(path, headers={"If-None-Match": "*"})
+            assert response.status_code == 404
+
+        response = test_client.get("/api/stats", headers={"If-None-Match": "*"})
+        assert response.status_code == 200
+
+    def test_etag_changes_when_database_changes(self, test_client, sample_database, mock_config_manager, admin_headers):
+        """Test a reloaded database invalidates previously issued ETags."""
+        etag = test_client.get("/api/stats").headers["ETag"]
+
+        conn = sqlite3.connect(sample_database)
+        conn.execute("INSERT INTO risks (risk_id, risk_title) VALUES ('AIR.999', 'New Risk')")
+        conn.commit()
+        conn.close()
+        assert test_client.post("/api/admin/reload", headers=admin_headers).status_code == 200
+
+        response = test_client.get("/api/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_requests_never_hash_the_database(self, test_client, sample_database, mock_config_manager):
+        """Test conditional requests use the generation's fingerprint even after the file changes."""
+        etag = test_client.get("/api/stats").headers["ETag"]
+
+        conn = sqlite3.connect(sample_database)
+        conn.execute("INSERT INTO risks (risk_id, risk_title) VALUES ('AIR.999', 'New Risk')")
+        conn.commit()
+        conn.close()
+
+        hashed = AssertionError("database hashed on the request path")
+        with patch("app.file_fingerprint", side_effect=hashed), patch("db.fingerprint.open", side_effect=hashed):
+            response = test_client.get("/api/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_uncached_endpoints(self, test_client, sample_database, mock_config_manager):
+        """Test health, pool stats and error responses carry no ETag."""
+        assert "ETag" not in test_client.get("/api/health").headers
+        assert "ETag" not in test_client.get("/api/pool-stats").headers
+        assert "ETag" not in test_client.get("/api/risk/MISSING").headers
+
+
+class TestResponseCache:
+    """Test serialized responses are reused between requests."""
+
+    def test_repeat_requests_hit_cache(self, test_client, sample_database, mock_config_manager):
+        """Test a repeated GET is served from the cache with the same body and headers."""
+        import app as app_module
+
+        app_module.response_cache.clear()
+        before = app_module.response_cache.get_stats()
+        first = test_client.get("/api/controls?limit=2&offset=0")
+        second = test_client.get("/api/controls?offset=0&limit=2")
+        after = app_module.response_cache.get_stats()
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert second.headers["X-Total-Count"] == first.headers["X-Total-Count"]
+        assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+    def test_cached_bodies_match_models(self, test_client, sample_database, mock_config_manager):
+        """Test cached list responses keep the response model fields."""
+        risks = test_client.get("/api/risks").json()
+        assert set(risks[0]) == {"id", "title", "description", "category"}
+        assert test_client.get("/api/risks").json() == risks
+
+    def test_reload_clears_cache(self, test_client, sample_database, mock_config_manager, admin_headers):
+        """Test activating a new generation drops cached bodies."""
+        import app as app_module
+
+        test_client.get("/api/network")
+        assert app_module.response_cache.get_stats()["entries"] > 0
+        assert test_client.post("/api/admin/reload", headers=admin_headers).status_code == 200
+        assert app_module.response_cache.get_stats()["entries"] == 0
+
+    def test_pool_stats_reports_cache(self, test_client, sample_database, mock_config_manager):
+        """Test response cache counters are exposed for monitoring."""
+        data = test_client.get("/api/pool-stats").json()
+        assert {"hits", "misses", "evictions", "bytes"} <= set(data["response_cache"])
+
 class TestErrorHandling:
     """Test error handling across endpoints."""
 
@@ -0,0 +1,129 @@
+"""
+Tests for streaming bulk exports.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from starlette.requests import ClientDisconnect
+
+from db.connections import DatabaseManager
+from db.export import export_stream
+
+
+class TestExportStream:
+    """Export generator."""
+
+    def test_rows_are_fetched_in_batches(self, sample_database):
+        manager = DatabaseManager(str(sample_database))
+        chunks = list(export_stream(manager, "risks", "ndjson", fetch_size=1))
+
+        # One chunk per fetched batch, so no more than fetch_size rows are held at once
+        assert len(chunks) == 4
+        assert [json.loads(c)["risk_id"] for c in chunks] == ["AIR.001", "AIR.002", "AIR.003", "AIR.004"]
+
+    def test_connection_returned_when_closed_early(self, sample_database):
+        manager = DatabaseManager(str(sample_database))
+        stream = export_stream(manager, "controls", "csv", fetch_size=1)
+        next(stream)
+        assert manager.get_pool_stats()["in_use_connections"] == 1
+
+        stream.close()
+        assert manager.get_pool_stats()["in_use_connections"] == 0
+
+    def test_connection_not_bound_to_thread(self, sample_database):
+        manager = DatabaseManager(str(sample_database))
+        stream = export_stream(manager, "risks", "ndjson", fetch_size=1)
+        next(stream)
+        # A regular checkout on the same thread must not reuse the export's connection
+        with manager.get_db_connection():
+            assert manager.get_pool_stats()["in_use_connections"] == 2
+        stream.close()
+
+
+class TestExportEndpoints:
+    """GET /api/export/{entity}."""
+
+    def test_ndjson(self, test_client, sample_database):
+        response = test_client.get("/api/export/risks")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert 'filename="risks.ndjson"' in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["risk_id"] for r in rows] == ["AIR.001", "AIR.002", "AIR.003", "AIR.004"]
+
+    def test_csv_mappings_join_titles(self, test_client, sample_database):
+        response = test_client.get("/api/export/mappings?format=csv")
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows
+        assert set(rows[0]) == {"risk_id", "risk_title", "control_id", "control_title", "security_function"}
+        assert all(r["risk_title"] and r["control_title"] for r in rows)
+
+    def test_xlsx(self, test_client, sample_database):
+        openpyxl = pytest.importorskip("openpyxl")
+        response = test_client.get("/api/export/controls?format=xlsx")
+        assert response.status_code == 200
+        sheet = openpyxl.load_workbook(io.BytesIO(response.content), read_only=True)["controls"]
+        rows = list(sheet.values)
+        assert rows[0][0] == "control_id"
+        assert len(rows) == 5
+
+    def test_unknown_entity_and_format(self, test_client, sample_database):
+        assert test_client.get("/api/export/passwords").status_code == 404
+        assert test_client.get("/api/export/risks?format=pdf").status_code == 400
+
+    def test_generation_unpinned_after_stream(self, test_client, sample_database):
+        import app as app_module
+
+        test_client.get("/api/export/definitions?format=csv")
+        assert app_module.active_generation.in_flight == 0
+        assert app_module.active_generation.db_manager.get_pool_stats()["in_use_connections"] == 0
+
+    def test_concurrent_exports_are_capped(self, test_client, sample_database):
+        with patch("app.export_slots", threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()  # An export already streaming
+            response = test_client.get("/api/export/risks")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"]
+
+            slots.release()
+            assert test_client.get("/api/export/risks").status_code == 200
+            # The finished export gave its slot back
+            assert slots.acquire(blocking=False)
+
+
+class TestExportResponse:
+    """Pins, slots and connections are released however the download ends."""
+
+    @staticmethod
+    async def _receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    @pytest.mark.parametrize("message_type", ["http.response.start", "http.response.body"])
+    def test_disconnect_releases_everything(self, sample_database, message_type):
+        import app as app_module
+
+        async def send(message):
+            if message["type"] == message_type:
+                raise OSError("client disconnected")
+
+        generation = app_module.build_generation(str(sample_database))
+        with patch("app.export_slots", threading.BoundedSemaphore(1)) as slots:
+            # As the endpoint does before returning the response
+            slots.acquire()
+            generation.acquire()
+            stream = export_stream(generation.db_manager, "risks", "ndjson", fetch_size=1)
+            response = app_module.ExportResponse(generation, stream)
+
+            with pytest.raises((OSError, ClientDisconnect)):
+                asyncio.run(response({"type": "http", "asgi": {"spec_version": "2.4"}}, self._receive, send))
+
+            assert slots.acquire(blocking=False)
+        assert generation.in_flight == 0
+        assert generation.db_manager.get_pool_stats()["in_use_connections"] == 0
@@ -0,0 +1,89 @@
+"""
+Tests for typo-tolerant search (/api/search?fuzzy=true).
+"""
+
+import re
+import sqlite3
+
+import pytest
+
+from db.repositories import SearchRepository
+
+
+@pytest.fixture
+def fuzzy_database(sample_database):
+    """Sample database with the FTS5 index and trigram vocabulary the data build writes."""
+    conn = sqlite3.connect(str(sample_database))
+    conn.execute(
+        "CREATE VIRTUAL TABLE search_index USING fts5(entity_type UNINDEXED, entity_id, title, description, extra, "
+        "tokenize = 'porter unicode61', prefix = '2 3')"
+    )
+    conn.execute(
+        "INSERT INTO search_index SELECT 'risk', risk_id, risk_title, COALESCE(risk_description, ''), '' FROM risks "
+        "UNION ALL SELECT 'control', control_id, control_title, COALESCE(control_description, ''), "
+        "COALESCE(security_function, '') FROM controls "
+        "UNION ALL SELECT 'definition', definition_id, term, COALESCE(description, ''), COALESCE(category, '') "
+        "FROM definitions"
+    )
+    frequency = {}
+    for (text,) in conn.execute(
+        "SELECT risk_title || ' ' || COALESCE(risk_description, '') FROM risks "
+        "UNION ALL SELECT control_title || ' ' || COALESCE(control_description, '') FROM controls "
+        "UNION ALL SELECT term || ' ' || COALESCE(description, '') FROM definitions"
+    ):
+        for word in re.findall(r"\w+", text.lower()):
+            if len(word) >= 3:
+                frequency[word] = frequency.get(word, 0) + 1
+    conn.execute("CREATE TABLE search_terms (term_id INTEGER, term TEXT, trigram_count INTEGER, frequency INTEGER)")
+    conn.execute("CREATE TABLE search_trigrams (trigram TEXT, term_id INTEGER)")
+    for term_id, term in enumerate(sorted(frequency), start=1):
+        grams = SearchRepository.trigrams(term)
+        conn.execute("INSERT INTO search_terms VALUES (?, ?, ?, ?)", (term_id, term, len(grams), frequency[term]))
+        conn.executemany("INSERT INTO search_trigrams VALUES (?, ?)", [(gram, term_id) for gram in grams])
+    conn.commit()
+    conn.close()
+    return sample_database
+
+
+class TestFuzzySearch:
+    """GET /api/search?fuzzy=true."""
+
+    def test_misspelling_finds_entities(self, fuzzy_database, test_client):
+        assert test_client.get("/api/search?q=encription").json()["results"] == []
+
+        data = test_client.get("/api/search?q=encription&fuzzy=true").json()
+        assert [r["id"] for r in data["results"]] == ["AIGPC.1"]
+        assert data["corrections"] == {"encription": ["encryption"]}
+        assert 0.3 <= data["results"][0]["similarity"] < 1
+
+    def test_exact_matches_rank_before_corrections(self, fuzzy_database, test_client):
+        data = test_client.get("/api/search?q=model&fuzzy=true").json()
+        similarities = [r["similarity"] for r in data["results"]]
+        assert similarities == sorted(similarities, reverse=True)
+        assert similarities[0] == 1.0
+        assert "model" not in data["corrections"]
+
+    def test_threshold_and_types(self, fuzzy_database, test_client):
+        assert test_client.get("/api/search?q=encription&fuzzy=true&threshold=0.9").json()["results"] == []
+        data = test_client.get("/api/search?q=complaince&fuzzy=true&types=definition").json()
+        assert [r["id"] for r in data["results"]] == ["DEF.004"]
+
+    def test_requires_trigram_index(self, test_client):
+        response = test_client.get("/api/search?q=encription&fuzzy=true")
+        assert response.status_code == 404
+        assert "rebuild" in response.json()["detail"]
+
+    def test_invalid_threshold(self, fuzzy_database, test_client):
+        assert test_client.get("/api/search?q=data&fuzzy=true&threshold=0").status_code == 422
+
+
+def test_similar_terms_prunes_by_trigram_bounds(fuzzy_database):
+    from db.connections import DatabaseManager
+
+    repo = SearchRepository(DatabaseManager(str(fuzzy_database)))
+    assert repo.has_trigram_index()
+    with repo.db_manager.get_db_connection() as conn:
+        terms = repo.similar_terms(conn.cursor(), "hallucinaton", 0.3, 10)
+        assert terms == []
+        terms = repo.similar_terms(conn.cursor(), "acess", 0.3, 10)
+        assert terms[0][0] == "access"
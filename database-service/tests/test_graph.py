@@ -0,0 +1,102 @@
+"""
+Tests for the CSR risk-control graph and the /api/graph endpoints.
+"""
+
+import pytest
+
+from db.connections import DatabaseManager
+from db.graph import TaxonomyGraph
+from db.snapshot import DataSnapshot
+
+
+@pytest.fixture
+def chain_graph():
+    """R1 - C1 - R2 - C2 - R3 in one component, plus R4 - C3 and the isolated control C4."""
+    risks = [("R1", "Risk 1"), ("R2", "Risk 2"), ("R3", "Risk 3"), ("R4", "Risk 4")]
+    controls = [("C1", "Control 1", "Protect"), ("C2", "Control 2", "Detect"), ("C3", "Control 3", None),
+                ("C4", "Control 4", None)]
+    edges = [("R1", "C1"), ("R2", "C1"), ("R2", "C2"), ("R3", "C2"), ("R4", "C3"), ("R4", "C3"), ("R9", "C1")]
+    return TaxonomyGraph(risks, controls, edges)
+
+
+class TestTaxonomyGraph:
+    """CSR construction and queries."""
+
+    def test_csr_rows(self, chain_graph):
+        g = chain_graph
+        r2, c1 = g.index["R2"], g.index["C1"]
+        assert [g.ids[n] for n in g.fwd_targets[g.fwd_offsets[r2]:g.fwd_offsets[r2 + 1]]] == ["C1", "C2"]
+        assert [g.ids[n] for n in g.rev_targets[g.rev_offsets[c1]:g.rev_offsets[c1 + 1]]] == ["R1", "R2"]
+        # Duplicate and dangling mappings are dropped
+        assert g.edge_count == 5
+
+    def test_neighborhood_hops(self, chain_graph):
+        one = chain_graph.neighborhood("R1", hops=1)
+        assert {n["id"]: n["distance"] for n in one["nodes"]} == {"R1": 0, "C1": 1}
+
+        three = chain_graph.neighborhood("R1", hops=3)
+        assert {n["id"] for n in three["nodes"]} == {"R1", "C1", "R2", "C2"}
+        assert {(e["source_id"], e["target_id"]) for e in three["edges"]} == {("R1", "C1"), ("R2", "C1"), ("R2", "C2")}
+        assert not three["truncated"]
+
+    def test_neighborhood_truncation_keeps_nearest(self, chain_graph):
+        result = chain_graph.neighborhood("C2", hops=3, max_nodes=3)
+        assert result["truncated"]
+        assert {n["id"] for n in result["nodes"]} == {"C2", "R2", "R3"}
+
+    def test_unknown_node(self, chain_graph):
+        assert chain_graph.neighborhood("nope") is None
+
+    def test_components(self, chain_graph):
+        components = chain_graph.components()
+        assert [(c["size"], c["risks"], c["controls"]) for c in components] == [(5, 3, 2), (2, 1, 1), (1, 0, 1)]
+        assert [c["size"] for c in chain_graph.components(min_size=2)] == [5, 2]
+        assert chain_graph.get_stats()["isolated"] == 1
+
+    def test_subgraph_is_induced(self, chain_graph):
+        result = chain_graph.subgraph(["R1", "R2", "C1", "C3", "missing"])
+        assert {n["id"] for n in result["nodes"]} == {"R1", "R2", "C1", "C3"}
+        assert {(e["source_id"], e["target_id"]) for e in result["edges"]} == {("R1", "C1"), ("R2", "C1")}
+        assert result["not_found"] == ["missing"]
+
+    def test_snapshot_and_sqlite_builds_match(self, sample_database):
+        manager = DatabaseManager(str(sample_database))
+        from_sqlite = TaxonomyGraph.load(manager)
+        from_snapshot = TaxonomyGraph.from_snapshot(DataSnapshot.load(manager))
+        assert from_sqlite.ids == from_snapshot.ids
+        assert list(from_sqlite.fwd_targets) == list(from_snapshot.fwd_targets)
+        assert from_sqlite.get_stats()["components"] == 4
+
+
+class TestGraphEndpoints:
+    """/api/graph endpoints on the sample database."""
+
+    def test_neighbors(self, test_client):
+        response = test_client.get("/api/graph/neighbors?id=AIR.001&hops=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["center"] == "AIR.001"
+        assert {n["id"] for n in data["nodes"]} == {"AIR.001", "AIGPC.1"}
+        assert data["edges"] == [{"source_id": "AIR.001", "target_id": "AIGPC.1", "relationship_type": "risk_control"}]
+
+    def test_neighbors_validation(self, test_client):
+        assert test_client.get("/api/graph/neighbors?id=AIR.999").status_code == 404
+        assert test_client.get("/api/graph/neighbors?id=AIR.001&hops=99").status_code == 422
+
+    def test_components(self, test_client):
+        data = test_client.get("/api/graph/components").json()
+        assert data["total"] == 4
+        assert all(c["size"] == 2 for c in data["components"])
+
+        component = data["components"][0]["component"]
+        detail = test_client.get(f"/api/graph/components/{component}").json()
+        assert len(detail["nodes"]) == 2 and len(detail["edges"]) == 1
+        assert test_client.get("/api/graph/components/99").status_code == 404
+
+    def test_subgraph(self, test_client):
+        response = test_client.post("/api/graph/subgraph", json={"ids": ["AIR.002", "AIGPC.2", "AIGPC.3"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["nodes"]) == 3
+        assert [(e["source_id"], e["target_id"]) for e in data["edges"]] == [("AIR.002", "AIGPC.2")]
+        assert test_client.post("/api/graph/subgraph", json={"ids": []}).status_code == 400
@@ -0,0 +1,93 @@
+"""
+Tests for single-point-of-failure analysis and control impact.
+"""
+
+import sqlite3
+
+import pytest
+
+from db.connections import DatabaseManager
+from db.repositories import ImpactRepository
+from db.snapshot import DataSnapshot, SnapshotImpactRepository
+
+
+@pytest.fixture
+def shared_database(sample_database):
+    """Sample database where AIGPC.2 also maps AIR.001, so AIR.001 has two controls."""
+    conn = sqlite3.connect(str(sample_database))
+    conn.execute("INSERT INTO risk_control_mapping VALUES ('AIR.001', 'AIGPC.2')")
+    conn.commit()
+    conn.close()
+    return sample_database
+
+
+def build_coverage_tables(db_path):
+    """Materialize the coverage tables the way the data build does."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(f"CREATE TABLE risk_coverage AS {ImpactRepository.RISK_COVERAGE_SQL}")
+    conn.execute(
+        f"CREATE TABLE control_impact AS {ImpactRepository.CONTROL_IMPACT_SQL.format(risk_coverage='risk_coverage')}"
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(params=["subquery", "tables", "snapshot"])
+def impact_repo(request, shared_database):
+    if request.param == "tables":
+        build_coverage_tables(shared_database)
+    manager = DatabaseManager(str(shared_database))
+    if request.param == "snapshot":
+        return SnapshotImpactRepository(manager, DataSnapshot.load(manager))
+    repo = ImpactRepository(manager)
+    assert repo.has_coverage_index() == (request.param == "tables")
+    return repo
+
+
+class TestImpactRepository:
+    """Same answers from the precomputed tables, the fallback subqueries and the snapshot."""
+
+    def test_single_points(self, impact_repo):
+        data = impact_repo.get_single_points()
+        assert data["summary"] == {
+            "total_risks": 4,
+            "uncovered_risks": 0,
+            "single_control_risks": 3,
+            "sole_coverage_controls": 3,
+        }
+        assert [r["risk_id"] for r in data["risks"]] == ["AIR.002", "AIR.003", "AIR.004"]
+        assert data["risks"][0]["control_id"] == "AIGPC.2"
+        # AIGPC.1 no longer covers anything alone
+        assert [c["control_id"] for c in data["controls"]] == ["AIGPC.2", "AIGPC.3", "AIGPC.4"]
+        assert data["controls"][0]["risk_count"] == 2
+
+    def test_single_points_paging(self, impact_repo):
+        data = impact_repo.get_single_points(limit=1, offset=1)
+        assert [r["risk_id"] for r in data["risks"]] == ["AIR.003"]
+        assert len(data["controls"]) == 1
+
+    def test_control_impact(self, impact_repo):
+        impact = impact_repo.get_control_impact("AIGPC.2")
+        assert (impact["risk_count"], impact["sole_risk_count"]) == (2, 1)
+        assert [r["risk_id"] for r in impact["sole_risks"]] == ["AIR.002"]
+        assert impact["shared_risks"] == [
+            {"risk_id": "AIR.001", "risk_title": impact["shared_risks"][0]["risk_title"], "control_count": 2}
+        ]
+        assert impact_repo.get_control_impact("AIGPC.1")["sole_risks"] == []
+        assert impact_repo.get_control_impact("AIGPC.999") is None
+
+
+class TestImpactEndpoints:
+    """/api/analysis/single-points and /api/control/{id}/impact on the sample database."""
+
+    def test_single_points(self, test_client):
+        response = test_client.get("/api/analysis/single-points")
+        assert response.status_code == 200
+        assert response.headers["x-total-count"] == "4"
+        assert response.json()["summary"]["single_control_risks"] == 4
+
+    def test_control_impact(self, test_client):
+        data = test_client.get("/api/control/AIGPC.3/impact").json()
+        assert data["sole_risk_count"] == 1
+        assert [r["risk_id"] for r in data["sole_risks"]] == ["AIR.003"]
+        assert test_client.get("/api/control/AIGPC.999/impact").status_code == 404
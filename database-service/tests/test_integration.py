@@ -65,8 +65,10 @@ class TestDatabaseOperations:
             count = cursor.fetchone()[0]
             assert count > 0
 
-    def test_database_connection_error_handling(self, mock_config_manager):
+    def test_database_connection_error_handling(self, sample_database, mock_config_manager):
         """Test database connection error handling."""
+        # Start from an empty pool so the checkout has to open a connection
+        reinitialize_repositories(str(sample_database))
         with patch("sqlite3.connect") as mock_connect:
             mock_connect.side_effect = sqlite3.Error("Connection failed")
             with pytest.raises(Exception):
@@ -0,0 +1,77 @@
+"""
+Tests for the set-cover optimizer and POST /api/optimize/cover.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from db.graph import TaxonomyGraph
+from db.optimize import cover_risks
+
+
+@pytest.fixture
+def cover_graph():
+    """C-ALL maps every risk; C12, C34 and C5 split them; C1 only maps R1."""
+    risks = [(f"R{i}", f"Risk {i}") for i in range(1, 7)]
+    controls = [("C-ALL", "All", None), ("C12", "One and two", None), ("C34", "Three and four", None),
+                ("C5", "Five", None), ("C1", "One", None)]
+    edges = [("R1", "C-ALL"), ("R2", "C-ALL"), ("R3", "C-ALL"), ("R4", "C-ALL"), ("R5", "C-ALL"),
+             ("R1", "C12"), ("R2", "C12"), ("R3", "C34"), ("R4", "C34"), ("R5", "C5"), ("R1", "C1")]
+    return TaxonomyGraph(risks, controls, edges)
+
+
+class TestCoverRisks:
+    """Greedy weighted set cover."""
+
+    def test_unit_costs_pick_widest_control(self, cover_graph):
+        result = cover_risks(cover_graph, ["R1", "R2", "R3", "R4", "R5"])
+        assert [c["control_id"] for c in result["controls"]] == ["C-ALL"]
+        assert result["total_cost"] == 1
+        assert all(r["covered_by"] == ["C-ALL"] for r in result["risks"])
+
+    def test_costs_change_the_choice(self, cover_graph):
+        result = cover_risks(cover_graph, ["R1", "R2", "R3", "R4", "R5"], costs={"C-ALL": 10})
+        assert sorted(c["control_id"] for c in result["controls"]) == ["C12", "C34", "C5"]
+        assert result["total_cost"] == 3
+
+    def test_exclude_and_uncoverable(self, cover_graph):
+        result = cover_risks(cover_graph, ["R1", "R5", "R6", "R99"], exclude=["C-ALL", "C5"])
+        assert [c["control_id"] for c in result["controls"]] in (["C12"], ["C1"])
+        assert sorted(result["uncovered"]) == ["R5", "R6"]
+        assert result["not_found"] == ["R99"]
+
+    def test_redundant_picks_are_dropped(self, cover_graph):
+        # Greedy takes C12 (cheapest per risk) then C-ALL for R3; C12 is then redundant
+        result = cover_risks(cover_graph, ["R1", "R2", "R3"], costs={"C12": 0.5, "C34": 5, "C-ALL": 1.2})
+        assert [c["control_id"] for c in result["controls"]] == ["C-ALL"]
+
+    def test_every_coverable_risk_is_covered(self):
+        rng = random.Random(7)
+        risks = [(f"R{i:03d}", None) for i in range(200)]
+        controls = [(f"C{i:03d}", None, None) for i in range(300)]
+        edges = [(rng.choice(risks)[0], c[0]) for c in controls for _ in range(rng.randint(1, 6))]
+        graph = TaxonomyGraph(risks, controls, edges)
+        costs = {c[0]: rng.uniform(0.5, 3) for c in controls}
+
+        result = cover_risks(graph, [r[0] for r in risks], costs=costs)
+        covered = set(itertools.chain.from_iterable(c["covers"] for c in result["controls"]))
+        assert covered == {r[0] for r in risks} - set(result["uncovered"])
+        assert all(r["covered_by"] for r in result["risks"] if r["risk_id"] not in result["uncovered"])
+
+
+class TestCoverEndpoint:
+    """POST /api/optimize/cover on the sample database."""
+
+    def test_cover(self, test_client):
+        response = test_client.post("/api/optimize/cover", json={"risk_ids": ["AIR.001", "AIR.002"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert sorted(c["control_id"] for c in data["controls"]) == ["AIGPC.1", "AIGPC.2"]
+        assert data["uncovered"] == [] and data["not_found"] == []
+
+    def test_validation(self, test_client):
+        assert test_client.post("/api/optimize/cover", json={"risk_ids": []}).status_code == 400
+        response = test_client.post("/api/optimize/cover", json={"risk_ids": ["AIR.001"], "costs": {"AIGPC.1": 0}})
+        assert response.status_code == 400
@@ -0,0 +1,50 @@
+"""
+Tests for centrality rankings (/api/rankings).
+"""
+
+import pytest
+
+
+@pytest.fixture
+def metrics_database(add_table):
+    return add_table(
+        "entity_metrics",
+        "entity_type TEXT, entity_id TEXT, degree INTEGER, degree_centrality REAL, "
+        "pagerank REAL, eigenvector REAL, betweenness REAL",
+        [
+            ("risk", "AIR.001", 1, 0.25, 0.10, 0.2, 0.00),
+            ("risk", "AIR.002", 3, 0.75, 0.30, 1.0, 0.40),
+            ("risk", "AIR.003", 2, 0.50, 0.20, 0.6, 0.10),
+            ("control", "AIGPC.1", 2, 0.50, 0.25, 0.9, 0.30),
+        ],
+    )
+
+
+class TestRankings:
+    """GET /api/rankings/{entity_type}."""
+
+    def test_ranked_by_metric(self, metrics_database, test_client):
+        response = test_client.get("/api/rankings/risks?metric=betweenness")
+        assert response.status_code == 200
+        assert response.headers["x-total-count"] == "3"
+        rankings = response.json()["rankings"]
+        assert [(r["rank"], r["entity_id"]) for r in rankings] == [(1, "AIR.002"), (2, "AIR.003"), (3, "AIR.001")]
+        assert rankings[0]["title"]
+        assert rankings[0]["pagerank"] == 0.30
+
+    def test_ascending_page(self, metrics_database, test_client):
+        data = test_client.get("/api/rankings/risk?metric=degree&order=asc&limit=1&offset=1").json()
+        assert [(r["rank"], r["entity_id"]) for r in data["rankings"]] == [(2, "AIR.003")]
+
+    def test_controls(self, metrics_database, test_client):
+        data = test_client.get("/api/rankings/controls").json()
+        assert data["metric"] == "pagerank"
+        assert [r["entity_id"] for r in data["rankings"]] == ["AIGPC.1"]
+
+    def test_validation(self, metrics_database, test_client):
+        assert test_client.get("/api/rankings/risks?metric=fame").status_code == 400
+        assert test_client.get("/api/rankings/definitions").status_code == 404
+        assert test_client.get("/api/rankings/risks?order=sideways").status_code == 422
+
+    def test_database_without_metrics(self, test_client):
+        assert test_client.get("/api/rankings/risks").status_code == 404
@@ -0,0 +1,124 @@
+"""
+Tests for zero-downtime reloads of the database file.
+"""
+
+import os
+import shutil
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from db.connections import DatabaseManager
+from db.generations import DatabaseGeneration, DatabaseWatcher
+
+
+def _replace_database(sample_database, temp_dir, new_title):
+    """Write a modified copy of the database and atomically rename it over the original."""
+    staging = temp_dir / "staging.db"
+    shutil.copy(sample_database, staging)
+    conn = sqlite3.connect(staging)
+    conn.execute("UPDATE risks SET risk_title = ? WHERE risk_id = 'AIR.001'", (new_title,))
+    conn.commit()
+    conn.close()
+    os.replace(staging, sample_database)
+
+
+class TestDatabaseGeneration:
+    """Generation lifecycle."""
+
+    def test_retired_generation_closes_after_drain(self, sample_database):
+        manager = DatabaseManager(str(sample_database))
+        generation = DatabaseGeneration(1, str(sample_database), manager, {})
+
+        generation.acquire()
+        with manager.get_db_connection() as conn:
+            generation.retire()
+            # Still usable by the request that pinned it
+            conn.execute("SELECT COUNT(*) FROM risks").fetchone()
+        assert manager.get_pool_stats()["open_connections"] == 1
+
+        generation.release()
+        assert manager.get_pool_stats()["open_connections"] == 0
+
+
+class TestAdminReload:
+    """POST /api/admin/reload."""
+
+    def test_reload_switches_generation(self, test_client, sample_database, temp_dir, admin_headers):
+        import app as app_module
+
+        before = test_client.get("/api/health").json()
+        old_generation = app_module.active_generation
+        _replace_database(sample_database, temp_dir, "Reloaded Risk")
+
+        response = test_client.post("/api/admin/reload", headers=admin_headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["previous_generation"] == before["generation"]
+        assert body["generation"] > before["generation"]
+
+        health = test_client.get("/api/health").json()
+        assert health["generation"] == body["generation"]
+        assert health["database_fingerprint"] != before["database_fingerprint"]
+        assert test_client.get("/api/risk/AIR.001").json()["risk"]["title"] == "Reloaded Risk"
+
+        # The retired generation had no requests in flight, so its pool is closed
+        assert old_generation.db_manager.get_pool_stats()["open_connections"] == 0
+
+    def test_reload_invalidates_etags_of_replaced_file(self, test_client, sample_database, temp_dir, admin_headers):
+        identity = {"Accept-Encoding": "identity"}
+        etag = test_client.get("/api/risk/AIR.001", headers=identity).headers["ETag"]
+        _replace_database(sample_database, temp_dir, "Reloaded Risk")
+
+        # Until the reload, the active generation keeps the fingerprint it was loaded with
+        assert test_client.get("/api/risk/AIR.001", headers=identity).headers["ETag"] == etag
+
+        assert test_client.post("/api/admin/reload", headers=admin_headers).status_code == 200
+        response = test_client.get("/api/risk/AIR.001", headers={"If-None-Match": etag, **identity})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["risk"]["title"] == "Reloaded Risk"
+
+    def test_invalid_database_keeps_active_generation(self, test_client, sample_database, temp_dir, admin_headers):
+        generation = test_client.get("/api/health").json()["generation"]
+
+        conn = sqlite3.connect(temp_dir / "broken.db")
+        conn.execute("CREATE TABLE risks (risk_id TEXT)")
+        conn.commit()
+        conn.close()
+        os.replace(temp_dir / "broken.db", sample_database)
+
+        response = test_client.post("/api/admin/reload", headers=admin_headers)
+        assert response.status_code == 409
+        assert test_client.get("/api/health").json()["generation"] == generation
+
+    def test_admin_token(self, test_client):
+        # Disabled until a token is configured
+        assert test_client.post("/api/admin/reload").status_code == 403
+        assert test_client.post("/api/admin/reload", headers={"X-Admin-Token": ""}).status_code == 403
+
+        with patch("app.RELOAD_ADMIN_TOKEN", "secret"):
+            assert test_client.post("/api/admin/reload").status_code == 403
+            assert test_client.post("/api/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+            response = test_client.post("/api/admin/reload", headers={"X-Admin-Token": "secret"})
+            assert response.status_code == 200
+
+
+class TestDatabaseWatcher:
+    """Polling watcher."""
+
+    def test_reports_stable_replacement(self, sample_database, temp_dir):
+        calls = []
+        watcher = DatabaseWatcher(lambda: str(sample_database), lambda: calls.append(1), interval=0.05)
+        watcher.start()
+        try:
+            _replace_database(sample_database, temp_dir, "Watched")
+            deadline = time.time() + 5
+            while not calls and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+        assert calls == [1]
@@ -3,7 +3,7 @@ import sqlite3
 import pytest
 from unittest.mock import MagicMock
 from db.connections import DatabaseManager
-from db.repositories import RiskRepository, ControlRepository
+from db.repositories import RiskRepository, ControlRepository, SearchRepository, encode_cursor, decode_cursor
 
 @pytest.fixture
 def temp_db(tmp_path):
@@ -63,3 +63,215 @@ def test_control_repository_get_associated_risks(db_manager):
     risks = repo.get_associated_risks("C1")
     assert len(risks) == 1
     assert risks[0]["id"] == "R1"
+
+def test_risk_repository_get_by_ids(db_manager):
+    repo = RiskRepository(db_manager)
+    risks = repo.get_by_ids(["R1", "R99", "R1"])
+    assert list(risks) == ["R1"]
+    assert risks["R1"]["title"] == "Risk 1"
+
+    associations = repo.get_associated_controls_for(["R1", "R99"])
+    assert [c["id"] for c in associations["R1"]] == ["C1"]
+    assert associations["R99"] == []
+
+def test_control_repository_get_by_ids_chunks_large_batches(temp_db, db_manager):
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO controls VALUES (?, ?, 'Desc', 'Domain 1')", [(f"C{i:04d}", f"Control {i}") for i in range(2, 1202)]
+    )
+    conn.executemany("INSERT INTO risk_control_mapping VALUES ('R1', ?)", [(f"C{i:04d}",) for i in range(2, 1202)])
+    conn.commit()
+    conn.close()
+
+    repo = ControlRepository(db_manager)
+    ids = [f"C{i:04d}" for i in range(2, 1202)]
+    assert len(repo.get_by_ids(ids)) == 1200
+    associations = repo.get_associated_risks_for(ids)
+    assert all([r["id"] for r in risks] == ["R1"] for risks in associations.values())
+
+def test_connection_pool_reuses_connections(db_manager):
+    repo = RiskRepository(db_manager)
+    repo.get_all(limit=10)
+    repo.get_by_id("R1")
+
+    stats = db_manager.get_pool_stats()
+    assert stats["checkouts"] == 2
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["open_connections"] == 1
+
+def test_connection_pool_shares_connection_within_checkout(db_manager):
+    repo = RiskRepository(db_manager)
+    with db_manager.get_db_connection() as outer:
+        repo.get_by_id("R1")
+        repo.get_associated_controls("R1")
+        with db_manager.get_db_connection() as inner:
+            assert inner is outer
+
+    assert db_manager.get_pool_stats()["checkouts"] == 1
+
+def test_connection_pool_is_read_only(db_manager):
+    with pytest.raises(Exception):
+        with db_manager.get_db_connection() as conn:
+            conn.execute("DELETE FROM risks")
+
+def test_connection_pool_bounded_by_max_connections(temp_db):
+    import threading
+
+    manager = DatabaseManager(temp_db, max_connections=2, timeout=5)
+    release = threading.Event()
+    started = threading.Barrier(3)
+
+    def hold():
+        with manager.get_db_connection():
+            started.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for t in threads:
+        t.start()
+    started.wait()
+    assert manager.get_pool_stats()["in_use_connections"] == 2
+
+    timer = threading.Timer(0.05, release.set)
+    timer.start()
+    with manager.get_db_connection():
+        pass
+    for t in threads:
+        t.join()
+
+    stats = manager.get_pool_stats()
+    assert stats["open_connections"] == 2
+    assert stats["max_wait_ms"] > 0
+
+def test_risk_repository_get_summary_counts_controls(temp_db, db_manager):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO risks VALUES ('R2', 'Risk 2', 'Desc 2')")
+    conn.execute("INSERT INTO controls VALUES ('C2', 'Control 2', 'Desc 2', 'Domain 2')")
+    conn.execute("INSERT INTO risk_control_mapping VALUES ('R1', 'C2')")
+    conn.commit()
+    conn.close()
+
+    summary = {row["id"]: row for row in RiskRepository(db_manager).get_summary()}
+    assert summary["R1"]["control_count"] == 2
+    assert summary["R2"]["control_count"] == 0
+
+    control_summary = {row["id"]: row for row in ControlRepository(db_manager).get_summary()}
+    assert control_summary["C1"]["risk_count"] == 1
+    assert control_summary["C2"]["domain"] == "Domain 2"
+
+def test_risk_repository_get_summary_is_not_truncated(temp_db, db_manager):
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO risks VALUES (?, ?, ?)",
+        [(f"R{i:04d}", f"Risk {i}", "Desc") for i in range(150)],
+    )
+    conn.commit()
+    conn.close()
+
+    assert len(RiskRepository(db_manager).get_summary()) == 151
+
+@pytest.fixture
+def fts_db_manager(temp_db):
+    conn = sqlite3.connect(temp_db)
+    cursor = conn.cursor()
+    cursor.execute("CREATE TABLE definitions (definition_id TEXT PRIMARY KEY, term TEXT, title TEXT, description TEXT, category TEXT, source TEXT)")
+    cursor.execute("INSERT INTO risks VALUES ('R2', 'Adversarial Attacks', 'Inputs crafted to fool a model')")
+    cursor.execute("INSERT INTO controls VALUES ('C2', 'Input Validation', 'Detect adversarial inputs before inference', 'Detect')")
+    cursor.execute("INSERT INTO definitions VALUES ('D1', 'Adversarial Example', 'Adversarial Example', 'An input perturbed to cause errors', 'Security', 'NIST')")
+    cursor.execute(
+        "CREATE VIRTUAL TABLE search_index USING fts5(entity_type UNINDEXED, entity_id, title, description, extra, "
+        "tokenize = 'porter unicode61', prefix = '2 3')"
+    )
+    cursor.execute(
+        "INSERT INTO search_index SELECT 'risk', risk_id, risk_title, risk_description, '' FROM risks "
+        "UNION ALL SELECT 'control', control_id, control_title, control_description, security_function FROM controls "
+        "UNION ALL SELECT 'definition', definition_id, term, description, category FROM definitions"
+    )
+    conn.commit()
+    conn.close()
+    return DatabaseManager(temp_db)
+
+def test_search_ranked_uses_fts_across_types(fts_db_manager):
+    repo = SearchRepository(fts_db_manager)
+    assert repo.has_fts_index()
+
+    page = repo.search_ranked("adversar", limit=10)
+    types = {r["type"] for r in page["results"]}
+    assert page["total"] == 3
+    assert types == {"risk", "control", "definition"}
+    # Title matches outrank description-only matches
+    assert page["results"][-1]["id"] == "C2"
+    assert "<mark>" in page["results"][0]["title_highlight"]
+
+def test_search_ranked_escapes_highlighted_text(temp_db, fts_db_manager):
+    conn = sqlite3.connect(temp_db)
+    conn.execute(
+        "INSERT INTO search_index VALUES ('risk', 'R3', 'Adversarial <img src=x onerror=alert(1)>', "
+        "'Payload & <b>markup</b> in adversarial text', '')"
+    )
+    conn.commit()
+    conn.close()
+
+    result = SearchRepository(fts_db_manager).search_ranked("onerror")["results"][0]
+    assert result["title_highlight"] == "Adversarial &lt;img src=x <mark>onerror</mark>=alert(1)&gt;"
+    assert "<b>" not in result["snippet"] and "&amp;" in result["snippet"]
+    # Raw fields stay unescaped text
+    assert result["title"] == "Adversarial <img src=x onerror=alert(1)>"
+
+def test_search_ranked_definitions_keep_category_and_source(fts_db_manager):
+    results = SearchRepository(fts_db_manager).search_ranked("adversarial")["results"]
+    definition = next(r for r in results if r["type"] == "definition")
+    assert (definition["category"], definition["source"]) == ("Security", "NIST")
+    assert all("category" not in r for r in results if r["type"] != "definition")
+
+def test_search_ranked_paginates_and_filters(fts_db_manager):
+    repo = SearchRepository(fts_db_manager)
+    first = repo.search_ranked("adversarial", limit=1, offset=0)
+    second = repo.search_ranked("adversarial", limit=1, offset=1)
+    assert first["results"][0]["id"] != second["results"][0]["id"]
+
+    only_definitions = repo.search_ranked("adversarial", entity_types=["definition"])
+    assert [r["id"] for r in only_definitions["results"]] == ["D1"]
+
+def test_search_ranked_escapes_fts_syntax(fts_db_manager):
+    repo = SearchRepository(fts_db_manager)
+    assert repo.search_ranked('adversarial"* (')["total"] == 3
+    assert repo.search_ranked("!!!")["results"] == []
+
+def test_search_ranked_falls_back_without_fts(db_manager):
+    repo = SearchRepository(db_manager)
+    assert not repo.has_fts_index()
+    page = repo.search_ranked("Risk", limit=10, entity_types=["risk", "control"])
+    assert [r["id"] for r in page["results"]] == ["R1"]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["Bias", "DEF.002"])
+    assert decode_cursor(cursor) == ["Bias", "DEF.002"]
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!")
+
+
+def test_control_repository_keyset_pagination(temp_db, db_manager):
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO controls (control_id, control_title, control_description, security_function) VALUES (?, ?, ?, ?)",
+        [(f"C{i}", f"Control {i}", "", "Protect" if i % 2 else "Detect") for i in range(2, 12)],
+    )
+    conn.commit()
+    conn.close()
+
+    repo = ControlRepository(db_manager)
+    seen, after = [], None
+    while True:
+        page = repo.get_all(limit=3, after=after)
+        if not page:
+            break
+        seen.extend(c["id"] for c in page)
+        after = repo.sort_key(page[-1])
+
+    assert seen == [c["id"] for c in repo.get_all(limit=100)]
+    assert repo.count() == 11
+    assert [c["id"] for c in repo.get_all(limit=2, domain="Protect", after=["C3"])] == ["C5", "C7"]
+    assert repo.count(domain="Protect") == 5
@@ -0,0 +1,57 @@
+"""
+Tests for the serialized response cache.
+"""
+
+import json
+
+from api.response_cache import ResponseCache, dumps
+
+
+class TestResponseCache:
+    """LRU behaviour and counters."""
+
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache()
+        assert cache.get("a") is None
+        cache.put("a", b"[]", {"X-Total-Count": "0"})
+
+        entry = cache.get("a")
+        assert entry.body == b"[]"
+        assert entry.headers == {"X-Total-Count": "0"}
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 2)
+
+    def test_evicts_least_recently_used_by_entries(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_evicts_by_bytes_and_skips_oversized_bodies(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", b"x" * 6)
+        cache.put("b", b"y" * 6)
+        assert cache.get("a") is None
+        assert cache.get_stats()["bytes"] == 6
+
+        entry = cache.put("big", b"z" * 11)
+        assert entry.body == b"z" * 11
+        assert cache.get("big") is None
+        assert cache.get("b") is not None
+
+    def test_clear(self):
+        cache = ResponseCache()
+        cache.put("a", b"1")
+        cache.clear()
+        assert cache.get("a") is None
+        assert cache.get_stats()["bytes"] == 0
+
+
+def test_dumps_matches_json():
+    data = {"details": [{"id": "AIR.001", "title": "Tést", "count": 2, "category": None}]}
+    assert json.loads(dumps(data)) == data
@@ -0,0 +1,111 @@
+"""
+Tests for what-if coverage scenarios and POST /api/scenarios/coverage.
+"""
+
+import random
+
+import pytest
+
+from db.graph import TaxonomyGraph
+from db.scenarios import run_scenario
+
+
+@pytest.fixture
+def scenario_graph():
+    """CA covers R1 and R2, CB covers R2 (both Protect); CC covers R3, CD covers R4 (both Detect)."""
+    risks = [(f"R{i}", None) for i in range(1, 6)]
+    controls = [("CA", None, "Protect"), ("CB", None, "Protect"), ("CC", None, "Detect"), ("CD", None, "Detect")]
+    edges = [("R1", "CA"), ("R2", "CA"), ("R2", "CB"), ("R3", "CC"), ("R4", "CD")]
+    return TaxonomyGraph(risks, controls, edges)
+
+
+def domain(result, name):
+    return next(d for d in result["domains"] if d["domain"] == name)
+
+
+class TestRunScenario:
+    """Scenario evaluation against the CSR graph."""
+
+    def test_removal_uncovers_only_unshared_risks(self, scenario_graph):
+        result = run_scenario(scenario_graph, removed=["CA"])
+        assert result["before"] == {"covered_risks": 4, "coverage_pct": 80.0}
+        assert result["after"]["covered_risks"] == 3
+        assert result["newly_uncovered"] == ["R1"]
+        assert domain(result, "Protect") == {"domain": "Protect", "covered_before": 2, "covered_after": 1, "delta": -1}
+        assert domain(result, "Detect")["delta"] == 0
+
+    def test_planned_controls_add_coverage(self, scenario_graph):
+        result = run_scenario(scenario_graph, implemented=["CA"], planned=["CC", "CD"])
+        assert result["before"]["covered_risks"] == 2
+        assert result["newly_covered"] == ["R3", "R4"]
+        assert domain(result, "Detect") == {"domain": "Detect", "covered_before": 0, "covered_after": 2, "delta": 2}
+
+    def test_replacing_a_removed_control(self, scenario_graph):
+        result = run_scenario(scenario_graph, implemented=["CA", "CC"], removed=["CA"], planned=["CB"])
+        assert result["newly_uncovered"] == ["R1"]
+        assert result["newly_covered"] == []
+        assert result["delta"] == -1
+
+    def test_unknown_controls_reported(self, scenario_graph):
+        result = run_scenario(scenario_graph, removed=["CA", "nope", "R1"])
+        assert result["not_found"] == ["nope", "R1"]
+
+    def test_null_and_empty_domains_are_one_unassigned_row(self):
+        risks = [("R1", None), ("R2", None)]
+        controls = [("CA", None, None), ("CB", None, ""), ("CC", None, "Protect")]
+        graph = TaxonomyGraph(risks, controls, [("R1", "CA"), ("R2", "CB"), ("R2", "CC")])
+
+        result = run_scenario(graph, removed=["CA"])
+        assert [d["domain"] for d in result["domains"]] == ["Protect", "Unassigned"]
+        assert domain(result, "Unassigned") == {
+            "domain": "Unassigned",
+            "covered_before": 2,
+            "covered_after": 1,
+            "delta": -1,
+        }
+
+    def test_matches_brute_force(self):
+        rng = random.Random(11)
+        risks = [(f"R{i:03d}", None) for i in range(150)]
+        controls = [(f"C{i:03d}", None, rng.choice(["Protect", "Detect", None])) for i in range(120)]
+        edges = [(rng.choice(risks)[0], c[0]) for c in controls for _ in range(rng.randint(1, 4))]
+        graph = TaxonomyGraph(risks, controls, edges)
+        mapped = {r for r, c in edges}
+        control_ids = [c[0] for c in controls]
+
+        for _ in range(50):
+            implemented = rng.sample(control_ids, 80) if rng.random() < 0.5 else None
+            removed = rng.sample(control_ids, 20)
+            planned = rng.sample(control_ids, 5)
+            result = run_scenario(graph, implemented, removed, planned)
+
+            in_place = (set(implemented) if implemented is not None else set(control_ids)) - set(removed)
+            in_place |= set(planned)
+            expected = {r for r, c in edges if c in in_place}
+            before = {r for r, c in edges if implemented is None or c in implemented}
+            assert result["after"]["covered_risks"] == len(expected)
+            assert set(result["newly_uncovered"]) == before - expected
+            assert set(result["newly_covered"]) == expected - before
+            assert before <= mapped
+
+
+class TestScenarioEndpoint:
+    """POST /api/scenarios/coverage on the sample database."""
+
+    def test_batch_of_scenarios(self, test_client):
+        response = test_client.post(
+            "/api/scenarios/coverage",
+            json={"scenarios": [{"removed": ["AIGPC.1"]}, {"name": "only-two", "implemented": ["AIGPC.2"]}]},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_risks"] == 4
+        first, second = data["scenarios"]
+        assert first["name"] == "scenario-1"
+        assert first["before"]["covered_risks"] == test_client.get("/api/gaps").json()["summary"]["mapped_risks"]
+        assert first["newly_uncovered"] == ["AIR.001"]
+        assert second["name"] == "only-two"
+        assert second["before"]["covered_risks"] == second["after"]["covered_risks"] == 1
+
+    def test_validation(self, test_client):
+        assert test_client.post("/api/scenarios/coverage", json={"scenarios": []}).status_code == 400
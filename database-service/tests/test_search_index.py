@@ -0,0 +1,69 @@
+"""
+Tests for the client-side search index artifact (/api/search/index).
+"""
+
+from db.search_index import FIELDS, build_search_index, tokenize
+
+
+def _postings(index, token):
+    """Decode the delta-encoded postings of ``token`` into ``(document, field names)`` pairs."""
+    value, decoded = 0, []
+    for delta in index["postings"][index["tokens"].index(token)]:
+        value += delta
+        decoded.append((value // 16, {field for bit, field in enumerate(FIELDS) if value % 16 & (1 << bit)}))
+    return decoded
+
+
+class TestBuildSearchIndex:
+    def test_postings_record_documents_and_fields(self):
+        index = build_search_index(
+            [
+                ("risk", "R1", "Data leak", "Sensitive data exposed", ""),
+                ("control", "C1", "Encrypt data", "Encryption at rest", "Protect"),
+            ],
+            (4.0, 10.0, 2.0, 1.0),
+        )
+
+        assert index["documents"] == [
+            [0, "R1", "Data leak", "Sensitive data exposed"],
+            [1, "C1", "Encrypt data", "Encryption at rest"],
+        ]
+        assert index["tokens"] == sorted(index["tokens"])
+        assert _postings(index, "data") == [(0, {"title", "description"}), (1, {"title"})]
+        assert _postings(index, "c1") == [(1, {"id"})]
+        assert _postings(index, "protect") == [(1, {"extra"})]
+
+    def test_prefix_table_spans_tokens(self):
+        index = build_search_index([("risk", "R1", "encrypt encryption end", "", "")], (4.0, 10.0, 2.0, 1.0))
+        start, end = index["prefixes"]["en"]
+        assert index["tokens"][start:end] == ["encrypt", "encryption", "end"]
+        assert "r1" in index["tokens"]
+
+    def test_tokenize_matches_query_splitting(self):
+        assert tokenize("AIR.001 Data-Poisoning") == ["air", "001", "data", "poisoning"]
+        assert tokenize("") == []
+
+
+class TestSearchIndexEndpoint:
+    def test_artifact_covers_all_entities(self, test_client):
+        response = test_client.get("/api/search/index")
+        assert response.status_code == 200
+        index = response.json()
+
+        assert index["format"] == 1
+        assert index["version"]
+        assert index["types"] == ["risk", "control", "definition"]
+        ids = {(index["types"][row[0]], row[1]) for row in index["documents"]}
+        assert {("risk", "AIR.001"), ("control", "AIGPC.1")} <= ids
+        assert any(t == "definition" for t, _ in ids)
+        assert len(index["postings"]) == len(index["tokens"])
+
+        documents = {number for number, _ in _postings(index, "encryption")}
+        assert any(index["documents"][number][1] == "AIGPC.1" for number in documents)
+
+    def test_revalidates_with_etag(self, test_client, mock_config_manager):
+        identity = {"Accept-Encoding": "identity"}
+        etag = test_client.get("/api/search/index", headers=identity).headers["ETag"]
+
+        response = test_client.get("/api/search/index", headers={"If-None-Match": etag, **identity})
+        assert response.status_code == 304
@@ -0,0 +1,51 @@
+"""
+Tests for TF-IDF similar entities (/api/{type}/{id}/similar).
+"""
+
+import pytest
+
+
+@pytest.fixture
+def similar_database(add_table):
+    return add_table(
+        "similar_entities",
+        "entity_type TEXT, entity_id TEXT, similar_type TEXT, similar_id TEXT, "
+        "score REAL, rank INTEGER",
+        [
+            ("risk", "AIR.001", "risk", "AIR.003", 0.42, 1),
+            ("risk", "AIR.001", "risk", "AIR.002", 0.10, 2),
+            ("risk", "AIR.001", "control", "AIGPC.1", 0.61, 1),
+            ("control", "AIGPC.1", "risk", "AIR.001", 0.61, 1),
+        ],
+    )
+
+
+class TestSimilarEntities:
+    """GET /api/{entity_type}/{entity_id}/similar."""
+
+    def test_best_first_with_titles(self, similar_database, test_client):
+        response = test_client.get("/api/risk/AIR.001/similar")
+        assert response.status_code == 200
+        similar = response.json()["similar"]
+        assert [(s["entity_type"], s["entity_id"]) for s in similar] == [
+            ("control", "AIGPC.1"),
+            ("risk", "AIR.003"),
+            ("risk", "AIR.002"),
+        ]
+        assert similar[0]["title"] == "Data Encryption"
+        assert similar[1]["title"] == "Security Risk"
+
+    def test_filter_and_limit(self, similar_database, test_client):
+        data = test_client.get("/api/risk/AIR.001/similar?type=risk&limit=1").json()
+        assert [s["entity_id"] for s in data["similar"]] == ["AIR.003"]
+
+    def test_entity_without_neighbours(self, similar_database, test_client):
+        assert test_client.get("/api/risk/AIR.004/similar").json()["similar"] == []
+
+    def test_errors(self, similar_database, test_client):
+        assert test_client.get("/api/risk/AIR.999/similar").status_code == 404
+        assert test_client.get("/api/question/Q1/similar").status_code == 404
+        assert test_client.get("/api/risk/AIR.001/similar?type=question").status_code == 400
+
+    def test_database_without_similarities(self, test_client):
+        assert test_client.get("/api/risk/AIR.001/similar").status_code == 404
@@ -0,0 +1,116 @@
+"""
+Tests for the in-memory snapshot backend.
+
+The snapshot repositories must return the same data as the SQLite
+repositories they replace.
+"""
+
+import pytest
+
+from db.connections import DatabaseManager
+from db.repositories import (
+    RiskRepository, ControlRepository,
+    RelationshipRepository, StatsRepository, NetworkRepository, GapsRepository
+)
+from db.snapshot import (
+    DataSnapshot, SnapshotRiskRepository, SnapshotControlRepository, SnapshotDefinitionRepository,
+    SnapshotRelationshipRepository, SnapshotStatsRepository, SnapshotNetworkRepository, SnapshotGapsRepository
+)
+
+
+@pytest.fixture
+def db_manager(sample_database):
+    return DatabaseManager(str(sample_database))
+
+
+@pytest.fixture
+def snapshot(db_manager):
+    return DataSnapshot.load(db_manager)
+
+
+class TestSnapshotParity:
+    """Snapshot repositories match their SQLite counterparts."""
+
+    def test_risks(self, db_manager, snapshot):
+        sql, mem = RiskRepository(db_manager), SnapshotRiskRepository(db_manager, snapshot)
+        assert mem.get_all() == sql.get_all()
+        assert mem.get_all(limit=2, offset=1) == sql.get_all(limit=2, offset=1)
+        assert mem.get_by_id("AIR.001") == sql.get_by_id("AIR.001")
+        assert mem.get_by_id("MISSING") is None
+        assert mem.get_associated_controls("AIR.001") == sql.get_associated_controls("AIR.001")
+        assert mem.get_summary() == sql.get_summary()
+        assert mem.get_all(limit=2, after=["AIR.001"]) == sql.get_all(limit=2, after=["AIR.001"])
+        assert mem.count() == sql.count()
+        ids = ["AIR.002", "AIR.001", "MISSING"]
+        assert mem.get_by_ids(ids) == sql.get_by_ids(ids)
+        assert mem.get_associated_controls_for(ids) == sql.get_associated_controls_for(ids)
+
+    def test_controls(self, db_manager, snapshot):
+        sql, mem = ControlRepository(db_manager), SnapshotControlRepository(db_manager, snapshot)
+        assert mem.get_all() == sql.get_all()
+        assert mem.get_all(domain="Protect") == sql.get_all(domain="Protect")
+        assert mem.get_by_id("AIGPC.2") == sql.get_by_id("AIGPC.2")
+        assert mem.get_associated_risks("AIGPC.2") == sql.get_associated_risks("AIGPC.2")
+        assert mem.get_summary() == sql.get_summary()
+        assert mem.get_all(limit=2, after=["AIGPC.2"]) == sql.get_all(limit=2, after=["AIGPC.2"])
+        assert mem.count(domain="Protect") == sql.count(domain="Protect")
+        ids = ["AIGPC.1", "AIGPC.2", "MISSING"]
+        assert mem.get_by_ids(ids) == sql.get_by_ids(ids)
+        assert mem.get_associated_risks_for(ids) == sql.get_associated_risks_for(ids)
+
+    def test_definitions(self, db_manager, snapshot):
+        repo = SnapshotDefinitionRepository(db_manager, snapshot)
+        terms = [d["term"] for d in repo.get_all()]
+        assert terms == sorted(terms)
+        assert [d["definition_id"] for d in repo.get_all(category="Privacy")] == ["DEF.001"]
+        assert len(repo.get_all(limit=2, offset=3)) == 1
+        assert repo.get_all(limit=2, after=repo.sort_key(repo.get_all()[1])) == repo.get_all(limit=2, offset=2)
+        assert repo.count() == 4
+
+    def test_relationships_and_stats(self, db_manager, snapshot):
+        assert (
+            SnapshotRelationshipRepository(db_manager, snapshot).get_relationships(limit=2)
+            == RelationshipRepository(db_manager).get_relationships(limit=2)
+        )
+        assert SnapshotStatsRepository(db_manager, snapshot).get_stats() == StatsRepository(db_manager).get_stats()
+
+    def test_network_and_gaps(self, db_manager, snapshot):
+        assert (
+            SnapshotNetworkRepository(db_manager, snapshot).get_network_data()
+            == NetworkRepository(db_manager).get_network_data()
+        )
+        assert SnapshotGapsRepository(db_manager, snapshot).get_gaps_analysis() == GapsRepository(
+            db_manager
+        ).get_gaps_analysis()
+
+
+class TestSnapshotEndpoints:
+    """Endpoints served from the snapshot backend."""
+
+    def test_endpoints_in_snapshot_mode(self, test_client, sample_database):
+        import app as app_module
+
+        app_module.reinitialize_repositories(str(sample_database), snapshot_mode=True)
+        assert isinstance(app_module.risk_repo, SnapshotRiskRepository)
+
+        response = test_client.get("/api/risk/AIR.001")
+        assert response.status_code == 200
+        assert response.json()["associated_controls"][0]["id"] == "AIGPC.1"
+
+        summary = test_client.get("/api/controls/summary").json()["details"]
+        assert {c["control_id"]: c["risk_count"] for c in summary}["AIGPC.1"] == 1
+
+        # Snapshot is served without touching SQLite
+        checkouts = app_module.db_manager.get_pool_stats()["checkouts"]
+        test_client.get("/api/risks")
+        test_client.get("/api/gaps")
+        assert app_module.db_manager.get_pool_stats()["checkouts"] == checkouts
+
+    def test_cursor_with_wrong_key_type_in_snapshot_mode(self, test_client, sample_database):
+        """Test a cursor key that cannot be compared with the snapshot's ids is a 400, not a TypeError."""
+        import app as app_module
+        from db.repositories import encode_cursor
+
+        app_module.reinitialize_repositories(str(sample_database), snapshot_mode=True)
+        assert test_client.get(f"/api/risks?cursor={encode_cursor([1])}").status_code == 400
+        assert test_client.get(f"/api/definitions?cursor={encode_cursor(['term'])}").status_code == 400
@@ -0,0 +1,44 @@
+"""
+Tests for definition term offsets returned with risk and control payloads.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def terms_database(add_table):
+    return add_table(
+        "term_occurrences",
+        'entity_type TEXT, entity_id TEXT, field TEXT, start INTEGER, "end" INTEGER, '
+        "term TEXT, definition_id TEXT",
+        [
+            ("risk", "AIR.001", "title", 5, 12, "Privacy", "DEF.001"),
+            ("risk", "AIR.001", "description", 41, 45, "Data", "DEF.003"),
+            ("control", "AIGPC.1", "title", 5, 15, "Encryption", "DEF.002"),
+        ],
+    )
+
+
+class TestTermOccurrences:
+    """``terms`` on summary, detail and batch payloads."""
+
+    def test_summary_rows(self, terms_database, test_client):
+        risks = {r["risk_id"]: r for r in test_client.get("/api/risks/summary").json()["details"]}
+        assert [t["field"] for t in risks["AIR.001"]["terms"]] == ["description", "title"]
+        assert risks["AIR.002"]["terms"] == []
+        controls = test_client.get("/api/controls/summary").json()["details"]
+        assert controls[0]["terms"] == [
+            {"field": "title", "start": 5, "end": 15, "term": "Encryption", "definition_id": "DEF.002"}
+        ]
+
+    def test_detail_and_batch(self, terms_database, test_client):
+        detail = test_client.get("/api/risk/AIR.001").json()
+        assert [(t["start"], t["end"]) for t in detail["terms"]] == [(41, 45), (5, 12)]
+        assert test_client.get("/api/control/AIGPC.2").json()["terms"] == []
+        batch = test_client.post("/api/controls/batch", json={"ids": ["AIGPC.1", "AIGPC.9"]}).json()
+        assert batch["controls"]["AIGPC.1"]["terms"][0]["term"] == "Encryption"
+
+    def test_database_without_occurrences(self, test_client):
+        assert "terms" not in test_client.get("/api/risk/AIR.001").json()
+        assert "terms" not in test_client.get("/api/risks/summary").json()["details"][0]
+        assert "terms" not in test_client.post("/api/risks/batch", json={"ids": ["AIR.001"]}).json()["risks"]["AIR.001"]
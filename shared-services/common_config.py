@@ -38,7 +38,7 @@ class CommonConfigManager:
             else:
                 # Try relative to this file
                 config_dir = Path(__file__).parent.parent / "config"
-                
+
                 # If not found there, try looking for a config directory in CWD or parent of CWD
                 if not config_dir.exists():
                     search_paths = [Path.cwd() / "config", Path.cwd().parent / "config"]
@@ -78,7 +78,7 @@ class CommonConfigManager:
             try:
                 with open(service_config_path, "r") as file:
                     service_config = yaml.safe_load(file)
-                    config.update(service_config)
+                    config = self._deep_merge(config, service_config or {})
             except Exception as e:
                 logger.error(f"Failed to load service config: {e}")
 
@@ -92,6 +92,21 @@ class CommonConfigManager:
         self._config = config
         return config
 
+    def _deep_merge(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge a service configuration on top of the common configuration.
+
+        Nested sections are merged key by key so a service file only needs to
+        list the values it changes; everything else is inherited from common.yaml.
+        """
+        merged = dict(base)
+        for key, value in override.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = self._deep_merge(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
+
     def get_port(self, service_name: str) -> int:
         """
         Get the configured port for a service.
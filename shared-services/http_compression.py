@@ -0,0 +1,57 @@
+"""
+HTTP Compression
+
+Accept-Encoding negotiation and gzip/brotli encoding shared by the database
+service's ASGI middleware and the dashboard's Flask after-request hook.
+"""
+
+import gzip
+from typing import Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is listed in each service's requirements.txt
+    brotli = None
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str], encodings: Iterable[str] = None) -> Optional[str]:
+    """
+    Pick a content coding from an ``Accept-Encoding`` header.
+
+    Codings the client accepts (q > 0) are ranked by q-value, then by server
+    preference; ``None`` means the body should be sent uncompressed.
+    """
+    if not accept_encoding:
+        return None
+    encodings = tuple(encodings or available_encodings())
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    ranked = [(weights.get(e, wildcard), -i, e) for i, e in enumerate(encodings)]
+    q, _, encoding = max(ranked)
+    return encoding if q > 0 else None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    """Encode a whole body; gzip output has a zero mtime so identical bodies compress identically."""
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def weaken_etag(etag: str) -> str:
+    """A compressed representation gets a weak ETag so it still revalidates against the strong one."""
+    return etag if etag.startswith("W/") else f"W/{etag}"